@@ -1,18 +1,100 @@
-from PyVarInt.algorithms import (PrefixVarint,
-                            UnsignedLEB128,
-                            SignedLEB128,
-                            VariableLengthQuantity,
-                            SQLite4VLI,
-                            LeSQLite,
-                            LeSQLite2,
-                            UnrealEngineSingedVLQ)
-
-__all__ = ["PrefixVarint",
+"""
+Variable-length integer codecs.
+
+The codecs live in `PyVarInt.algorithms`, which is compiled with mypyc when the
+package is built with it. `backend` tells which implementation was loaded:
+"mypyc" for the compiled extension, "python" for the pure-Python source. The
+source is used when no extension is installed, when the extension fails to
+import (a warning is issued), or when the PYVARINT_PURE_PYTHON environment
+variable is set to a value other than "0".
+"""
+import importlib
+import importlib.util
+import os
+import sys
+import warnings
+from importlib.machinery import EXTENSION_SUFFIXES
+from types import ModuleType
+from typing import Tuple
+
+PURE_PYTHON_ENV = "PYVARINT_PURE_PYTHON"
+
+
+def is_compiled(module: ModuleType) -> bool:
+    """Return True if `module` was loaded from a compiled extension."""
+    path = getattr(module, "__file__", None)
+    return path is not None and path.endswith(tuple(EXTENSION_SUFFIXES))
+
+
+def _load_source() -> ModuleType:
+    """Import `PyVarInt.algorithms` from algorithms.py, even if a compiled extension sits next to it."""
+    name = f"{__name__}.algorithms"
+    spec = importlib.util.spec_from_file_location(name, os.path.join(os.path.dirname(__file__), "algorithms.py"))
+    if spec is None or spec.loader is None:
+        raise ImportError(f"cannot load {name} from source")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    try:
+        spec.loader.exec_module(module)
+    except BaseException:
+        del sys.modules[name]
+        raise
+    return module
+
+
+def _load_algorithms() -> Tuple[ModuleType, str]:
+    if os.environ.get(PURE_PYTHON_ENV, "") not in ("", "0"):
+        return _load_source(), "python"
+    try:
+        module = importlib.import_module(f"{__name__}.algorithms")
+    except ImportError as error:
+        sys.modules.pop(f"{__name__}.algorithms", None)
+        warnings.warn(f"compiled PyVarInt.algorithms failed to import ({error}), "
+                      "falling back to the pure-Python implementation", RuntimeWarning)
+        return _load_source(), "python"
+    return module, "mypyc" if is_compiled(module) else "python"
+
+
+algorithms, backend = _load_algorithms()
+
+from PyVarInt.algorithms import (PrefixVarint,  # noqa: E402
+                                 UnsignedLEB128,
+                                 SignedLEB128,
+                                 VariableLengthQuantity,
+                                 SQLite4VLI,
+                                 LeSQLite,
+                                 LeSQLite2,
+                                 UnrealEngineSingedVLQ,
+                                 ZigZagPrefixVarint,
+                                 ZigZagUnsignedLEB128,
+                                 ZigZagVariableLengthQuantity,
+                                 ZigZagSQLite4VLI,
+                                 ZigZagLeSQLite,
+                                 ZigZagLeSQLite2,
+                                 GroupVarint,
+                                 StreamVByte,
+                                 FrameOfReference,
+                                 PatchedFrameOfReference,
+                                 Simple8b)
+
+__all__ = ["backend",
+           "PrefixVarint",
            "UnsignedLEB128",
            "SignedLEB128",
            "VariableLengthQuantity",
            "SQLite4VLI",
            "LeSQLite",
            "LeSQLite2",
-           "UnrealEngineSingedVLQ"
+           "UnrealEngineSingedVLQ",
+           "ZigZagPrefixVarint",
+           "ZigZagUnsignedLEB128",
+           "ZigZagVariableLengthQuantity",
+           "ZigZagSQLite4VLI",
+           "ZigZagLeSQLite",
+           "ZigZagLeSQLite2",
+           "GroupVarint",
+           "StreamVByte",
+           "FrameOfReference",
+           "PatchedFrameOfReference",
+           "Simple8b"
            ]
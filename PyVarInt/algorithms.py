@@ -1,8 +1,185 @@
 """This module is collection of algorithms for encoding and decoding integers using
 various variable-length integer encoding schemes."""
+import sys
+from array import array
+from collections import OrderedDict
 from io import BytesIO
 from math import ceil
-from typing import MutableSequence, BinaryIO
+from mmap import mmap
+from typing import TYPE_CHECKING, ClassVar, Dict, Iterable, Iterator, List, MutableSequence, BinaryIO, Tuple, Union
+
+if TYPE_CHECKING:
+    from asyncio import StreamReader, StreamWriter
+
+try:
+    from mypy_extensions import i64
+except ImportError:  # pragma: no cover - only needed when compiling with mypyc
+    i64 = int  # type: ignore[misc, assignment]
+
+# Any object that can be indexed byte by byte without copying
+ReadableBuffer = Union[bytes, bytearray, memoryview, mmap]
+WritableBuffer = Union[bytearray, memoryview, mmap]
+
+# Encoded length indexed by the first byte, for the codecs that store it there
+_PREFIX_VARINT_LENGTHS = bytes([9] + [(byte & -byte).bit_length() for byte in range(1, 256)])
+_SQLITE4_VLI_LENGTHS = bytes([1] * 241 + [2] * 8 + [3] + list(range(4, 10)))
+_LE_SQLITE_LENGTHS = bytes([1] * 185 + [2] * 64 + list(range(3, 10)))
+_LE_SQLITE2_LENGTHS = bytes([1] * 178 + [2] * 64 + [3] * 8 + list(range(4, 10)))
+
+# Byte offsets of the 4 values, and of the end, of a Group Varint / Stream VByte group
+# indexed by its control byte, which stores `length - 1` of each value in 2 bits
+_GROUP_OFFSETS = tuple(
+    (0,
+     (control & 3) + 1,
+     (control & 3) + ((control >> 2) & 3) + 2,
+     (control & 3) + ((control >> 2) & 3) + ((control >> 4) & 3) + 3,
+     (control & 3) + ((control >> 2) & 3) + ((control >> 4) & 3) + (control >> 6) + 4)
+    for control in range(256)
+)
+
+# Values per block of the frame-of-reference codecs
+_BIT_PACKING_BLOCK_SIZE = 128
+# (values per word, bits per value) of a Simple-8b word, indexed by its 4-bit selector
+_SIMPLE8B_SELECTORS = ((240, 0), (120, 0), (60, 1), (30, 2), (20, 3), (15, 4), (12, 5), (10, 6),
+                       (8, 7), (7, 8), (6, 10), (5, 12), (4, 15), (3, 20), (2, 30), (1, 60))
+
+# Pre-encoded small values, see set_encode_cache
+_table_size = 1024
+_lru_size = 0
+_TABLES: "Dict[type[Base], List[bytes]]" = {}
+_LRUS: "Dict[type[Base], OrderedDict[int, bytes]]" = {}
+# One shared bytes object per single-byte encoding, reused by every table
+_SINGLE_BYTES = [bytes([byte]) for byte in range(256)]
+
+# Maps bytes with a clear high bit, which end a LEB128/VLQ integer, to 1
+_TERMINATOR_MARKS = bytes([1] * 128 + [0] * 128)
+_SCAN_BLOCK_SIZE = 4096
+
+
+def zigzag_encode(value: int) -> int:
+    """Map a signed integer to an unsigned one: 0, -1, 1, -2, 2, ... -> 0, 1, 2, 3, 4, ..."""
+    return value << 1 if value >= 0 else (~value << 1) | 1
+
+
+def zigzag_decode(value: int) -> int:
+    """Inverse of zigzag_encode."""
+    return (value >> 1) ^ -(value & 1)
+
+
+def _skip_length_prefixed(lengths: bytes, buf: ReadableBuffer, n: int, offset: int) -> int:
+    """Skip `n` integers whose encoded length is given by `lengths[first_byte]`."""
+    for _ in range(n):
+        offset += lengths[buf[offset]]
+    if offset > len(buf):
+        raise IndexError("truncated varint")
+    return offset
+
+
+def _skip_high_bit_terminated(buf: ReadableBuffer, n: int, offset: int) -> int:
+    """
+    Skip `n` integers terminated by a byte with a clear high bit.
+
+    Terminators are counted a block at a time, so blocks that end before the
+    `n`-th integer are skipped without looking at single bytes.
+    """
+    end = len(buf)
+    while n:
+        if offset >= end:
+            raise IndexError("truncated varint")
+        block = bytes(buf[offset:offset + _SCAN_BLOCK_SIZE]).translate(_TERMINATOR_MARKS)
+        found = block.count(1)
+        if found < n:
+            n -= found
+            offset += len(block)
+            continue
+        position = -1
+        for _ in range(n):
+            position = block.find(1, position + 1)
+        return offset + position + 1
+    return offset
+
+
+# Serial passes for the vectorized decoders of `PyVarInt.vectorized`: finding
+# where every integer starts only needs the bytes that announce a length, the
+# values themselves are gathered with NumPy.
+
+def _length_prefixed_starts(lengths: bytes, buf: bytes) -> bytearray:
+    """Return a mask with a 1 at the first byte of every integer whose length is `lengths[first_byte]`."""
+    end: i64 = len(buf)
+    marks = bytearray(end)
+    offset: i64 = 0
+    while offset < end:
+        marks[offset] = 1
+        offset += lengths[buf[offset]]
+    if offset > end:
+        raise IndexError("truncated varint")
+    return marks
+
+
+def _unreal_vlq_starts(buf: bytes) -> bytearray:
+    """Like `_length_prefixed_starts` for Unreal Engine VLQs, whose length depends on the continuation bits."""
+    end: i64 = len(buf)
+    marks = bytearray(end)
+    offset: i64 = 0
+    while offset < end:
+        marks[offset] = 1
+        # 0x40 in the first byte, then 0x80 in the next three announce one more byte
+        more = buf[offset] & 0x40
+        offset += 1
+        length: i64 = 1
+        while more and length < 5:
+            if offset >= end:
+                raise IndexError("truncated Unreal Engine VLQ")
+            more = length < 4 and buf[offset] & 0x80
+            offset += 1
+            length += 1
+    return marks
+
+
+# Fixed-width paths for `bytes` input: mypyc compiles `i64` locals to native
+# 64-bit integers and indexes `bytes` directly. They decode integers that fit in
+# 63 bits and return an end offset of 0 for longer ones, which are left to the
+# arbitrary-precision loops.
+
+def _uleb128_from_bytes(buf: bytes, offset: i64) -> Tuple[int, int]:
+    result: i64 = 0
+    shift: i64 = 0
+    while shift < 63:
+        byte: i64 = buf[offset]
+        offset += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, offset
+        shift += 7
+    return 0, 0
+
+
+def _sleb128_from_bytes(buf: bytes, offset: i64) -> Tuple[int, int]:
+    # Up to 8 bytes, so that the sign extension below stays within 64 bits
+    result: i64 = 0
+    shift: i64 = 0
+    while shift < 56:
+        byte: i64 = buf[offset]
+        offset += 1
+        result |= (byte & 0x7F) << shift
+        shift += 7
+        if byte < 0x80:
+            # Sign extend by subtracting 2 ** shift when the sign bit is set
+            result -= (byte & 0x40) << (shift - 6)
+            return result, offset
+    return 0, 0
+
+
+def _vlq_from_bytes(buf: bytes, offset: i64) -> Tuple[int, int]:
+    result: i64 = 0
+    end = offset + 9
+    while offset < end:
+        byte: i64 = buf[offset]
+        offset += 1
+        result = (result << 7) | (byte & 0x7F)
+        if byte < 0x80:
+            return result, offset
+    return 0, 0
 
 
 class Base:
@@ -10,22 +187,298 @@ class Base:
     Base class for encoding and decoding integers.
     """
 
+    # array.array typecode used by decode_many(..., as_array=True)
+    array_typecode: ClassVar[str] = "Q"
+    # True if the encoded length can be read from the first byte with peek_length
+    has_length_prefix: ClassVar[bool] = False
+    # Range of integers the codec can represent, None meaning unbounded
+    min_value: ClassVar[int | None] = 0
+    max_value: ClassVar[int | None] = None
+
     @staticmethod
     def convert_to_binnary_io(item: BinaryIO | bytes) -> BinaryIO:
         if isinstance(item, bytes):
             return BytesIO(item)
         return item
 
+    @staticmethod
+    def _append(value: int, out: bytearray) -> None:
+        """base function for appending an encoded integer to a buffer"""
+        raise NotImplementedError
+
     @staticmethod
     def encode(value: int) -> bytes:
         """base function for encoding"""
         raise NotImplementedError
 
+    @staticmethod
+    def encode_into(value: int, buf: WritableBuffer, offset: int = 0) -> int:
+        """
+        base function for encoding in place
+
+        Writes the encoded integer at `offset` of a preallocated `buf` and returns
+        the offset of the first byte after it; `encoded_length` gives the size to reserve.
+        Raises IndexError, leaving `buf` untouched, if the integer does not fit.
+        """
+        raise NotImplementedError
+
     @staticmethod
     def decode(buffer: BinaryIO | bytes) -> int:
         """base function for decoding"""
         raise NotImplementedError
 
+    @staticmethod
+    def decode_from(buf: ReadableBuffer, offset: int = 0) -> Tuple[int, int]:
+        """
+        base function for decoding in place
+
+        Returns the decoded integer and the offset of the first byte after it.
+        Raises IndexError if the encoded integer is truncated.
+        """
+        raise NotImplementedError
+
+    @staticmethod
+    def encoded_length(value: int) -> int:
+        """base function for computing the encoded size of an integer without encoding it"""
+        raise NotImplementedError
+
+    @staticmethod
+    def peek_length(first_byte: int) -> int:
+        """
+        base function for reading the encoded size of an integer from its first byte
+
+        Only available for codecs with `has_length_prefix` set.
+        """
+        raise NotImplementedError
+
+    @staticmethod
+    def _is_last_byte(byte: int, length: int) -> bool:
+        """
+        Return True if `byte`, the `length`-th byte of an integer, is its last one.
+
+        Only used for codecs without `has_length_prefix`; LEB128 and VLQ clear the
+        high bit of their last byte.
+        """
+        return not byte & 0x80
+
+    @classmethod
+    def _max_encoded_length(cls) -> int:
+        """Return the longest encoding of an integer of the codec, of a 64-bit one if the codec has no bounds."""
+        signed = cls.min_value is None or cls.min_value < 0
+        low = (-2 ** 63 if signed else 0) if cls.min_value is None else cls.min_value
+        high = (2 ** 63 - 1 if signed else 2 ** 64 - 1) if cls.max_value is None else cls.max_value
+        return max(cls.encoded_length(low), cls.encoded_length(high))
+
+    @classmethod
+    def skip(cls, buf: ReadableBuffer, n: int, offset: int = 0) -> int:
+        """
+        Skip `n` encoded integers starting at `offset` of `buf` without decoding them.
+
+        Returns the offset of the first byte after the skipped integers.
+        """
+        decode_from = cls.decode_from
+        for _ in range(n):
+            _, offset = decode_from(buf, offset)
+        return offset
+
+    @classmethod
+    def encode_many(cls, values: Iterable[int]) -> bytes:
+        """
+        Encode a sequence of integers into one contiguous byte string.
+        """
+        result = bytearray()
+        append = cls._append
+        for value in values:
+            append(value, result)
+        return bytes(result)
+
+    @classmethod
+    def decode_many(cls,
+                    buffer: BinaryIO | ReadableBuffer,
+                    count: int | None = None,
+                    as_array: bool = False) -> MutableSequence[int]:
+        """
+        Decode `count` consecutive integers, or every integer left in the buffer
+        when `count` is None.
+
+        With `as_array=True` the values are collected into a typed `array.array`
+        ('Q' for unsigned codecs, 'q' for signed ones) instead of a list. A known
+        `count` sizes the result up front instead of growing it value by value.
+        """
+        result: MutableSequence[int]
+        if count is None:
+            result = array(cls.array_typecode) if as_array else []
+        else:
+            result = array(cls.array_typecode, [0]) * count if as_array else [0] * count
+        if not isinstance(buffer, (bytes, bytearray, memoryview, mmap)):
+            if count is not None:
+                decode = cls.decode
+                for index in range(count):
+                    result[index] = decode(buffer)
+                return result
+            buffer = buffer.read()
+
+        decode_from = cls.decode_from
+        offset = 0
+        if count is None:
+            end = len(buffer)
+            while offset < end:
+                value, offset = decode_from(buffer, offset)
+                result.append(value)
+        else:
+            for index in range(count):
+                result[index], offset = decode_from(buffer, offset)
+        return result
+
+    @classmethod
+    def iter_decode(cls, fileobj: BinaryIO, chunk_size: int = 65536) -> Iterator[int]:
+        """
+        Lazily decode every integer in a file-like object.
+
+        The stream is read in chunks of `chunk_size` bytes; an integer split across
+        two chunks is carried over and completed by the next read.
+        Raises EOFError if the stream ends in the middle of an integer.
+        """
+        decode_from = cls.decode_from
+        tail = b""
+        while True:
+            chunk = fileobj.read(chunk_size)
+            if not chunk:
+                break
+            data = tail + chunk if tail else chunk
+            offset = 0
+            end = len(data)
+            while offset < end:
+                try:
+                    value, offset = decode_from(data, offset)
+                except IndexError:
+                    break
+                yield value
+            tail = data[offset:]
+
+        if tail:
+            raise EOFError("stream ends with a truncated varint")
+
+    @classmethod
+    async def decode_async(cls, reader: "StreamReader", max_length: int | None = None) -> int:
+        """
+        Read and decode one integer from an asyncio stream.
+
+        Only the bytes of the integer are consumed: length-prefixed codecs read the
+        first byte and then the rest of the integer at once, the others read one
+        byte at a time until its last byte arrives, and decode it once.
+        Raises asyncio.IncompleteReadError (an EOFError) if the stream ends first,
+        and ValueError for an integer longer than `max_length` bytes, by default
+        the longest encoding of the codec or of a 64-bit integer.
+        """
+        limit = cls._max_encoded_length() if max_length is None else max_length
+        data = await reader.readexactly(1)
+        if cls.has_length_prefix:
+            length = cls.peek_length(data[0])
+            if length > limit:
+                raise ValueError(f"{cls.__name__} integer longer than max_length={limit} bytes")
+            if length > 1:
+                data += await reader.readexactly(length - 1)
+            return cls.decode_from(data)[0]
+
+        buffer = bytearray(data)
+        while not cls._is_last_byte(buffer[-1], len(buffer)):
+            if len(buffer) >= limit:
+                raise ValueError(f"{cls.__name__} integer longer than max_length={limit} bytes")
+            buffer += await reader.readexactly(1)
+        return cls.decode_from(buffer)[0]
+
+    @classmethod
+    async def write_many_async(cls, writer: "StreamWriter", values: Iterable[int]) -> None:
+        """Encode a sequence of integers and write them to an asyncio stream with a single write."""
+        writer.write(cls.encode_many(values))
+        await writer.drain()
+
+
+def set_encode_cache(table_size: int = 1024, lru_size: int = 0) -> None:
+    """
+    Configure the pre-encoded values returned by `encode`.
+
+    Every codec lazily builds a table of the encodings of 0..table_size-1 the
+    first time it encodes such a value, so encoding a small value is a list lookup
+    that returns a shared `bytes` object. With `lru_size` set, every codec also
+    keeps the encodings of its `lru_size` most recently encoded larger values.
+    A table of 65536 values takes about 3 MB per codec; 0 disables either cache.
+    Existing tables and LRUs are dropped.
+    """
+    global _table_size, _lru_size
+    if table_size < 0 or lru_size < 0:
+        raise ValueError("cache sizes must not be negative")
+    _table_size = table_size
+    _lru_size = lru_size
+    _TABLES.clear()
+    _LRUS.clear()
+
+
+def encode_cache_info() -> Dict[str, int]:
+    """Return the cache settings together with the number and approximate memory of cached encodings."""
+    tables = list(_TABLES.values())
+    lrus = list(_LRUS.values())
+    shared = {id(encoded) for encoded in _SINGLE_BYTES}
+    table_bytes = 0
+    for table in tables:
+        table_bytes += sys.getsizeof(table)
+        for encoded in table:
+            if id(encoded) not in shared:
+                table_bytes += sys.getsizeof(encoded)
+    return {
+        "table_size": _table_size,
+        "lru_size": _lru_size,
+        "tables": len(tables),
+        "table_bytes": table_bytes,
+        "lru_entries": sum(len(lru) for lru in lrus),
+    }
+
+
+def _uncached_encoding(codec: type[Base], value: int) -> bytes:
+    result = bytearray()
+    codec._append(value, result)
+    return bytes(result)
+
+
+def _build_table(codec: type[Base]) -> List[bytes]:
+    table: List[bytes] = []
+    for value in range(_table_size):
+        encoded = _uncached_encoding(codec, value)
+        table.append(_SINGLE_BYTES[encoded[0]] if len(encoded) == 1 else encoded)
+    _TABLES[codec] = table
+    return table
+
+
+def _cached_encoding(codec: type[Base], value: int) -> bytes:
+    """Return the encoding of `value` from the small value table of `codec` or from its LRU."""
+    if 0 <= value < _table_size:
+        table = _TABLES.get(codec)
+        if table is None:
+            table = _build_table(codec)
+        if value < len(table):
+            return table[value]
+        return _uncached_encoding(codec, value)
+
+    lru = _LRUS.get(codec)
+    if lru is None:
+        lru = _LRUS.setdefault(codec, OrderedDict())
+    encoded = lru.get(value)
+    if encoded is not None:
+        try:
+            lru.move_to_end(value)
+        except KeyError:  # evicted by another thread
+            pass
+        return encoded
+    encoded = _uncached_encoding(codec, value)
+    lru[value] = encoded
+    while len(lru) > _lru_size:
+        try:
+            lru.popitem(last=False)
+        except KeyError:
+            break
+    return encoded
+
 
 class PrefixVarint(Base):
     """
@@ -53,11 +506,25 @@ class PrefixVarint(Base):
 
     """
 
+    has_length_prefix = True
+    max_value = 2 ** 64 - 1
+
     @staticmethod
     def encode(value: int) -> bytes:
         """
         Encode an integer using PrefixVarint encoding.
         """
+        if 0 <= value < _table_size or _lru_size:
+            return _cached_encoding(PrefixVarint, value)
+        result = bytearray()
+        PrefixVarint._append(value, result)
+        return bytes(result)
+
+    @staticmethod
+    def _append(value: int, result: bytearray) -> None:
+        """
+        Append a PrefixVarint encoded integer to `result`.
+        """
         # Determine number of required bytes based on value's bit length
         bit_length = value.bit_length()
         # Calculate required bytes for other cases
@@ -67,14 +534,12 @@ class PrefixVarint(Base):
         # Special case for 64-bit values
         if bit_length > 56:
             # Use 9-byte encoding with 00000000 prefix
-            result = bytearray([0])  # First byte is all zeros
+            result.append(0)  # First byte is all zeros
             # Add remaining 8 bytes in little-endian order
             for _ in range(8):
                 result.append(value & 0xFF)
                 value >>= 8
-            return bytes(result)
-
-        result = bytearray()
+            return
 
         # First byte contains both data and prefix
         available_bits = 8 - prefix.bit_length()
@@ -88,23 +553,43 @@ class PrefixVarint(Base):
             result.append(value & 0xFF)
             value >>= 8
 
-        return bytes(result)
+    @staticmethod
+    def encode_into(value: int, buf: WritableBuffer, offset: int = 0) -> int:
+        """
+        Write a PrefixVarint encoded integer at `offset` of `buf`.
+        """
+        bit_length = value.bit_length()
+        if bit_length > 56:
+            end = offset + 9
+            if end > len(buf):
+                raise IndexError("buffer too small for PrefixVarint")
+            buf[offset] = 0
+            for position in range(offset + 1, end):
+                buf[position] = value & 0xFF
+                value >>= 8
+            return end
+
+        total_bytes = (bit_length + 6) // 7 or 1
+        end = offset + total_bytes
+        if end > len(buf):
+            raise IndexError("buffer too small for PrefixVarint")
+        # The lowest set bit of the first byte gives the encoding length
+        buf[offset] = ((value << total_bytes) | (1 << (total_bytes - 1))) & 0xFF
+        value >>= 8 - total_bytes
+        for position in range(offset + 1, end):
+            buf[position] = value & 0xFF
+            value >>= 8
+        return end
 
     @staticmethod
     def decode(buffer: BinaryIO | bytes) -> int:
         """
         Decode a PrefixVarint encoded integer.
         """
+        if isinstance(buffer, bytes):
+            return PrefixVarint.decode_from(buffer)[0]
         buffer = Base.convert_to_binnary_io(buffer)
 
-        def _count_trailing_zeros(numb: int) -> int:
-            """Count the number of trailing zero bits in a byte."""
-            count = 0
-            while numb & 1 == 0:
-                count += 1
-                numb >>= 1
-            return count
-
         first_byte = ord(buffer.read(1))
         if first_byte == 0:
             value = 0
@@ -112,12 +597,11 @@ class PrefixVarint(Base):
                 value |= ord(buffer.read(1)) << (8 * i)
             return value
 
-        # Count trailing zeros to determine encoding length
-        trailing_zeros = _count_trailing_zeros(numb=first_byte)
-        total_bytes = trailing_zeros + 1
+        # Trailing zeros of the first byte determine encoding length
+        total_bytes = _PREFIX_VARINT_LENGTHS[first_byte]
 
         # Calculate number of data bits in first byte
-        data_bits = 7 - trailing_zeros
+        data_bits = 8 - total_bytes
 
         # Extract value from first byte
         value = (first_byte >> (8 - data_bits)) if data_bits > 0 else 0
@@ -128,6 +612,47 @@ class PrefixVarint(Base):
 
         return value
 
+    @staticmethod
+    def decode_from(buf: ReadableBuffer, offset: int = 0) -> Tuple[int, int]:
+        """
+        Decode a PrefixVarint encoded integer starting at `offset` of `buf`.
+        """
+        first_byte = buf[offset]
+        if first_byte == 0:
+            end = offset + 9
+            if end > len(buf):
+                raise IndexError("truncated PrefixVarint")
+            return int.from_bytes(buf[offset + 1:end], "little"), end
+
+        # The lowest set bit of the first byte gives the encoding length
+        total_bytes = _PREFIX_VARINT_LENGTHS[first_byte]
+        end = offset + total_bytes
+        if end > len(buf):
+            raise IndexError("truncated PrefixVarint")
+
+        value = first_byte >> total_bytes
+        if total_bytes > 1:
+            value |= int.from_bytes(buf[offset + 1:end], "little") << (8 - total_bytes)
+        return value, end
+
+    @staticmethod
+    def encoded_length(value: int) -> int:
+        """Return the size of a PrefixVarint without encoding it."""
+        bit_length = value.bit_length()
+        if bit_length > 56:
+            return 9
+        return max(1, (bit_length + 6) // 7)
+
+    @staticmethod
+    def peek_length(first_byte: int) -> int:
+        """Return the size of a PrefixVarint from its first byte."""
+        return _PREFIX_VARINT_LENGTHS[first_byte]
+
+    @staticmethod
+    def skip(buf: ReadableBuffer, n: int, offset: int = 0) -> int:
+        """Skip `n` encoded integers starting at `offset` of `buf` without decoding them."""
+        return _skip_length_prefixed(_PREFIX_VARINT_LENGTHS, buf, n, offset)
+
 
 class UnsignedLEB128(Base):
     """
@@ -137,7 +662,15 @@ class UnsignedLEB128(Base):
     @staticmethod
     def encode(value: int) -> bytes:
         """Encode a Unsigned Little Endian Base 128 (LEB128)."""
+        if 0 <= value < _table_size or _lru_size:
+            return _cached_encoding(UnsignedLEB128, value)
         result = bytearray()
+        UnsignedLEB128._append(value, result)
+        return bytes(result)
+
+    @staticmethod
+    def _append(value: int, result: bytearray) -> None:
+        """Append a Unsigned Little Endian Base 128 (LEB128) to `result`."""
         while True:
             # Extract the lowest 7 bits
             byte = value & 0x7F
@@ -152,11 +685,24 @@ class UnsignedLEB128(Base):
             if value == 0:
                 break
 
-        return bytes(result)
+    @staticmethod
+    def encode_into(value: int, buf: WritableBuffer, offset: int = 0) -> int:
+        """Write a Unsigned Little Endian Base 128 (LEB128) at `offset` of `buf`."""
+        end = offset + ((value.bit_length() + 6) // 7 or 1)
+        if end > len(buf):
+            raise IndexError("buffer too small for LEB128")
+        last = end - 1
+        for position in range(offset, last):
+            buf[position] = (value & 0x7F) | 0x80
+            value >>= 7
+        buf[last] = value
+        return end
 
     @staticmethod
     def decode(buffer: BinaryIO | bytes) -> int:
         """Decode a Unsigned Little Endian Base 128 (LEB128)."""
+        if isinstance(buffer, bytes):
+            return UnsignedLEB128.decode_from(buffer)[0]
 
         buffer = Base.convert_to_binnary_io(buffer)
 
@@ -172,6 +718,42 @@ class UnsignedLEB128(Base):
 
         return result
 
+    @staticmethod
+    def decode_from(buf: ReadableBuffer, offset: int = 0) -> Tuple[int, int]:
+        """Decode a Unsigned Little Endian Base 128 (LEB128) starting at `offset` of `buf`."""
+        if isinstance(buf, bytes):
+            value, end = _uleb128_from_bytes(buf, offset)
+            if end:
+                return value, end
+        # Fast paths for the one and two byte integers that make up most data
+        first = buf[offset]
+        if first < 0x80:
+            return first, offset + 1
+        second = buf[offset + 1]
+        if second < 0x80:
+            return (first & 0x7F) | (second << 7), offset + 2
+
+        shift = 0
+        result = 0
+
+        while True:
+            i = buf[offset]
+            offset += 1
+            result |= (i & 0x7F) << shift
+            shift += 7
+            if not i & 0x80:
+                return result, offset
+
+    @staticmethod
+    def encoded_length(value: int) -> int:
+        """Return the size of a Unsigned Little Endian Base 128 (LEB128) without encoding it."""
+        return max(1, (value.bit_length() + 6) // 7)
+
+    @staticmethod
+    def skip(buf: ReadableBuffer, n: int, offset: int = 0) -> int:
+        """Skip `n` encoded integers starting at `offset` of `buf` without decoding them."""
+        return _skip_high_bit_terminated(buf, n, offset)
+
 
 class SignedLEB128(Base):
     """
@@ -179,10 +761,21 @@ class SignedLEB128(Base):
     https://en.wikipedia.org/wiki/LEB128
     """
 
+    array_typecode = "q"
+    min_value = None
+
     @staticmethod
     def encode(value: int) -> bytes:
         """Encode a signed integer using LEB128 encoding."""
+        if 0 <= value < _table_size or _lru_size:
+            return _cached_encoding(SignedLEB128, value)
         result = bytearray()
+        SignedLEB128._append(value, result)
+        return bytes(result)
+
+    @staticmethod
+    def _append(value: int, result: bytearray) -> None:
+        """Append a signed LEB128 encoded integer to `result`."""
         while True:
             byte = value & 0x7F
             value >>= 7
@@ -196,11 +789,26 @@ class SignedLEB128(Base):
                 break
             result.append(byte | 0x80)
 
-        return bytes(result)
+    @staticmethod
+    def encode_into(value: int, buf: WritableBuffer, offset: int = 0) -> int:
+        """Write a signed LEB128 encoded integer at `offset` of `buf`."""
+        # One more bit than the magnitude for the sign
+        bits = (value if value >= 0 else ~value).bit_length() + 1
+        end = offset + (bits + 6) // 7
+        if end > len(buf):
+            raise IndexError("buffer too small for LEB128")
+        last = end - 1
+        for position in range(offset, last):
+            buf[position] = (value & 0x7F) | 0x80
+            value >>= 7
+        buf[last] = value & 0x7F
+        return end
 
     @staticmethod
     def decode(buffer: BinaryIO | bytes) -> int:
         """Decode a Signed Little Endian Base 128 (LEB128)."""
+        if isinstance(buffer, bytes):
+            return SignedLEB128.decode_from(buffer)[0]
         buffer = Base.convert_to_binnary_io(buffer)
 
         result = 0
@@ -218,6 +826,45 @@ class SignedLEB128(Base):
             shift += 7
         return result
 
+    @staticmethod
+    def decode_from(buf: ReadableBuffer, offset: int = 0) -> Tuple[int, int]:
+        """Decode a Signed Little Endian Base 128 (LEB128) starting at `offset` of `buf`."""
+        if isinstance(buf, bytes):
+            value, end = _sleb128_from_bytes(buf, offset)
+            if end:
+                return value, end
+        # Fast path for the one byte integers -64..63
+        first = buf[offset]
+        if first < 0x80:
+            return (first - 0x80 if first & 0x40 else first), offset + 1
+
+        result = 0
+        shift = 0
+
+        while True:
+            item = buf[offset]
+            offset += 1
+            result |= (item & 0x7F) << shift
+            # Check if this is the last byte
+            if not item & 0x80:
+                # Sign extend if necessary
+                if shift < 64 and (item & 0x40):
+                    result |= ~0 << (shift + 7)
+                return result, offset
+            shift += 7
+
+    @staticmethod
+    def encoded_length(value: int) -> int:
+        """Return the size of a Signed Little Endian Base 128 (LEB128) without encoding it."""
+        # One extra bit is needed for the sign
+        magnitude = value if value >= 0 else ~value
+        return (magnitude.bit_length() + 7) // 7
+
+    @staticmethod
+    def skip(buf: ReadableBuffer, n: int, offset: int = 0) -> int:
+        """Skip `n` encoded integers starting at `offset` of `buf` without decoding them."""
+        return _skip_high_bit_terminated(buf, n, offset)
+
 
 class VariableLengthQuantity(Base):
     """
@@ -229,6 +876,15 @@ class VariableLengthQuantity(Base):
     @staticmethod
     def encode(value: int) -> bytes:
         """Encode a variable-length quantity."""
+        if 0 <= value < _table_size or _lru_size:
+            return _cached_encoding(VariableLengthQuantity, value)
+        result = bytearray()
+        VariableLengthQuantity._append(value, result)
+        return bytes(result)
+
+    @staticmethod
+    def _append(value: int, result: bytearray) -> None:
+        """Append a variable-length quantity to `result`."""
         tmp_arr = []
         buffer = value & 0x7F
         tmp_arr.append(buffer)
@@ -236,11 +892,27 @@ class VariableLengthQuantity(Base):
             buffer = (value & 0x7F) | 0x80
             tmp_arr.append(buffer)
 
-        return bytes(tmp_arr[::-1])
+        result += bytes(tmp_arr[::-1])
+
+    @staticmethod
+    def encode_into(value: int, buf: WritableBuffer, offset: int = 0) -> int:
+        """Write a variable-length quantity at `offset` of `buf`."""
+        end = offset + ((value.bit_length() + 6) // 7 or 1)
+        if end > len(buf):
+            raise IndexError("buffer too small for VLQ")
+        # The least significant group is the last byte
+        buf[end - 1] = value & 0x7F
+        value >>= 7
+        for position in range(end - 2, offset - 1, -1):
+            buf[position] = (value & 0x7F) | 0x80
+            value >>= 7
+        return end
 
     @staticmethod
     def decode(buffer: BinaryIO | bytes) -> int:
         """Decode a variable-length quantity."""
+        if isinstance(buffer, bytes):
+            return VariableLengthQuantity.decode_from(buffer)[0]
         tmp_arr: MutableSequence = []
         buffer = Base.convert_to_binnary_io(buffer)
 
@@ -256,6 +928,39 @@ class VariableLengthQuantity(Base):
             result |= item
         return result
 
+    @staticmethod
+    def decode_from(buf: ReadableBuffer, offset: int = 0) -> Tuple[int, int]:
+        """Decode a variable-length quantity starting at `offset` of `buf`."""
+        if isinstance(buf, bytes):
+            value, end = _vlq_from_bytes(buf, offset)
+            if end:
+                return value, end
+        # Fast paths for the one and two byte integers that make up most data
+        first = buf[offset]
+        if first < 0x80:
+            return first, offset + 1
+        second = buf[offset + 1]
+        if second < 0x80:
+            return ((first & 0x7F) << 7) | second, offset + 2
+
+        result = 0
+        while True:
+            i = buf[offset]
+            offset += 1
+            result = (result << 7) | (i & 0x7F)
+            if not i & 0x80:
+                return result, offset
+
+    @staticmethod
+    def encoded_length(value: int) -> int:
+        """Return the size of a variable-length quantity without encoding it."""
+        return max(1, (value.bit_length() + 6) // 7)
+
+    @staticmethod
+    def skip(buf: ReadableBuffer, n: int, offset: int = 0) -> int:
+        """Skip `n` encoded integers starting at `offset` of `buf` without decoding them."""
+        return _skip_high_bit_terminated(buf, n, offset)
+
 
 class SQLite4VLI(Base):
     """
@@ -264,9 +969,21 @@ class SQLite4VLI(Base):
     https://sqlite.org/src4/doc/trunk/www/varint.wiki
     """
 
+    has_length_prefix = True
+    max_value = 2 ** 64 - 1
+
     @staticmethod
     def encode(value: int) -> bytes:
         """Encode a SQLite4 variable-length integer."""
+        if 0 <= value < _table_size or _lru_size:
+            return _cached_encoding(SQLite4VLI, value)
+        result = bytearray()
+        SQLite4VLI._append(value, result)
+        return bytes(result)
+
+    @staticmethod
+    def _append(value: int, result: bytearray) -> None:
+        """Append a SQLite4 variable-length integer to `result`."""
 
         def _add_bytes(number: int, num_bytes: int) -> bytearray:
             bytearr = bytearray()
@@ -274,8 +991,6 @@ class SQLite4VLI(Base):
                 bytearr.append((number >> i) & 0xFF)
             return bytearr
 
-        result = bytearray()
-
         if value <= 240:
             result.append(value)
         elif value <= 2287:
@@ -303,11 +1018,47 @@ class SQLite4VLI(Base):
         else:
             result.append(255)
             result += _add_bytes(value, num_bytes=8)
-        return bytes(result)
+
+    @staticmethod
+    def encode_into(value: int, buf: WritableBuffer, offset: int = 0) -> int:
+        """Write a SQLite4 variable-length integer at `offset` of `buf`."""
+        if value <= 240:
+            if offset >= len(buf):
+                raise IndexError("buffer too small for SQLite4 VLI")
+            buf[offset] = value
+            return offset + 1
+        if value <= 2287:
+            end = offset + 2
+            if end > len(buf):
+                raise IndexError("buffer too small for SQLite4 VLI")
+            buf[offset] = 241 + (value - 240) // 256
+            buf[offset + 1] = (value - 240) % 256
+            return end
+        if value <= 67823:
+            end = offset + 3
+            if end > len(buf):
+                raise IndexError("buffer too small for SQLite4 VLI")
+            buf[offset] = 249
+            buf[offset + 1] = (value - 2288) // 256
+            buf[offset + 2] = (value - 2288) % 256
+            return end
+
+        # 250-255 announce 3-8 big-endian bytes
+        length = max(3, (value.bit_length() + 7) // 8)
+        end = offset + 1 + length
+        if end > len(buf):
+            raise IndexError("buffer too small for SQLite4 VLI")
+        buf[offset] = 247 + length
+        for position in range(end - 1, offset, -1):
+            buf[position] = value & 0xFF
+            value >>= 8
+        return end
 
     @staticmethod
     def decode(buffer: BinaryIO | bytes) -> int:
         """Decode a SQLite4 variable-length integer."""
+        if isinstance(buffer, bytes):
+            return SQLite4VLI.decode_from(buffer)[0]
         buffer = Base.convert_to_binnary_io(buffer)
 
         value = ord(buffer.read(1))
@@ -332,6 +1083,45 @@ class SQLite4VLI(Base):
             result = int.from_bytes(buffer.read(8), "big")
         return result
 
+    @staticmethod
+    def decode_from(buf: ReadableBuffer, offset: int = 0) -> Tuple[int, int]:
+        """Decode a SQLite4 variable-length integer starting at `offset` of `buf`."""
+        value = buf[offset]
+
+        if value <= 240:
+            return value, offset + 1
+        if value <= 248:
+            return 240 + 256 * (value - 241) + buf[offset + 1], offset + 2
+        if value == 249:
+            return 2288 + 256 * buf[offset + 1] + buf[offset + 2], offset + 3
+
+        # 250-255 are followed by 3-8 big-endian bytes
+        end = offset + value - 246
+        if end > len(buf):
+            raise IndexError("truncated SQLite4 VLI")
+        return int.from_bytes(buf[offset + 1:end], "big"), end
+
+    @staticmethod
+    def encoded_length(value: int) -> int:
+        """Return the size of a SQLite4 variable-length integer without encoding it."""
+        if value <= 240:
+            return 1
+        if value <= 2287:
+            return 2
+        if value <= 67823:
+            return 3
+        return max(4, (value.bit_length() + 7) // 8 + 1)
+
+    @staticmethod
+    def peek_length(first_byte: int) -> int:
+        """Return the size of a SQLite4 variable-length integer from its first byte."""
+        return _SQLITE4_VLI_LENGTHS[first_byte]
+
+    @staticmethod
+    def skip(buf: ReadableBuffer, n: int, offset: int = 0) -> int:
+        """Skip `n` encoded integers starting at `offset` of `buf` without decoding them."""
+        return _skip_length_prefixed(_SQLITE4_VLI_LENGTHS, buf, n, offset)
+
 
 class LeSQLite(Base):
     """
@@ -352,10 +1142,21 @@ class LeSQLite(Base):
     The 3+ byte encoded numbers are very fast to decode with an unaligned load instruction.
     """
 
+    has_length_prefix = True
+    max_value = 2 ** 64 - 1
+
     @staticmethod
     def encode(value: int) -> bytes:
         """Encode a leSQLite variable-length integer."""
+        if 0 <= value < _table_size or _lru_size:
+            return _cached_encoding(LeSQLite, value)
         result = bytearray()
+        LeSQLite._append(value, result)
+        return bytes(result)
+
+    @staticmethod
+    def _append(value: int, result: bytearray) -> None:
+        """Append a leSQLite variable-length integer to `result`."""
         if value <= 184:
             result.append(value)
         elif value <= 16559:
@@ -386,11 +1187,39 @@ class LeSQLite(Base):
                 result.append(value & 0xFF)
                 value >>= 8
 
-        return bytes(result)
+    @staticmethod
+    def encode_into(value: int, buf: WritableBuffer, offset: int = 0) -> int:
+        """Write a leSQLite variable-length integer at `offset` of `buf`."""
+        if value <= 184:
+            if offset >= len(buf):
+                raise IndexError("buffer too small for leSQLite")
+            buf[offset] = value
+            return offset + 1
+        if value <= 16559:
+            end = offset + 2
+            if end > len(buf):
+                raise IndexError("buffer too small for leSQLite")
+            adjusted = value - 185
+            buf[offset] = 185 + adjusted // 256
+            buf[offset + 1] = adjusted % 256
+            return end
+
+        # 249-255 announce 2-8 little-endian bytes
+        length = max(2, (value.bit_length() + 7) // 8)
+        end = offset + 1 + length
+        if end > len(buf):
+            raise IndexError("buffer too small for leSQLite")
+        buf[offset] = 247 + length
+        for position in range(offset + 1, end):
+            buf[position] = value & 0xFF
+            value >>= 8
+        return end
 
     @staticmethod
     def decode(buffer: BinaryIO | bytes) -> int:
         """Decode a leSQLite variable-length integer."""
+        if isinstance(buffer, bytes):
+            return LeSQLite.decode_from(buffer)[0]
         buffer = Base.convert_to_binnary_io(buffer)
 
         value = ord(buffer.read(1))
@@ -400,6 +1229,40 @@ class LeSQLite(Base):
             return 185 + 256 * (value - 185) + ord(buffer.read(1))
         return int.from_bytes(buffer.read(value - 249 + 2), "little")
 
+    @staticmethod
+    def decode_from(buf: ReadableBuffer, offset: int = 0) -> Tuple[int, int]:
+        """Decode a leSQLite variable-length integer starting at `offset` of `buf`."""
+        value = buf[offset]
+        if value <= 184:
+            return value, offset + 1
+        if value <= 248:
+            return 185 + 256 * (value - 185) + buf[offset + 1], offset + 2
+
+        # 249-255 are followed by 2-8 little-endian bytes
+        end = offset + value - 246
+        if end > len(buf):
+            raise IndexError("truncated leSQLite varint")
+        return int.from_bytes(buf[offset + 1:end], "little"), end
+
+    @staticmethod
+    def encoded_length(value: int) -> int:
+        """Return the size of a leSQLite variable-length integer without encoding it."""
+        if value <= 184:
+            return 1
+        if value <= 16559:
+            return 2
+        return max(3, (value.bit_length() + 7) // 8 + 1)
+
+    @staticmethod
+    def peek_length(first_byte: int) -> int:
+        """Return the size of a leSQLite variable-length integer from its first byte."""
+        return _LE_SQLITE_LENGTHS[first_byte]
+
+    @staticmethod
+    def skip(buf: ReadableBuffer, n: int, offset: int = 0) -> int:
+        """Skip `n` encoded integers starting at `offset` of `buf` without decoding them."""
+        return _skip_length_prefixed(_LE_SQLITE_LENGTHS, buf, n, offset)
+
 
 class LeSQLite2(Base):
     """
@@ -420,11 +1283,21 @@ class LeSQLite2(Base):
     This variant is a bit slower to decode than the first one because there are more cases.
     """
 
+    has_length_prefix = True
+    max_value = 2 ** 64 - 1
+
     @staticmethod
     def encode(value: int) -> bytes:
         """Encode a leSQLite2 variable-length integer."""
-
+        if 0 <= value < _table_size or _lru_size:
+            return _cached_encoding(LeSQLite2, value)
         result = bytearray()
+        LeSQLite2._append(value, result)
+        return bytes(result)
+
+    @staticmethod
+    def _append(value: int, result: bytearray) -> None:
+        """Append a leSQLite2 variable-length integer to `result`."""
         if value <= 177:
             result.append(value)
         elif value <= 16561:
@@ -459,11 +1332,48 @@ class LeSQLite2(Base):
                     result.append(value & 0xFF)
                     value >>= 8
 
-        return bytes(result)
+    @staticmethod
+    def encode_into(value: int, buf: WritableBuffer, offset: int = 0) -> int:
+        """Write a leSQLite2 variable-length integer at `offset` of `buf`."""
+        if value <= 177:
+            if offset >= len(buf):
+                raise IndexError("buffer too small for leSQLite2")
+            buf[offset] = value
+            return offset + 1
+        if value <= 16561:
+            end = offset + 2
+            if end > len(buf):
+                raise IndexError("buffer too small for leSQLite2")
+            adjusted = value - 178
+            buf[offset] = 178 + (adjusted >> 8)
+            buf[offset + 1] = adjusted & 0xFF
+            return end
+        if value <= 524287:
+            end = offset + 3
+            if end > len(buf):
+                raise IndexError("buffer too small for leSQLite2")
+            adjusted = value - 16562
+            buf[offset] = 242 + (adjusted >> 16)
+            buf[offset + 1] = (adjusted >> 8) & 0xFF
+            buf[offset + 2] = adjusted & 0xFF
+            return end
+
+        # 250-255 announce 3-8 little-endian bytes
+        length = max(3, (value.bit_length() + 7) // 8)
+        end = offset + 1 + length
+        if end > len(buf):
+            raise IndexError("buffer too small for leSQLite2")
+        buf[offset] = 247 + length
+        for position in range(offset + 1, end):
+            buf[position] = value & 0xFF
+            value >>= 8
+        return end
 
     @staticmethod
     def decode(buffer: BinaryIO | bytes) -> int:
         """Decode a leSQLite2 variable-length integer."""
+        if isinstance(buffer, bytes):
+            return LeSQLite2.decode_from(buffer)[0]
         buffer = Base.convert_to_binnary_io(buffer)
 
         value = ord(buffer.read(1))
@@ -480,6 +1390,49 @@ class LeSQLite2(Base):
             )
         return int.from_bytes(buffer.read(value - 250 + 3), "little")
 
+    @staticmethod
+    def decode_from(buf: ReadableBuffer, offset: int = 0) -> Tuple[int, int]:
+        """Decode a leSQLite2 variable-length integer starting at `offset` of `buf`."""
+        value = buf[offset]
+        if value <= 177:
+            return value, offset + 1
+        if value <= 241:
+            return 178 + ((value - 178) << 8) + buf[offset + 1], offset + 2
+        if value <= 249:
+            return (
+                    16562
+                    + ((value - 242) << 16)
+                    + (buf[offset + 1] << 8)
+                    + buf[offset + 2]
+            ), offset + 3
+
+        # 250-255 are followed by 3-8 little-endian bytes
+        end = offset + value - 246
+        if end > len(buf):
+            raise IndexError("truncated leSQLite2 varint")
+        return int.from_bytes(buf[offset + 1:end], "little"), end
+
+    @staticmethod
+    def encoded_length(value: int) -> int:
+        """Return the size of a leSQLite2 variable-length integer without encoding it."""
+        if value <= 177:
+            return 1
+        if value <= 16561:
+            return 2
+        if value <= 524287:
+            return 3
+        return max(4, (value.bit_length() + 7) // 8 + 1)
+
+    @staticmethod
+    def peek_length(first_byte: int) -> int:
+        """Return the size of a leSQLite2 variable-length integer from its first byte."""
+        return _LE_SQLITE2_LENGTHS[first_byte]
+
+    @staticmethod
+    def skip(buf: ReadableBuffer, n: int, offset: int = 0) -> int:
+        """Skip `n` encoded integers starting at `offset` of `buf` without decoding them."""
+        return _skip_length_prefixed(_LE_SQLITE2_LENGTHS, buf, n, offset)
+
 
 class UnrealEngineSingedVLQ(Base):
     """
@@ -489,10 +1442,22 @@ class UnrealEngineSingedVLQ(Base):
     text=a%20package%20file.-,Compact%20Indices.,-Compact%20indices%20exist
     """
 
+    array_typecode = "q"
+    min_value = -(2 ** 35 - 1)
+    max_value = 2 ** 35 - 1
+
     @staticmethod
     def encode(value: int) -> bytes:
         """Encode an Unreal Engine signed variable-length quantity."""
-        bytearr = bytearray()
+        if 0 <= value < _table_size or _lru_size:
+            return _cached_encoding(UnrealEngineSingedVLQ, value)
+        result = bytearray()
+        UnrealEngineSingedVLQ._append(value, result)
+        return bytes(result)
+
+    @staticmethod
+    def _append(value: int, bytearr: bytearray) -> None:
+        """Append an Unreal Engine signed variable-length quantity to `bytearr`."""
         abs_value = abs(value)
         byte0 = (0 if value >= 0 else 0x80) + (
             abs_value if abs_value < 0x40 else ((abs_value & 0x3F) + 0x40)
@@ -516,11 +1481,42 @@ class UnrealEngineSingedVLQ(Base):
                         byte4 = abs_value
                         bytearr.append(byte4)
 
-        return bytes(bytearr)
+    @staticmethod
+    def encode_into(value: int, buf: WritableBuffer, offset: int = 0) -> int:
+        """Write an Unreal Engine signed variable-length quantity at `offset` of `buf`."""
+        abs_value = abs(value)
+        # 6 bits in the first byte, 7 in the next three, 8 in the last one
+        if abs_value < 1 << 6:
+            length = 1
+        elif abs_value < 1 << 13:
+            length = 2
+        elif abs_value < 1 << 20:
+            length = 3
+        elif abs_value < 1 << 27:
+            length = 4
+        else:
+            length = 5
+        end = offset + length
+        if end > len(buf):
+            raise IndexError("buffer too small for Unreal Engine VLQ")
+
+        sign = 0 if value >= 0 else 0x80
+        if length == 1:
+            buf[offset] = sign | abs_value
+            return end
+        buf[offset] = sign | 0x40 | (abs_value & 0x3F)
+        abs_value >>= 6
+        for position in range(offset + 1, end - 1):
+            buf[position] = (abs_value & 0x7F) | 0x80
+            abs_value >>= 7
+        buf[end - 1] = abs_value
+        return end
 
     @staticmethod
     def decode(buffer: BinaryIO | bytes) -> int:
         """Decode an Unreal Engine signed variable-length quantity."""
+        if isinstance(buffer, bytes):
+            return UnrealEngineSingedVLQ.decode_from(buffer)[0]
         buffer = Base.convert_to_binnary_io(buffer)
 
         value = 0
@@ -539,3 +1535,590 @@ class UnrealEngineSingedVLQ(Base):
         value = (value << 6) + (byte0 & 0x3F)
 
         return -value if byte0 & 0x80 else value
+
+    @staticmethod
+    def decode_from(buf: ReadableBuffer, offset: int = 0) -> Tuple[int, int]:
+        """Decode an Unreal Engine signed variable-length quantity starting at `offset` of `buf`."""
+        value = 0
+        byte0 = buf[offset]
+        offset += 1
+        if byte0 & 0x40:
+            byte1 = buf[offset]
+            offset += 1
+            if byte1 & 0x80:
+                byte2 = buf[offset]
+                offset += 1
+                if byte2 & 0x80:
+                    byte3 = buf[offset]
+                    offset += 1
+                    if byte3 & 0x80:
+                        value = buf[offset]
+                        offset += 1
+                    value = (value << 7) + (byte3 & 0x7F)
+                value = (value << 7) + (byte2 & 0x7F)
+            value = (value << 7) + (byte1 & 0x7F)
+        value = (value << 6) + (byte0 & 0x3F)
+
+        return (-value if byte0 & 0x80 else value), offset
+
+    @staticmethod
+    def _is_last_byte(byte: int, length: int) -> bool:
+        """The continuation bit is 0x40 in the first byte, 0x80 in the next ones and absent from the fifth."""
+        if length == 1:
+            return not byte & 0x40
+        return length == 5 or not byte & 0x80
+
+    @staticmethod
+    def encoded_length(value: int) -> int:
+        """Return the size of an Unreal Engine signed variable-length quantity without encoding it."""
+        # 6 bits in the first byte, 7 bits in each of the following ones
+        bit_length = abs(value).bit_length()
+        if bit_length <= 6:
+            return 1
+        return min(5, (bit_length + 7) // 7)
+
+
+class ZigZag(Base):
+    """
+    Signed adapter for an unsigned codec.
+
+    ZigZag encoding maps signed integers to unsigned ones so that values with
+    a small magnitude stay small (0 -> 0, -1 -> 1, 1 -> 2, -2 -> 3, ...).
+    The mapped value is stored with the wrapped unsigned `codec`, so the signed
+    variants keep its layout, e.g. the first-byte length of PrefixVarint.
+    """
+
+    codec: ClassVar[type[Base]] = Base
+    array_typecode = "q"
+    min_value: ClassVar[int | None] = None
+
+    @classmethod
+    def encode(cls, value: int) -> bytes:
+        """Encode a signed integer with the wrapped codec."""
+        return cls.codec.encode(zigzag_encode(value))
+
+    @classmethod
+    def _append(cls, value: int, out: bytearray) -> None:
+        """Append a signed integer encoded with the wrapped codec to `out`."""
+        cls.codec._append(zigzag_encode(value), out)
+
+    @classmethod
+    def encode_into(cls, value: int, buf: WritableBuffer, offset: int = 0) -> int:
+        """Write a signed integer encoded with the wrapped codec at `offset` of `buf`."""
+        return cls.codec.encode_into(zigzag_encode(value), buf, offset)
+
+    @classmethod
+    def decode(cls, buffer: BinaryIO | bytes) -> int:
+        """Decode a signed integer encoded with the wrapped codec."""
+        return zigzag_decode(cls.codec.decode(buffer))
+
+    @classmethod
+    def decode_from(cls, buf: ReadableBuffer, offset: int = 0) -> Tuple[int, int]:
+        """Decode a signed integer encoded with the wrapped codec starting at `offset` of `buf`."""
+        value, offset = cls.codec.decode_from(buf, offset)
+        return zigzag_decode(value), offset
+
+    @classmethod
+    def encoded_length(cls, value: int) -> int:
+        """Return the size of a signed integer encoded with the wrapped codec."""
+        return cls.codec.encoded_length(zigzag_encode(value))
+
+    @classmethod
+    def peek_length(cls, first_byte: int) -> int:
+        """Return the size of an encoded integer from its first byte."""
+        return cls.codec.peek_length(first_byte)
+
+    @classmethod
+    def _is_last_byte(cls, byte: int, length: int) -> bool:
+        """Return True if `byte`, the `length`-th byte of an integer, is its last one."""
+        return cls.codec._is_last_byte(byte, length)
+
+    @classmethod
+    def skip(cls, buf: ReadableBuffer, n: int, offset: int = 0) -> int:
+        """Skip `n` encoded integers starting at `offset` of `buf` without decoding them."""
+        return cls.codec.skip(buf, n, offset)
+
+    @classmethod
+    def encode_many(cls, values: Iterable[int]) -> bytes:
+        """
+        Encode a sequence of signed integers into one contiguous byte string.
+        """
+        return cls.codec.encode_many(map(zigzag_encode, values))
+
+
+class ZigZagPrefixVarint(ZigZag):
+    """
+    PrefixVarint of ZigZag-mapped signed integers.
+    """
+
+    codec = PrefixVarint
+    has_length_prefix = True
+    min_value = -2 ** 63
+    max_value = 2 ** 63 - 1
+
+
+class ZigZagUnsignedLEB128(ZigZag):
+    """
+    Unsigned LEB128 of ZigZag-mapped signed integers, as used by protobuf sint fields.
+    """
+
+    codec = UnsignedLEB128
+
+
+class ZigZagVariableLengthQuantity(ZigZag):
+    """
+    Variable-Length Quantity of ZigZag-mapped signed integers.
+    """
+
+    codec = VariableLengthQuantity
+
+
+class ZigZagSQLite4VLI(ZigZag):
+    """
+    SQLite4 variable-length integer of ZigZag-mapped signed integers.
+    """
+
+    codec = SQLite4VLI
+    has_length_prefix = True
+    min_value = -2 ** 63
+    max_value = 2 ** 63 - 1
+
+
+class ZigZagLeSQLite(ZigZag):
+    """
+    leSQLite variable-length integer of ZigZag-mapped signed integers.
+    """
+
+    codec = LeSQLite
+    has_length_prefix = True
+    min_value = -2 ** 63
+    max_value = 2 ** 63 - 1
+
+
+class ZigZagLeSQLite2(ZigZag):
+    """
+    leSQLite2 variable-length integer of ZigZag-mapped signed integers.
+    """
+
+    codec = LeSQLite2
+    has_length_prefix = True
+    min_value = -2 ** 63
+    max_value = 2 ** 63 - 1
+
+
+def _uint32_length(value: int) -> int:
+    """Number of bytes (1-4) used for a 32-bit value in a Group Varint / Stream VByte group."""
+    length = (value.bit_length() + 7) // 8
+    if length > 4 or value < 0:
+        raise OverflowError(f"{value} is not an unsigned 32-bit integer")
+    return length or 1
+
+
+class BlockCodec:
+    """
+    Base class for codecs that encode whole sequences of integers rather than single values.
+
+    The encoded sequence starts with its length as an unsigned LEB128.
+    """
+
+    array_typecode: ClassVar[str] = "I"
+    min_value: ClassVar[int | None] = 0
+    max_value: ClassVar[int | None] = 2 ** 32 - 1
+
+    @staticmethod
+    def encode_many(values: Iterable[int]) -> bytes:
+        """base function for encoding a sequence"""
+        raise NotImplementedError
+
+    @staticmethod
+    def decode_many(buffer: BinaryIO | ReadableBuffer, as_array: bool = False) -> MutableSequence[int]:
+        """base function for decoding a sequence"""
+        raise NotImplementedError
+
+    @staticmethod
+    def _read_buffer(buffer: BinaryIO | ReadableBuffer) -> ReadableBuffer:
+        if isinstance(buffer, (bytes, bytearray, memoryview, mmap)):
+            return buffer
+        return buffer.read()
+
+
+class GroupVarint(BlockCodec):
+    """
+    Group Varint encoding of unsigned 32-bit integers, as described by Google.
+
+    Values are stored in groups of four. Every group starts with a control byte
+    holding the byte length (1-4) of each value in 2 bits, lowest bits first,
+    followed by the values in little-endian order:
+
+    [control] [value 0] [value 1] [value 2] [value 3]
+
+    Unlike LEB128 no byte carries continuation bits, so a whole group is decoded
+    from a single table lookup on the control byte. A trailing partial group
+    only stores the values that exist.
+    """
+
+    @staticmethod
+    def encode_many(values: Iterable[int]) -> bytes:
+        """Encode unsigned 32-bit integers with Group Varint."""
+        values = list(values)
+        result = bytearray()
+        UnsignedLEB128._append(len(values), result)
+        for start in range(0, len(values), 4):
+            control_position = len(result)
+            result.append(0)
+            control = 0
+            for shift, value in enumerate(values[start:start + 4]):
+                length = _uint32_length(value)
+                control |= (length - 1) << (2 * shift)
+                result += value.to_bytes(length, "little")
+            result[control_position] = control
+        return bytes(result)
+
+    @staticmethod
+    def decode_many(buffer: BinaryIO | ReadableBuffer, as_array: bool = False) -> MutableSequence[int]:
+        """Decode a Group Varint encoded sequence."""
+        buf = BlockCodec._read_buffer(buffer)
+        result: MutableSequence[int] = array(GroupVarint.array_typecode) if as_array else []
+        count, offset = UnsignedLEB128.decode_from(buf)
+        end = len(buf)
+
+        for _ in range(count // 4):
+            start = offset + 1
+            offsets = _GROUP_OFFSETS[buf[offset]]
+            offset = start + offsets[4]
+            if offset > end:
+                raise IndexError("truncated Group Varint")
+            result.append(int.from_bytes(buf[start:start + offsets[1]], "little"))
+            result.append(int.from_bytes(buf[start + offsets[1]:start + offsets[2]], "little"))
+            result.append(int.from_bytes(buf[start + offsets[2]:start + offsets[3]], "little"))
+            result.append(int.from_bytes(buf[start + offsets[3]:offset], "little"))
+
+        remaining = count % 4
+        if remaining:
+            start = offset + 1
+            offsets = _GROUP_OFFSETS[buf[offset]]
+            if start + offsets[remaining] > end:
+                raise IndexError("truncated Group Varint")
+            for index in range(remaining):
+                result.append(int.from_bytes(buf[start + offsets[index]:start + offsets[index + 1]], "little"))
+        return result
+
+
+class StreamVByte(BlockCodec):
+    """
+    Stream VByte encoding of unsigned 32-bit integers (Lemire et al.).
+
+    Uses the same 2-bit lengths as Group Varint, but stores all control bytes
+    in one stream followed by all data bytes in another:
+
+    [count] [control 0] ... [control N/4] [value 0] ... [value N]
+
+    Keeping the control bytes apart lets a decoder find every value boundary
+    from the control stream alone, before touching the data.
+    """
+
+    @staticmethod
+    def encode_many(values: Iterable[int]) -> bytes:
+        """Encode unsigned 32-bit integers with Stream VByte."""
+        values = list(values)
+        result = bytearray()
+        UnsignedLEB128._append(len(values), result)
+        controls = bytearray((len(values) + 3) // 4)
+        data = bytearray()
+        for index, value in enumerate(values):
+            length = _uint32_length(value)
+            controls[index >> 2] |= (length - 1) << (2 * (index & 3))
+            data += value.to_bytes(length, "little")
+        result += controls
+        result += data
+        return bytes(result)
+
+    @staticmethod
+    def decode_many(buffer: BinaryIO | ReadableBuffer, as_array: bool = False) -> MutableSequence[int]:
+        """Decode a Stream VByte encoded sequence."""
+        buf = BlockCodec._read_buffer(buffer)
+        result: MutableSequence[int] = array(StreamVByte.array_typecode) if as_array else []
+        count, control_offset = UnsignedLEB128.decode_from(buf)
+        offset = control_offset + (count + 3) // 4
+        end = len(buf)
+        if offset > end:
+            raise IndexError("truncated Stream VByte")
+
+        for group in range(count // 4):
+            start = offset
+            offsets = _GROUP_OFFSETS[buf[control_offset + group]]
+            offset = start + offsets[4]
+            if offset > end:
+                raise IndexError("truncated Stream VByte")
+            result.append(int.from_bytes(buf[start:start + offsets[1]], "little"))
+            result.append(int.from_bytes(buf[start + offsets[1]:start + offsets[2]], "little"))
+            result.append(int.from_bytes(buf[start + offsets[2]:start + offsets[3]], "little"))
+            result.append(int.from_bytes(buf[start + offsets[3]:offset], "little"))
+
+        remaining = count % 4
+        if remaining:
+            offsets = _GROUP_OFFSETS[buf[control_offset + count // 4]]
+            if offset + offsets[remaining] > end:
+                raise IndexError("truncated Stream VByte")
+            for index in range(remaining):
+                result.append(int.from_bytes(buf[offset + offsets[index]:offset + offsets[index + 1]], "little"))
+        return result
+
+
+def _uint64_values(values: Iterable[int]) -> List[int]:
+    values = list(values)
+    for value in values:
+        if value < 0 or value >> 64:
+            raise OverflowError(f"{value} is not an unsigned 64-bit integer")
+    return values
+
+
+def _pack_bits(deltas: List[int], width: int, result: bytearray) -> None:
+    """Append `deltas` on `width` bits each, lowest bits first, in groups of 8 values taking `width` bytes."""
+    if not width:
+        return
+    for start in range(0, len(deltas), 8):
+        packed = 0
+        shift = 0
+        for delta in deltas[start:start + 8]:
+            packed |= delta << shift
+            shift += width
+        result += packed.to_bytes(width, "little")
+
+
+def _unpack_bits(buf: ReadableBuffer, offset: int, count: int, width: int, base: int) -> Tuple[List[int], int]:
+    """Read `count` values packed by `_pack_bits`, add `base` to them and return them with the end offset."""
+    if not width:
+        return [base] * count, offset
+    end = offset + (count + 7) // 8 * width
+    if end > len(buf):
+        raise IndexError("truncated bit-packed block")
+    mask = (1 << width) - 1
+    values: List[int] = []
+    for start in range(0, count, 8):
+        packed = int.from_bytes(buf[offset:offset + width], "little")
+        offset += width
+        for _ in range(min(8, count - start)):
+            values.append(base + (packed & mask))
+            packed >>= width
+    return values, end
+
+
+def _patched_width(widths: List[int]) -> int:
+    """
+    Pick the bit width of a patched frame-of-reference block: the one with the
+    smallest encoded size, counting 1 position byte and a LEB128 high part per exception.
+    """
+    histogram = [0] * 65
+    for width in widths:
+        histogram[width] += 1
+    present = [width for width in range(65) if histogram[width]]
+    groups = (len(widths) + 7) // 8
+    best_width = 0
+    best_size = -1
+    for candidate in present:
+        size = groups * candidate
+        for width in present:
+            if width > candidate:
+                size += histogram[width] * (1 + (width - candidate + 6) // 7)
+        if best_size < 0 or size < best_size:
+            best_width = candidate
+            best_size = size
+    return best_width
+
+
+class FrameOfReference(BlockCodec):
+    """
+    Frame-of-reference bit packing of unsigned 64-bit integers.
+
+    Values are stored in blocks of 128. Every block stores its smallest value as an
+    unsigned LEB128 and a byte with the bit width of the largest difference to it,
+    then the differences packed on that many bits:
+
+    [count] [minimum] [width] [packed differences] [minimum] [width] ...
+
+    Differences are packed lowest bits first in groups of 8 values, so that every
+    group takes exactly `width` bytes. Columns whose values stay close to each
+    other (timestamps, gauges, deltas of sorted ids) need a few bits per value.
+    """
+
+    array_typecode = "Q"
+    max_value = 2 ** 64 - 1
+    block_size: ClassVar[int] = _BIT_PACKING_BLOCK_SIZE
+
+    @staticmethod
+    def encode_many(values: Iterable[int]) -> bytes:
+        """Encode unsigned 64-bit integers with frame-of-reference bit packing."""
+        values = _uint64_values(values)
+        result = bytearray()
+        UnsignedLEB128._append(len(values), result)
+        for start in range(0, len(values), _BIT_PACKING_BLOCK_SIZE):
+            block = values[start:start + _BIT_PACKING_BLOCK_SIZE]
+            base = min(block)
+            width = (max(block) - base).bit_length()
+            UnsignedLEB128._append(base, result)
+            result.append(width)
+            _pack_bits([value - base for value in block], width, result)
+        return bytes(result)
+
+    @staticmethod
+    def decode_many(buffer: BinaryIO | ReadableBuffer, as_array: bool = False) -> MutableSequence[int]:
+        """Decode a frame-of-reference encoded sequence."""
+        buf = BlockCodec._read_buffer(buffer)
+        result: MutableSequence[int] = array(FrameOfReference.array_typecode) if as_array else []
+        count, offset = UnsignedLEB128.decode_from(buf)
+        for start in range(0, count, _BIT_PACKING_BLOCK_SIZE):
+            base, offset = UnsignedLEB128.decode_from(buf, offset)
+            if offset >= len(buf):
+                raise IndexError("truncated frame-of-reference block")
+            width = buf[offset]
+            values, offset = _unpack_bits(buf, offset + 1, min(_BIT_PACKING_BLOCK_SIZE, count - start), width, base)
+            result.extend(values)
+        return result
+
+
+class PatchedFrameOfReference(BlockCodec):
+    """
+    Patched frame-of-reference (PFor) bit packing of unsigned 64-bit integers.
+
+    Like FrameOfReference, but a few outliers do not widen a whole block: every
+    block picks the bit width that minimizes its size, stores the low bits of all
+    differences on that width and patches the values that do not fit (exceptions)
+    with their high bits:
+
+    [minimum] [width] [exception count] [packed low bits] [exception positions] [high bits] ...
+
+    Exception positions take one byte each, their high bits are unsigned LEB128.
+    """
+
+    array_typecode = "Q"
+    max_value = 2 ** 64 - 1
+    block_size: ClassVar[int] = _BIT_PACKING_BLOCK_SIZE
+
+    @staticmethod
+    def encode_many(values: Iterable[int]) -> bytes:
+        """Encode unsigned 64-bit integers with patched frame-of-reference bit packing."""
+        values = _uint64_values(values)
+        result = bytearray()
+        UnsignedLEB128._append(len(values), result)
+        for start in range(0, len(values), _BIT_PACKING_BLOCK_SIZE):
+            block = values[start:start + _BIT_PACKING_BLOCK_SIZE]
+            base = min(block)
+            deltas = [value - base for value in block]
+            width = _patched_width([delta.bit_length() for delta in deltas])
+            mask = (1 << width) - 1
+            exceptions = [position for position, delta in enumerate(deltas) if delta > mask]
+            UnsignedLEB128._append(base, result)
+            result.append(width)
+            result.append(len(exceptions))
+            _pack_bits([delta & mask for delta in deltas], width, result)
+            result += bytes(exceptions)
+            for position in exceptions:
+                UnsignedLEB128._append(deltas[position] >> width, result)
+        return bytes(result)
+
+    @staticmethod
+    def decode_many(buffer: BinaryIO | ReadableBuffer, as_array: bool = False) -> MutableSequence[int]:
+        """Decode a patched frame-of-reference encoded sequence."""
+        buf = BlockCodec._read_buffer(buffer)
+        result: MutableSequence[int] = array(PatchedFrameOfReference.array_typecode) if as_array else []
+        count, offset = UnsignedLEB128.decode_from(buf)
+        for start in range(0, count, _BIT_PACKING_BLOCK_SIZE):
+            base, offset = UnsignedLEB128.decode_from(buf, offset)
+            if offset + 2 > len(buf):
+                raise IndexError("truncated patched frame-of-reference block")
+            width = buf[offset]
+            exception_count = buf[offset + 1]
+            size = min(_BIT_PACKING_BLOCK_SIZE, count - start)
+            values, offset = _unpack_bits(buf, offset + 2, size, width, base)
+            positions_end = offset + exception_count
+            if positions_end > len(buf):
+                raise IndexError("truncated patched frame-of-reference block")
+            positions = buf[offset:positions_end]
+            offset = positions_end
+            for position in positions:
+                high, offset = UnsignedLEB128.decode_from(buf, offset)
+                values[position] += high << width
+            result.extend(values)
+        return result
+
+
+class Simple8b(BlockCodec):
+    """
+    Simple-8b encoding of unsigned integers below 2**60 (Anh and Moffat).
+
+    Values are packed into 64-bit little-endian words. The low 4 bits of a word
+    select how the other 60 bits are split: from 240 or 120 zeros, 60 values of
+    1 bit, 30 of 2 bits ... down to a single value of 60 bits. Every word takes
+    as many of the next values as fit:
+
+    [count] [word 0] [word 1] ...
+
+    Runs of small values pack many to a word, and a word is decoded with shifts
+    and one mask, without any per-byte branching.
+    """
+
+    array_typecode = "Q"
+    max_value = 2 ** 60 - 1
+
+    @staticmethod
+    def encode_many(values: Iterable[int]) -> bytes:
+        """Encode unsigned integers below 2**60 with Simple-8b."""
+        values = list(values)
+        widths: List[int] = []
+        for value in values:
+            if value < 0 or value >> 60:
+                raise OverflowError(f"{value} does not fit in the 60 bits of a Simple-8b word")
+            widths.append(value.bit_length())
+
+        result = bytearray()
+        UnsignedLEB128._append(len(values), result)
+        position = 0
+        count = len(values)
+        while position < count:
+            selector = 0
+            capacity = 0
+            bits = 0
+            for selector in range(16):
+                capacity, bits = _SIMPLE8B_SELECTORS[selector]
+                fits = True
+                for width in widths[position:position + capacity]:
+                    if width > bits:
+                        fits = False
+                        break
+                if fits:
+                    break
+            word = selector
+            shift = 4
+            for value in values[position:position + capacity]:
+                word |= value << shift
+                shift += bits
+            result += word.to_bytes(8, "little")
+            position += capacity
+        return bytes(result)
+
+    @staticmethod
+    def decode_many(buffer: BinaryIO | ReadableBuffer, as_array: bool = False) -> MutableSequence[int]:
+        """Decode a Simple-8b encoded sequence."""
+        buf = BlockCodec._read_buffer(buffer)
+        result: MutableSequence[int] = array(Simple8b.array_typecode) if as_array else []
+        count, offset = UnsignedLEB128.decode_from(buf)
+        end = len(buf)
+        remaining = count
+        while remaining > 0:
+            if offset + 8 > end:
+                raise IndexError("truncated Simple-8b")
+            word = int.from_bytes(buf[offset:offset + 8], "little")
+            offset += 8
+            capacity, bits = _SIMPLE8B_SELECTORS[word & 15]
+            size = min(capacity, remaining)
+            remaining -= size
+            if not bits:
+                result.extend([0] * size)
+                continue
+            mask = (1 << bits) - 1
+            word >>= 4
+            for _ in range(size):
+                result.append(word & mask)
+                word >>= bits
+        return result
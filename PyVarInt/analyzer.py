@@ -0,0 +1,222 @@
+"""Pick the most compact codec for a column of integers.
+
+`analyze` computes the exact encoded size of the values under every codec in
+`PyVarInt.algorithms` (vectorized when given a NumPy array) and, when decode
+costs measured by `PyVarInt.bench` are supplied, the expected decode time.
+`best_codec` turns that into a single recommendation.
+"""
+import json
+import os
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple, Type, Union
+
+from PyVarInt.algorithms import (Base,
+                                 PrefixVarint,
+                                 UnsignedLEB128,
+                                 SignedLEB128,
+                                 VariableLengthQuantity,
+                                 SQLite4VLI,
+                                 LeSQLite,
+                                 LeSQLite2,
+                                 UnrealEngineSingedVLQ,
+                                 ZigZagPrefixVarint,
+                                 ZigZagUnsignedLEB128,
+                                 ZigZagVariableLengthQuantity,
+                                 ZigZagSQLite4VLI,
+                                 ZigZagLeSQLite,
+                                 ZigZagLeSQLite2)
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - depends on the environment
+    np = None  # type: ignore[assignment]
+
+CODECS: List[Type[Base]] = [PrefixVarint,
+                            UnsignedLEB128,
+                            SignedLEB128,
+                            VariableLengthQuantity,
+                            SQLite4VLI,
+                            LeSQLite,
+                            LeSQLite2,
+                            UnrealEngineSingedVLQ,
+                            ZigZagPrefixVarint,
+                            ZigZagUnsignedLEB128,
+                            ZigZagVariableLengthQuantity,
+                            ZigZagSQLite4VLI,
+                            ZigZagLeSQLite,
+                            ZigZagLeSQLite2]
+
+# Largest magnitude of a NumPy integer column
+_MAX_MAGNITUDE = 2 ** 64 - 1
+
+
+class CodecEstimate(NamedTuple):
+    """Encoded size, and optionally decode cost, of a column under one codec."""
+    codec: Type[Base]
+    size: int
+    bytes_per_value: float
+    decode_ns_per_value: Optional[float]
+
+
+# (codec, negative) -> result of _length_steps
+_LENGTH_STEPS: Dict[Tuple[Type[Base], bool], Tuple[Tuple[int, ...], Tuple[int, ...]]] = {}
+
+
+def _length_steps(codec: Type[Base], negative: bool) -> Tuple[Tuple[int, ...], Tuple[int, ...]]:
+    """
+    Describe `codec.encoded_length` as a step function of the magnitude.
+
+    Returns the largest magnitude of every length step and the matching lengths,
+    so the length of a magnitude `m` is `lengths[searchsorted(bounds, m)]`.
+    """
+    steps = _LENGTH_STEPS.get((codec, negative))
+    if steps is None:
+        steps = _LENGTH_STEPS[codec, negative] = _find_length_steps(codec, negative)
+    return steps
+
+
+def _find_length_steps(codec: Type[Base], negative: bool) -> Tuple[Tuple[int, ...], Tuple[int, ...]]:
+    sign = -1 if negative else 1
+    limit = codec.min_value if negative else codec.max_value
+    high = _MAX_MAGNITUDE if limit is None else min(_MAX_MAGNITUDE, abs(limit))
+    low = 1 if negative else 0
+    bounds: List[int] = []
+    lengths: List[int] = []
+    while low <= high:
+        length = codec.encoded_length(sign * low)
+        # Largest magnitude still encoded with `length` bytes
+        first, last = low, high
+        while first < last:
+            middle = (first + last + 1) // 2
+            if codec.encoded_length(sign * middle) == length:
+                first = middle
+            else:
+                last = middle - 1
+        bounds.append(first)
+        lengths.append(length)
+        low = first + 1
+    return tuple(bounds), tuple(lengths)
+
+
+def _fits(codec: Type[Base], low: int, high: int) -> bool:
+    return ((codec.min_value is None or low >= codec.min_value)
+            and (codec.max_value is None or high <= codec.max_value))
+
+
+def _vectorized_size(codec: Type[Base], column: Any) -> int:
+    size = 0
+    if column.dtype.kind == "i":
+        negative = column[column < 0]
+        if negative.size:
+            bounds, lengths = _length_steps(codec, True)
+            magnitude = (~negative).astype(np.uint64) + np.uint64(1)
+            steps = np.searchsorted(np.array(bounds, dtype=np.uint64), magnitude)
+            size += int(np.array(lengths)[steps].sum())
+            column = column[column >= 0]
+    bounds, lengths = _length_steps(codec, False)
+    steps = np.searchsorted(np.array(bounds, dtype=np.uint64), column.astype(np.uint64))
+    return size + int(np.array(lengths)[steps].sum())
+
+
+def encoded_sizes(values: Union[Iterable[int], Any],
+                  codecs: Optional[Sequence[Type[Base]]] = None) -> Dict[Type[Base], Optional[int]]:
+    """
+    Return the exact number of bytes `values` take under every codec.
+
+    The size is None for codecs that cannot represent every value, e.g. unsigned
+    codecs for negative input. NumPy integer arrays are measured without a
+    Python-level loop per value.
+    """
+    codecs = list(CODECS if codecs is None else codecs)
+    column: Any
+    vectorized = False
+    if np is not None and isinstance(values, np.ndarray) and values.dtype.kind in "iu":
+        vectorized = True
+        column = values.reshape(-1)
+        if not column.size:
+            return {codec: 0 for codec in codecs}
+        low, high = int(column.min()), int(column.max())
+    else:
+        column = values if isinstance(values, (list, tuple)) else list(values)
+        if not column:
+            return {codec: 0 for codec in codecs}
+        low, high = min(column), max(column)
+
+    sizes: Dict[Type[Base], Optional[int]] = {}
+    for codec in codecs:
+        if not _fits(codec, low, high):
+            sizes[codec] = None
+        elif vectorized:
+            sizes[codec] = _vectorized_size(codec, column)
+        else:
+            sizes[codec] = sum(map(codec.encoded_length, column))
+    return sizes
+
+
+def decode_costs(report: Union[Dict[str, Any], str, os.PathLike],
+                 backend: Optional[str] = None,
+                 operation: str = "decode_bytes") -> Dict[str, float]:
+    """
+    Read average decode cost in nanoseconds per value, keyed by codec name,
+    from a `PyVarInt.bench` JSON report (a dict or a path to the file).
+
+    Uses the "mypyc" measurements when present unless `backend` is given.
+    """
+    if isinstance(report, dict):
+        data = report
+    else:
+        with open(report, encoding="utf-8") as file:
+            data = json.load(file)
+    if backend is None:
+        backend = "mypyc" if "mypyc" in data["backends"] else data["backends"][0]
+
+    totals: Dict[str, List[float]] = {}
+    for result in data["results"]:
+        if result["backend"] == backend and result["operation"] == operation:
+            totals.setdefault(result["codec"], []).append(result["seconds"] / result["values"])
+    return {codec: sum(costs) / len(costs) * 1e9 for codec, costs in totals.items()}
+
+
+def analyze(values: Union[Iterable[int], Any],
+            codecs: Optional[Sequence[Type[Base]]] = None,
+            costs: Optional[Dict[str, float]] = None) -> List[CodecEstimate]:
+    """
+    Estimate size and decode cost of `values` under every codec that can represent them,
+    most compact first. `costs` maps codec names to decode ns per value, see `decode_costs`.
+    """
+    if not isinstance(values, (list, tuple)) and not (np is not None and isinstance(values, np.ndarray)):
+        values = list(values)
+    count = len(values)
+    estimates = []
+    for codec, size in encoded_sizes(values, codecs).items():
+        if size is None:
+            continue
+        cost = costs.get(codec.__name__) if costs else None
+        estimates.append(CodecEstimate(codec, size, size / count if count else 0.0, cost))
+    estimates.sort(key=lambda estimate: (estimate.size,
+                                         estimate.decode_ns_per_value if estimate.decode_ns_per_value is not None
+                                         else float("inf")))
+    return estimates
+
+
+def best_codec(values: Union[Iterable[int], Any],
+               codecs: Optional[Sequence[Type[Base]]] = None,
+               costs: Optional[Dict[str, float]] = None,
+               ns_per_byte: float = 0.0) -> Type[Base]:
+    """
+    Return the codec that minimizes `bytes_per_value + decode_ns_per_value / ns_per_byte`.
+
+    With the default `ns_per_byte=0` only the encoded size counts (decode cost
+    breaks ties); a positive value says how many nanoseconds of decode time per
+    value one byte of storage is worth.
+    """
+    estimates = analyze(values, codecs, costs)
+    if not estimates:
+        raise ValueError("no codec can represent every value")
+    if not ns_per_byte or not costs:
+        return estimates[0].codec
+
+    def _score(estimate: CodecEstimate) -> float:
+        cost = estimate.decode_ns_per_value
+        return estimate.bytes_per_value + (cost / ns_per_byte if cost is not None else float("inf"))
+
+    return min(estimates, key=_score).codec
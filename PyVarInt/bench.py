@@ -0,0 +1,220 @@
+"""Reproducible throughput benchmarks for the codecs in `PyVarInt.algorithms`.
+
+Run it with::
+
+    python -m PyVarInt.bench --size 100000 --output results.json
+
+Every codec is measured on every value distribution it can represent, for
+batch and per-value encoding and for decoding from `bytes`, `BytesIO` and a real
+file. `--table-size` and `--lru-size` set the pre-encoded value caches used by
+per-value encoding, see `PyVarInt.algorithms.set_encode_cache`. When the
+mypyc-compiled extension is installed, the pure-Python source is loaded next to
+it and measured as well, so both builds can be compared in one run.
+"""
+import argparse
+import importlib.util
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+from io import BytesIO
+from types import ModuleType
+from typing import Callable, Dict, List, Optional, Sequence, Type
+
+import PyVarInt.algorithms
+from PyVarInt import is_compiled
+from PyVarInt.algorithms import Base
+
+CODEC_NAMES = ["PrefixVarint",
+               "UnsignedLEB128",
+               "SignedLEB128",
+               "VariableLengthQuantity",
+               "SQLite4VLI",
+               "LeSQLite",
+               "LeSQLite2",
+               "UnrealEngineSingedVLQ",
+               "ZigZagPrefixVarint",
+               "ZigZagUnsignedLEB128",
+               "ZigZagVariableLengthQuantity",
+               "ZigZagSQLite4VLI",
+               "ZigZagLeSQLite",
+               "ZigZagLeSQLite2"]
+
+
+def _uniform_small(rng: random.Random, size: int) -> List[int]:
+    return [rng.randrange(256) for _ in range(size)]
+
+
+def _zipfian(rng: random.Random, size: int) -> List[int]:
+    # Discrete Pareto samples: a few huge values, mostly tiny ones
+    return [min(int(rng.paretovariate(1.1)) - 1, 2 ** 32) for _ in range(size)]
+
+
+def _uniform_64bit(rng: random.Random, size: int) -> List[int]:
+    return [rng.getrandbits(64) for _ in range(size)]
+
+
+def _monotonic_deltas(rng: random.Random, size: int) -> List[int]:
+    # First differences of a sorted id column
+    return [rng.randrange(1, 1000) for _ in range(size)]
+
+
+def _negative(rng: random.Random, size: int) -> List[int]:
+    # Signed deltas, only run for the signed codecs
+    return [rng.randrange(-2 ** 20, 2 ** 20) for _ in range(size)]
+
+
+DISTRIBUTIONS: Dict[str, Callable[[random.Random, int], List[int]]] = {
+    "uniform_small": _uniform_small,
+    "zipfian": _zipfian,
+    "uniform_64bit": _uniform_64bit,
+    "monotonic_deltas": _monotonic_deltas,
+    "negative": _negative,
+}
+
+
+def load_backends() -> Dict[str, ModuleType]:
+    """
+    Return the importable builds of `PyVarInt.algorithms` keyed by backend name:
+    "mypyc" for the compiled extension and "python" for the pure-Python source.
+    """
+    module = PyVarInt.algorithms
+    if not is_compiled(module):
+        return {"python": module}
+
+    backends = {"mypyc": module}
+    source = os.path.join(os.path.dirname(PyVarInt.__file__ or ""), "algorithms.py")
+    if os.path.exists(source):
+        spec = importlib.util.spec_from_file_location("PyVarInt._bench_pure_algorithms", source)
+        if spec is not None and spec.loader is not None:
+            pure = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(pure)
+            backends["python"] = pure
+    return backends
+
+
+def _best_time(function: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _can_encode(codec: Type[Base], values: List[int]) -> bool:
+    return ((codec.min_value is None or min(values) >= codec.min_value)
+            and (codec.max_value is None or max(values) <= codec.max_value))
+
+
+def _positive_int(text: str) -> int:
+    value = int(text)
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"must be a positive integer, got {value}")
+    return value
+
+
+def run(size: int = 100000,
+        repeat: int = 5,
+        seed: int = 0,
+        codecs: Optional[Sequence[str]] = None,
+        distributions: Optional[Sequence[str]] = None,
+        table_size: int = 1024,
+        lru_size: int = 0) -> Dict[str, object]:
+    """Run the benchmark matrix and return the results as a JSON-serializable dict."""
+    if size < 1 or repeat < 1:
+        raise ValueError("size and repeat must be positive")
+    codecs = list(codecs or CODEC_NAMES)
+    distributions = list(distributions or DISTRIBUTIONS)
+    backends = load_backends()
+    # The cache settings are process-wide, put them back once the benchmark is done
+    previous = {backend: module.encode_cache_info() for backend, module in backends.items()}
+    for module in backends.values():
+        module.set_encode_cache(table_size, lru_size)
+    results: List[Dict[str, object]] = []
+
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            for distribution in distributions:
+                values = DISTRIBUTIONS[distribution](random.Random(seed), size)
+                for codec_name in codecs:
+                    for backend, module in backends.items():
+                        codec = getattr(module, codec_name)
+                        if not _can_encode(codec, values):
+                            continue
+                        encoded = codec.encode_many(values)
+                        path = os.path.join(directory, f"{codec_name}.bin")
+                        with open(path, "wb") as file:
+                            file.write(encoded)
+
+                        def _decode_file() -> List[int]:
+                            with open(path, "rb") as stream:
+                                return list(codec.iter_decode(stream))
+
+                        operations: Dict[str, Callable[[], object]] = {
+                            "encode": lambda: codec.encode_many(values),
+                            "encode_scalar": lambda: list(map(codec.encode, values)),
+                            "decode_bytes": lambda: codec.decode_many(encoded),
+                            "decode_bytesio": lambda: codec.decode_many(BytesIO(encoded), count=size),
+                            "decode_file": _decode_file,
+                        }
+                        for operation, function in operations.items():
+                            seconds = _best_time(function, repeat)
+                            results.append({
+                                "backend": backend,
+                                "codec": codec_name,
+                                "distribution": distribution,
+                                "operation": operation,
+                                "values": size,
+                                "seconds": seconds,
+                                "values_per_second": size / seconds if seconds else None,
+                                "bytes_per_value": len(encoded) / size,
+                            })
+    finally:
+        for backend, info in previous.items():
+            backends[backend].set_encode_cache(info["table_size"], info["lru_size"])
+
+    return {
+        "python": sys.version,
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "seed": seed,
+        "backends": sorted(backends),
+        "table_size": table_size,
+        "lru_size": lru_size,
+        "results": results,
+    }
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m PyVarInt.bench", description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=_positive_int, default=100000, help="number of values per distribution")
+    parser.add_argument("--repeat", type=_positive_int, default=5, help="runs per measurement, the best one is kept")
+    parser.add_argument("--seed", type=int, default=0, help="random seed for the value distributions")
+    parser.add_argument("--codec", dest="codecs", action="append", choices=CODEC_NAMES,
+                        help="codec to benchmark, may be repeated (default: all)")
+    parser.add_argument("--distribution", dest="distributions", action="append", choices=list(DISTRIBUTIONS),
+                        help="value distribution, may be repeated (default: all)")
+    parser.add_argument("--table-size", type=int, default=1024,
+                        help="pre-encoded small values per codec for per-value encoding (0 disables)")
+    parser.add_argument("--lru-size", type=int, default=0,
+                        help="recently encoded larger values cached per codec (0 disables)")
+    parser.add_argument("--output", help="write the JSON report to this file instead of stdout")
+    args = parser.parse_args(argv)
+
+    report = run(size=args.size, repeat=args.repeat, seed=args.seed,
+                 codecs=args.codecs, distributions=args.distributions,
+                 table_size=args.table_size, lru_size=args.lru_size)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,299 @@
+"""
+Block-structured column files with per-block statistics.
+
+A column is written as independent blocks of `block_size` values, each encoded
+with its own codec. A footer at the end of the file describes every block:
+
+    "PVCF" | version | block 0 | block 1 | ... | footer | footer size (8 bytes LE) | "PVCF"
+
+    footer: block count, then per block: codec id, value count, byte size,
+            ZigZag minimum, ZigZag maximum (all unsigned LEB128), then a CRC-32 of the footer
+
+Readers memory-map the file and only parse the footer up front. Blocks whose
+[minimum, maximum] range misses a predicate are skipped without being read, the
+others are decoded on their own, optionally in parallel.
+"""
+import mmap
+import os
+import zlib
+from array import array
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import BinaryIO, Iterable, Iterator, List, MutableSequence, NamedTuple, Optional, Union
+
+from PyVarInt.algorithms import UnsignedLEB128, zigzag_decode, zigzag_encode
+from PyVarInt.registry import Codec, codec_for, codec_id
+
+MAGIC = b"PVCF"
+VERSION = 1
+_HEADER_SIZE = len(MAGIC) + 1
+_TRAILER_SIZE = 8 + len(MAGIC)
+
+
+class ColumnFileError(ValueError):
+    """The file is not a valid column file."""
+
+
+class BlockInfo(NamedTuple):
+    codec: Codec
+    value_count: int
+    # Byte offset of the block in the file and its encoded size
+    offset: int
+    size: int
+    minimum: int
+    maximum: int
+    # Index of the first value of the block in the column
+    first_row: int
+
+    def overlaps(self, low: Optional[int], high: Optional[int]) -> bool:
+        """Return True if some value of the block may lie in [low, high]."""
+        return (low is None or self.maximum >= low) and (high is None or self.minimum <= high)
+
+
+class ColumnWriter:
+    """
+    Writes a column file block by block.
+
+    Values passed to `write` are buffered and encoded with `codec` every
+    `block_size` values; `write_block` writes one block right away, optionally
+    with another codec. The footer is written by `close`.
+    """
+
+    def __init__(self, path: Union[str, os.PathLike], codec: Codec = UnsignedLEB128,
+                 block_size: int = 65536) -> None:
+        if block_size < 1:
+            raise ValueError("block_size must be positive")
+        codec_id(codec)
+        self.codec = codec
+        self.block_size = block_size
+        self._file: BinaryIO = open(path, "wb")
+        self._file.write(MAGIC + bytes([VERSION]))
+        self._footer = bytearray()
+        self._block_count = 0
+        self._pending: List[int] = []
+
+    def write(self, values: Iterable[int]) -> None:
+        """Append values to the column."""
+        pending = self._pending
+        pending.extend(values)
+        block_size = self.block_size
+        if len(pending) >= block_size:
+            full = len(pending) - len(pending) % block_size
+            self._pending = pending[full:]
+            for start in range(0, full, block_size):
+                self._write_block(pending[start:start + block_size], self.codec)
+
+    def write_block(self, values: Iterable[int], codec: Optional[Codec] = None) -> None:
+        """Encode `values` as one block, after the values buffered by `write`."""
+        values = list(values)
+        if not values:
+            return
+        if self._pending:
+            pending, self._pending = self._pending, []
+            self._write_block(pending, self.codec)
+        self._write_block(values, codec or self.codec)
+
+    def _write_block(self, values: List[int], codec: Codec) -> None:
+        encoded = codec.encode_many(values)
+        self._file.write(encoded)
+        footer = self._footer
+        for field in (codec_id(codec), len(values), len(encoded),
+                      zigzag_encode(min(values)), zigzag_encode(max(values))):
+            UnsignedLEB128._append(field, footer)
+        self._block_count += 1
+
+    def close(self) -> None:
+        """Flush the buffered values and write the footer."""
+        if self._file.closed:
+            return
+        if self._pending:
+            pending, self._pending = self._pending, []
+            self._write_block(pending, self.codec)
+        footer = bytearray(UnsignedLEB128.encode(self._block_count))
+        footer += self._footer
+        footer += zlib.crc32(footer).to_bytes(4, "little")
+        self._file.write(footer)
+        self._file.write(len(footer).to_bytes(8, "little") + MAGIC)
+        self._file.close()
+
+    def __enter__(self) -> "ColumnWriter":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+
+def _decode_block(path: str, codec: Codec, offset: int, size: int, as_array: bool) -> MutableSequence[int]:
+    with open(path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        view = memoryview(mapped)
+        try:
+            return codec.decode_many(view[offset:offset + size], as_array=as_array)
+        finally:
+            view.release()
+
+
+def _select(values: MutableSequence[int], block: BlockInfo,
+            low: Optional[int], high: Optional[int]) -> MutableSequence[int]:
+    """Keep the values of a decoded block that lie in [low, high]."""
+    if (low is None or block.minimum >= low) and (high is None or block.maximum <= high):
+        return values
+    selected = [value for value in values if (low is None or value >= low) and (high is None or value <= high)]
+    return array(values.typecode, selected) if isinstance(values, array) else selected
+
+
+def _array_typecode(blocks: List[BlockInfo], low: Optional[int], high: Optional[int]) -> str:
+    """Return an array typecode holding the values of `blocks` in [low, high]."""
+    typecodes = {block.codec.array_typecode for block in blocks}
+    if len(typecodes) <= 1:
+        return typecodes.pop() if typecodes else "q"
+    # Blocks of signed and unsigned codecs: pick the typecode from their statistics
+    minimum = min(block.minimum if low is None else max(block.minimum, low) for block in blocks)
+    maximum = max(block.maximum if high is None else min(block.maximum, high) for block in blocks)
+    if maximum < 2 ** 63:
+        return "q"
+    if minimum >= 0:
+        return "Q"
+    raise ValueError(f"values from {minimum} to {maximum} do not fit in one array, use as_array=False")
+
+
+class ColumnReader:
+    """
+    Memory-mapped reader over a column file written by ColumnWriter.
+
+    Opening the file reads only its footer. `blocks` describes every block;
+    `read_block` decodes one of them and `scan` decodes only the blocks that may
+    hold values in a range.
+    """
+
+    def __init__(self, path: Union[str, os.PathLike]) -> None:
+        self.path = os.fspath(path)
+        self._file: BinaryIO = open(path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ColumnFileError("empty column file") from None
+        self.blocks = self._read_footer()
+        self._count = sum(block.value_count for block in self.blocks)
+
+    def _read_footer(self) -> List[BlockInfo]:
+        data = self._map
+        size = len(data)
+        if (size < _HEADER_SIZE + _TRAILER_SIZE or data[:len(MAGIC)] != MAGIC
+                or data[size - len(MAGIC):] != MAGIC):
+            raise ColumnFileError("not a PyVarInt column file")
+        if data[len(MAGIC)] != VERSION:
+            raise ColumnFileError(f"unsupported column file version {data[len(MAGIC)]}")
+        footer_size = int.from_bytes(data[size - _TRAILER_SIZE:size - len(MAGIC)], "little")
+        footer_start = size - _TRAILER_SIZE - footer_size
+        if footer_start < _HEADER_SIZE or footer_size < 4:
+            raise ColumnFileError("corrupt column file footer")
+        footer = data[footer_start:size - _TRAILER_SIZE - 4]
+        if zlib.crc32(footer) != int.from_bytes(data[size - _TRAILER_SIZE - 4:size - _TRAILER_SIZE], "little"):
+            raise ColumnFileError("column file footer checksum mismatch")
+
+        blocks: List[BlockInfo] = []
+        try:
+            block_count, position = UnsignedLEB128.decode_from(footer)
+            offset = _HEADER_SIZE
+            first_row = 0
+            for _ in range(block_count):
+                fields = []
+                for _ in range(5):
+                    field, position = UnsignedLEB128.decode_from(footer, position)
+                    fields.append(field)
+                identifier, count, block_size, minimum, maximum = fields
+                blocks.append(BlockInfo(codec_for(identifier), count, offset, block_size,
+                                        zigzag_decode(minimum), zigzag_decode(maximum), first_row))
+                offset += block_size
+                first_row += count
+        except IndexError:
+            raise ColumnFileError("truncated column file footer") from None
+        if offset != footer_start:
+            raise ColumnFileError("column file blocks do not match the footer")
+        return blocks
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def minimum(self) -> Optional[int]:
+        return min((block.minimum for block in self.blocks), default=None)
+
+    @property
+    def maximum(self) -> Optional[int]:
+        return max((block.maximum for block in self.blocks), default=None)
+
+    def read_block(self, index: int, as_array: bool = False) -> MutableSequence[int]:
+        """Decode every value of one block."""
+        block = self.blocks[index]
+        view = memoryview(self._map)
+        try:
+            values = block.codec.decode_many(view[block.offset:block.offset + block.size], as_array=as_array)
+        finally:
+            view.release()
+        if len(values) != block.value_count:
+            raise ColumnFileError(f"block {index} holds {len(values)} values, the footer announces {block.value_count}")
+        return values
+
+    def matching_blocks(self, low: Optional[int] = None, high: Optional[int] = None) -> List[int]:
+        """Return the indices of the blocks that may hold values in [low, high]."""
+        return [index for index, block in enumerate(self.blocks) if block.overlaps(low, high)]
+
+    def read(self, as_array: bool = False, workers: Optional[int] = None,
+             executor: Optional[Executor] = None) -> MutableSequence[int]:
+        """Decode the whole column."""
+        return self.scan(as_array=as_array, workers=workers, executor=executor)
+
+    def scan(self, low: Optional[int] = None, high: Optional[int] = None, as_array: bool = False,
+             workers: Optional[int] = None, executor: Optional[Executor] = None) -> MutableSequence[int]:
+        """
+        Return the values in [low, high] (None meaning unbounded), in column order.
+
+        Blocks whose statistics exclude the range are not read. With `workers` or
+        an `executor`, the remaining blocks are decoded by a process pool.
+        """
+        blocks, decoded = self._decode_blocks(self.matching_blocks(low, high), as_array, workers, executor)
+        result: MutableSequence[int] = array(_array_typecode(blocks, low, high)) if as_array else []
+        for block, values in zip(blocks, decoded):
+            selected = _select(values, block, low, high)
+            if isinstance(selected, array) and isinstance(result, array) and selected.typecode != result.typecode:
+                selected = selected.tolist()
+            result.extend(selected)
+        return result
+
+    def iter_blocks(self, low: Optional[int] = None, high: Optional[int] = None,
+                    as_array: bool = False) -> Iterator[tuple[BlockInfo, MutableSequence[int]]]:
+        """Lazily yield every block that may hold values in [low, high] with its decoded values."""
+        for index in self.matching_blocks(low, high):
+            yield self.blocks[index], self.read_block(index, as_array)
+
+    def _decode_blocks(self, indices: List[int], as_array: bool, workers: Optional[int],
+                       executor: Optional[Executor]) -> tuple[List[BlockInfo], List[MutableSequence[int]]]:
+        blocks = [self.blocks[index] for index in indices]
+        if (workers is None or workers == 1) and executor is None or len(blocks) < 2:
+            return blocks, [self.read_block(index, as_array) for index in indices]
+
+        arguments = ([self.path] * len(blocks), [block.codec for block in blocks],
+                     [block.offset for block in blocks], [block.size for block in blocks],
+                     [as_array] * len(blocks))
+        if executor is not None:
+            decoded = list(executor.map(_decode_block, *arguments))
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                decoded = list(pool.map(_decode_block, *arguments))
+        for index, block, values in zip(indices, blocks, decoded):
+            if len(values) != block.value_count:
+                raise ColumnFileError(f"block {index} holds {len(values)} values, "
+                                      f"the footer announces {block.value_count}")
+        return blocks, decoded
+
+    def close(self) -> None:
+        """Unmap and close the underlying file."""
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self) -> "ColumnReader":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
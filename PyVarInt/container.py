@@ -0,0 +1,195 @@
+"""
+Self-describing containers: encoded values behind a compact header naming their codec.
+
+Layout, every integer being an unsigned LEB128 unless noted otherwise:
+
+    "PVIC" | version | flags | codec id | value count
+    [index stride | offset deltas]    with FLAG_INDEX
+    payload size | payload
+    [CRC-32, 4 bytes little-endian]   with FLAG_CHECKSUM
+
+The codec id comes from `PyVarInt.registry`. The optional index holds the byte
+offset in the payload of every `index_stride`-th value, delta encoded; it allows
+random access and lets `parallel_decode` split any codec. The checksum covers
+every byte in front of it.
+"""
+import zlib
+from typing import TYPE_CHECKING, Iterable, Iterator, MutableSequence, NamedTuple, Optional
+
+from PyVarInt.algorithms import BlockCodec, ReadableBuffer, UnsignedLEB128
+from PyVarInt.delta import DeltaCodec
+from PyVarInt.registry import Codec, codec_for, codec_id
+
+if TYPE_CHECKING:
+    from numpy.typing import NDArray
+
+MAGIC = b"PVIC"
+VERSION = 1
+FLAG_INDEX = 1
+FLAG_CHECKSUM = 2
+
+_INDEX_CODEC = DeltaCodec(UnsignedLEB128)
+
+
+class ContainerError(ValueError):
+    """The data is not a valid container."""
+
+
+class ChecksumError(ContainerError):
+    """The CRC-32 stored in a container does not match its content."""
+
+
+class ContainerHeader(NamedTuple):
+    codec: Codec
+    value_count: int
+    # Byte offset in the payload of every `index_stride`-th value, None without index
+    index_stride: Optional[int]
+    block_index: Optional[MutableSequence[int]]
+    payload_offset: int
+    payload_size: int
+    checksum: bool
+
+    @property
+    def size(self) -> int:
+        """Total size of the container in bytes."""
+        return self.payload_offset + self.payload_size + (4 if self.checksum else 0)
+
+
+def pack(values: Iterable[int], codec: Codec, index_stride: Optional[int] = None, checksum: bool = True) -> bytes:
+    """
+    Encode `values` with `codec` into a container.
+
+    With `index_stride`, the offset of every `index_stride`-th value is stored in
+    the header; block codecs encode the whole sequence at once and have no index.
+    """
+    values = list(values)
+    flags = (FLAG_INDEX if index_stride is not None else 0) | (FLAG_CHECKSUM if checksum else 0)
+    result = bytearray(MAGIC)
+    result.append(VERSION)
+    result.append(flags)
+    UnsignedLEB128._append(codec_id(codec), result)
+    UnsignedLEB128._append(len(values), result)
+
+    if index_stride is None:
+        payload = codec.encode_many(values)
+    else:
+        if index_stride < 1:
+            raise ValueError("index_stride must be positive")
+        if issubclass(codec, BlockCodec):
+            raise ValueError(f"{codec.__name__} encodes whole sequences and cannot be indexed")
+        chunks = [codec.encode_many(values[start:start + index_stride])
+                  for start in range(0, len(values), index_stride)]
+        offsets = []
+        offset = 0
+        for chunk in chunks:
+            offsets.append(offset)
+            offset += len(chunk)
+        UnsignedLEB128._append(index_stride, result)
+        result += _INDEX_CODEC.encode_many(offsets)
+        payload = b"".join(chunks)
+
+    UnsignedLEB128._append(len(payload), result)
+    result += payload
+    if checksum:
+        result += zlib.crc32(result).to_bytes(4, "little")
+    return bytes(result)
+
+
+def read_header(data: ReadableBuffer, offset: int = 0, verify: bool = True) -> ContainerHeader:
+    """
+    Parse the header of the container starting at `offset` of `data`, without decoding its values.
+
+    With `verify`, the checksum of the whole container is checked too.
+    """
+    view = memoryview(data)
+    if bytes(view[offset:offset + 4]) != MAGIC:
+        raise ContainerError("not a PyVarInt container")
+    if offset + 6 > len(view):
+        raise ContainerError("truncated container header")
+    if view[offset + 4] != VERSION:
+        raise ContainerError(f"unsupported container version {view[offset + 4]}")
+    flags = view[offset + 5]
+    try:
+        identifier, position = UnsignedLEB128.decode_from(view, offset + 6)
+        codec = codec_for(identifier)
+        count, position = UnsignedLEB128.decode_from(view, position)
+        index_stride: Optional[int] = None
+        block_index: Optional[MutableSequence[int]] = None
+        if flags & FLAG_INDEX:
+            index_stride, position = UnsignedLEB128.decode_from(view, position)
+            if not index_stride:
+                raise ContainerError("index stride must be positive")
+            entries = -(-count // index_stride)
+            position_after = UnsignedLEB128.skip(view, entries, position)
+            block_index = _INDEX_CODEC.decode_many(view[position:position_after], count=entries, as_array=True)
+            position = position_after
+        payload_size, position = UnsignedLEB128.decode_from(view, position)
+    except IndexError:
+        raise ContainerError("truncated container header") from None
+
+    header = ContainerHeader(codec, count, index_stride, block_index, position - offset, payload_size,
+                             bool(flags & FLAG_CHECKSUM))
+    end = offset + header.size
+    if end > len(view):
+        raise ContainerError("truncated container")
+    if verify and header.checksum:
+        stored = int.from_bytes(view[end - 4:end], "little")
+        if zlib.crc32(view[offset:end - 4]) != stored:
+            raise ChecksumError("container checksum mismatch")
+    return header
+
+
+def payload(data: ReadableBuffer, header: Optional[ContainerHeader] = None, offset: int = 0) -> memoryview:
+    """Return the encoded values of a container as a memoryview on `data`."""
+    if header is None:
+        header = read_header(data, offset)
+    start = offset + header.payload_offset
+    return memoryview(data)[start:start + header.payload_size]
+
+
+def unpack(data: ReadableBuffer, as_array: bool = False, workers: Optional[int] = None) -> MutableSequence[int]:
+    """
+    Decode the values of a container with the codec named in its header.
+
+    The output is sized from the value count of the header and decoding stops
+    after that many values. With `workers`, an indexed container is decoded by
+    `PyVarInt.parallel.parallel_decode`.
+    """
+    header = read_header(data)
+    codec = header.codec
+    encoded = payload(data, header)
+    if issubclass(codec, BlockCodec):
+        values = codec.decode_many(encoded, as_array=as_array)
+    elif workers is not None:
+        from PyVarInt.parallel import parallel_decode
+        values = parallel_decode(encoded, codec, workers=workers, index=header.block_index, as_array=as_array)
+    else:
+        try:
+            return codec.decode_many(encoded, count=header.value_count, as_array=as_array)
+        except IndexError:
+            raise ContainerError(f"container holds fewer values than the {header.value_count} "
+                                 "its header announces") from None
+    if len(values) != header.value_count:
+        raise ContainerError(f"container holds {len(values)} values, its header announces {header.value_count}")
+    return values
+
+
+def unpack_array(data: ReadableBuffer) -> "NDArray":
+    """Decode the values of a container into a NumPy array, see `PyVarInt.vectorized.decode_array`."""
+    from PyVarInt.vectorized import decode_array
+
+    header = read_header(data)
+    values = decode_array(header.codec, payload(data, header))
+    if values.size != header.value_count:
+        raise ContainerError(f"container holds {values.size} values, its header announces {header.value_count}")
+    return values
+
+
+def iter_containers(data: ReadableBuffer) -> Iterator[memoryview]:
+    """Yield every container of a buffer holding several of them back to back, e.g. one per column."""
+    view = memoryview(data)
+    offset = 0
+    while offset < len(view):
+        size = read_header(view, offset, verify=False).size
+        yield view[offset:offset + size]
+        offset += size
@@ -0,0 +1,117 @@
+"""Delta encoding of sorted integer sequences on top of the codecs in `PyVarInt.algorithms`."""
+from array import array
+from mmap import mmap
+from typing import BinaryIO, Iterable, Iterator, MutableSequence, Optional, Type, Union
+
+from PyVarInt.algorithms import Base, BlockCodec, ReadableBuffer, UnsignedLEB128
+
+
+class DeltaCodec:
+    """
+    Stores the first differences of a sequence with another codec.
+
+    Sorted sequences such as timestamps, document ids or offsets turn into small
+    gaps that take one or two bytes each instead of the full width of every value.
+    Use a signed codec (e.g. ZigZagUnsignedLEB128) for sequences that may decrease.
+    Block codecs such as FrameOfReference or Simple8b can store the differences
+    too: they are then encoded and decoded as one sequence.
+
+    With `block_size` set, the first value of every block of `block_size` values
+    is stored as is instead of as a difference, so each block can be decoded on
+    its own.
+    """
+
+    def __init__(self,
+                 codec: Union[Type[Base], Type[BlockCodec]] = UnsignedLEB128,
+                 block_size: Optional[int] = None) -> None:
+        if block_size is not None and block_size < 1:
+            raise ValueError("block_size must be positive")
+        self.codec = codec
+        self.block_size = block_size
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.codec.__name__}, block_size={self.block_size})"
+
+    def deltas(self, values: Iterable[int]) -> Iterator[int]:
+        """Yield the differences stored for `values`."""
+        block_size = self.block_size
+        min_value = self.codec.min_value
+        previous = 0
+        for index, value in enumerate(values):
+            if block_size is not None and index % block_size == 0:
+                previous = 0
+            delta = value - previous
+            if min_value is not None and delta < min_value:
+                raise ValueError(f"{value} follows {previous}: {self.codec.__name__} cannot store "
+                                 "a negative difference, use a signed codec")
+            yield delta
+            previous = value
+
+    def encode_many(self, values: Iterable[int]) -> bytes:
+        """Encode a sequence of integers as differences."""
+        return self.codec.encode_many(self.deltas(values))
+
+    def _running_sum(self, deltas: Iterable[int]) -> Iterator[int]:
+        """Rebuild values from their differences."""
+        block_size = self.block_size or 0
+        value = 0
+        for index, delta in enumerate(deltas):
+            if block_size and index % block_size == 0:
+                value = 0
+            value += delta
+            yield value
+
+    def _iter_deltas(self, buffer: BinaryIO | ReadableBuffer, count: Optional[int]) -> Iterator[int]:
+        if issubclass(self.codec, BlockCodec):
+            deltas = self.codec.decode_many(buffer)
+            if count is not None:
+                if count > len(deltas):
+                    raise IndexError(f"{count} values requested, {len(deltas)} encoded")
+                deltas = deltas[:count]
+            yield from deltas
+            return
+
+        if not isinstance(buffer, (bytes, bytearray, memoryview, mmap)):
+            if count is not None:
+                decode = self.codec.decode
+                for _ in range(count):
+                    yield decode(buffer)
+                return
+            buffer = buffer.read()
+
+        decode_from = self.codec.decode_from
+        offset = 0
+        if count is None:
+            end = len(buffer)
+            while offset < end:
+                delta, offset = decode_from(buffer, offset)
+                yield delta
+        else:
+            for _ in range(count):
+                delta, offset = decode_from(buffer, offset)
+                yield delta
+
+    def decode_many(self,
+                    buffer: BinaryIO | ReadableBuffer,
+                    count: Optional[int] = None,
+                    as_array: bool = False) -> MutableSequence[int]:
+        """
+        Decode `count` integers, or every integer in the buffer when `count` is None.
+
+        The running sum is built while decoding, without an intermediate list of differences.
+        """
+        # Sums outgrow the width of the differences, e.g. the 32-bit blocks of GroupVarint
+        typecode = "Q" if self.codec.min_value == 0 else "q"
+        result: MutableSequence[int] = array(typecode) if as_array else []
+        result.extend(self._running_sum(self._iter_deltas(buffer, count)))
+        return result
+
+    def iter_decode(self, fileobj: BinaryIO, chunk_size: int = 65536) -> Iterator[int]:
+        """
+        Lazily decode every integer in a file-like object, see `Base.iter_decode`.
+
+        Block codecs read the whole stream at once.
+        """
+        if issubclass(self.codec, BlockCodec):
+            return self._running_sum(self.codec.decode_many(fileobj))
+        return self._running_sum(self.codec.iter_decode(fileobj, chunk_size))
@@ -0,0 +1,185 @@
+"""Varint length-prefixed message framing, as used by protobuf's delimited streams."""
+import os
+import socket
+from typing import Any, BinaryIO, Iterable, Iterator, List, Tuple, Type, Union
+
+from PyVarInt.algorithms import Base, ReadableBuffer, UnsignedLEB128
+
+# Largest number of buffers accepted by a single sendmsg call
+try:
+    _IOV_MAX = os.sysconf("SC_IOV_MAX")
+except (AttributeError, ValueError, OSError):  # pragma: no cover - depends on the platform
+    _IOV_MAX = 1024
+if _IOV_MAX <= 0:  # pragma: no cover - depends on the platform
+    _IOV_MAX = 1024
+
+
+class FrameTooLargeError(ValueError):
+    """A frame length prefix exceeds the `max_frame_size` of the Framer."""
+
+
+class Framer:
+    """
+    Writes and reads frames made of a varint length prefix followed by the payload:
+
+    [length] [payload] [length] [payload] ...
+
+    Every length is checked against `max_frame_size` as soon as the prefix is
+    decoded, so a corrupt or hostile prefix is rejected before the payload is
+    read or any buffer is allocated for it.
+    """
+
+    def __init__(self, codec: Type[Base] = UnsignedLEB128, max_frame_size: int = 64 * 1024 * 1024) -> None:
+        if codec.min_value is None or codec.min_value < 0:
+            raise ValueError(f"{codec.__name__} is signed, frame lengths need an unsigned codec")
+        if max_frame_size < 0:
+            raise ValueError("max_frame_size must not be negative")
+        self.codec = codec
+        self.max_frame_size = max_frame_size
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.codec.__name__}, max_frame_size={self.max_frame_size})"
+
+    def _check_size(self, size: int) -> None:
+        if size > self.max_frame_size:
+            raise FrameTooLargeError(f"frame of {size} bytes exceeds max_frame_size={self.max_frame_size}")
+
+    def frame_parts(self, payloads: Iterable[Any]) -> List[memoryview]:
+        """
+        Return the headers and payloads of `payloads` interleaved, ready for a gather write.
+
+        All headers are encoded into one buffer; the returned parts are views on it
+        and on the payloads, nothing is copied.
+        """
+        views = [memoryview(payload).cast("B") for payload in payloads]
+        headers = bytearray()
+        ends: List[int] = []
+        append = self.codec._append
+        for view in views:
+            self._check_size(view.nbytes)
+            append(view.nbytes, headers)
+            ends.append(len(headers))
+
+        header_view = memoryview(headers)
+        parts: List[memoryview] = []
+        start = 0
+        for view, end in zip(views, ends):
+            parts.append(header_view[start:end])
+            parts.append(view)
+            start = end
+        return parts
+
+    def write_frames(self, stream: Union[socket.socket, BinaryIO, Any], payloads: Iterable[Any]) -> int:
+        """
+        Write every payload as a frame and return the number of bytes written.
+
+        Sockets get a gather write with sendmsg, other streams get the parts through
+        `writelines` (e.g. files or asyncio.StreamWriter, which must be drained by
+        the caller). Oversized payloads raise FrameTooLargeError before anything is written.
+        """
+        parts = self.frame_parts(payloads)
+        total = sum(part.nbytes for part in parts)
+        if isinstance(stream, socket.socket):
+            _send_parts(stream, parts)
+        elif hasattr(stream, "writelines"):
+            stream.writelines(parts)
+        else:
+            stream.write(b"".join(parts))
+        return total
+
+    def iter_frames(self, buffer: ReadableBuffer) -> Iterator[memoryview]:
+        """
+        Yield the payload of every frame in `buffer` as a memoryview on it, without copying.
+
+        Raises IndexError if the last frame is truncated.
+        """
+        view = memoryview(buffer)
+        offset = 0
+        end = len(view)
+        while offset < end:
+            payload, offset = self._payload_at(view, offset)
+            yield payload
+
+    def split_frames(self, buffer: ReadableBuffer) -> Tuple[List[memoryview], int]:
+        """
+        Return the payloads of the complete frames at the start of `buffer` and the
+        offset of the first byte after them.
+
+        Intended for receive buffers: the bytes past the returned offset belong to
+        a frame that has not been fully received yet.
+        """
+        view = memoryview(buffer)
+        frames: List[memoryview] = []
+        offset = 0
+        end = len(view)
+        while offset < end:
+            try:
+                payload, next_offset = self._payload_at(view, offset)
+            except IndexError:
+                break
+            frames.append(payload)
+            offset = next_offset
+        return frames, offset
+
+    def _payload_at(self, view: memoryview, offset: int) -> Tuple[memoryview, int]:
+        size, start = self.codec.decode_from(view, offset)
+        self._check_size(size)
+        end = start + size
+        if end > len(view):
+            raise IndexError("truncated frame")
+        return view[start:end], end
+
+    def read_frame(self, stream: BinaryIO) -> bytes:
+        """
+        Read one frame from a file-like object (e.g. `socket.makefile("rb")`) and return its payload.
+
+        Raises EOFError if the stream ends inside the frame.
+        """
+        size = self._read_length(stream)
+        self._check_size(size)
+        payload = stream.read(size)
+        if len(payload) != size:
+            raise EOFError("stream ends with a truncated frame")
+        return payload
+
+    def _read_length(self, stream: BinaryIO) -> int:
+        codec = self.codec
+        header = stream.read(1)
+        if not header:
+            raise EOFError("no frame left in the stream")
+        if codec.has_length_prefix:
+            length = codec.peek_length(header[0])
+            header += stream.read(length - 1)
+            if len(header) != length:
+                raise EOFError("stream ends with a truncated frame length")
+            return codec.decode_from(header)[0]
+
+        # A prefix longer than the one of max_frame_size is rejected without reading the rest of it
+        max_length = codec.encoded_length(self.max_frame_size)
+        while True:
+            try:
+                return codec.decode_from(header)[0]
+            except IndexError:
+                if len(header) >= max_length:
+                    raise FrameTooLargeError(f"frame length prefix exceeds the {max_length} bytes "
+                                             f"of max_frame_size={self.max_frame_size}") from None
+                byte = stream.read(1)
+                if not byte:
+                    raise EOFError("stream ends with a truncated frame length") from None
+                header += byte
+
+
+def _send_parts(sock: socket.socket, parts: List[memoryview]) -> None:
+    """Send every part with as few sendmsg calls as possible, resuming after partial sends."""
+    if not hasattr(sock, "sendmsg"):  # pragma: no cover - Windows
+        sock.sendall(b"".join(parts))
+        return
+
+    index = 0
+    while index < len(parts):
+        sent = sock.sendmsg(parts[index:index + _IOV_MAX])
+        while index < len(parts) and sent >= parts[index].nbytes:
+            sent -= parts[index].nbytes
+            index += 1
+        if sent:
+            parts[index] = parts[index][sent:]
@@ -0,0 +1,143 @@
+"""Push-style decoding of integers arriving in arbitrary fragments, e.g. from a socket."""
+import re
+from typing import List, Optional, Type
+
+from PyVarInt.algorithms import Base, BlockCodec, ReadableBuffer
+from PyVarInt.parallel import _terminated_by_high_bit
+
+
+class IncrementalDecoder:
+    """
+    Decodes a stream of integers fed in fragments of any size.
+
+    `feed` returns every integer completed by the new bytes. The bytes of an
+    integer split across fragments are kept until it is complete; they are
+    only looked at once, so feeding a stream byte by byte stays linear.
+    `pending_bytes` is the size of that partial integer, for backpressure.
+
+    An integer longer than `max_length` bytes raises ValueError, whether it
+    arrives whole or in pieces. It defaults to the longest encoding of the
+    codec, or of a 64-bit integer for codecs without bounds such as UnsignedLEB128.
+    """
+
+    def __init__(self, codec: Type[Base], max_length: Optional[int] = None) -> None:
+        if issubclass(codec, BlockCodec):
+            raise ValueError(f"{codec.__name__} encodes whole sequences and cannot be decoded incrementally")
+        if max_length is not None and max_length < 1:
+            raise ValueError("max_length must be positive")
+        self.codec = codec
+        self.max_length = codec._max_encoded_length() if max_length is None else max_length
+        self._terminated = _terminated_by_high_bit(codec)
+        # max_length continuation bytes in a row start an integer longer than max_length
+        self._overlong = re.compile(b"[\x80-\xff]{%d}" % self.max_length)
+        self._pending = bytearray()
+        # Total size of the partial integer, 0 while it is unknown
+        self._expected = 0
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.codec.__name__})"
+
+    @property
+    def pending_bytes(self) -> int:
+        """Number of bytes of a partial integer waiting for the rest of it."""
+        return len(self._pending)
+
+    def reset(self) -> None:
+        """Drop the partial integer, e.g. after the connection was reset."""
+        self._pending.clear()
+        self._expected = 0
+
+    def feed(self, data: ReadableBuffer, final: bool = False) -> List[int]:
+        """
+        Decode the integers completed by `data`.
+
+        With `final`, `data` is the end of the stream and EOFError is raised if
+        it ends in the middle of an integer.
+        """
+        view = memoryview(data).cast("B")
+        values: List[int] = []
+        position = 0
+        if self._pending:
+            position = self._complete(view)
+            if self._expected and len(self._pending) == self._expected:
+                values.append(self.codec.decode_from(bytes(self._pending))[0])
+                self.reset()
+        if not self._pending:
+            position = self._decode_complete(view, position, values)
+            if position < len(view):
+                self._start(view, position)
+        if final and self._pending:
+            raise EOFError("stream ends with a truncated varint")
+        return values
+
+    def _decode_complete(self, view: memoryview, position: int, values: List[int]) -> int:
+        """Decode the integers of `view` that are complete and return the offset of the first one that is not."""
+        codec = self.codec
+        end = len(view)
+        if self._terminated:
+            # Only the bytes after the last terminator are scanned twice
+            boundary = end
+            while boundary > position and view[boundary - 1] & 0x80:
+                boundary -= 1
+            if self._overlong.search(view, position, boundary):
+                self._too_long()
+            if boundary > position:
+                values.extend(codec.decode_many(view[position:boundary]))
+            return boundary
+
+        decode_from = codec.decode_from
+        if codec.has_length_prefix:
+            peek_length = codec.peek_length
+            while position < end:
+                length = peek_length(view[position])
+                if length > self.max_length:
+                    self._too_long()
+                if position + length > end:
+                    break
+                value, position = decode_from(view, position)
+                values.append(value)
+            return position
+
+        while position < end:
+            try:
+                value, next_position = decode_from(view, position)
+            except IndexError:
+                break
+            if next_position - position > self.max_length:
+                self._too_long()
+            values.append(value)
+            position = next_position
+        return position
+
+    def _start(self, view: memoryview, position: int) -> None:
+        """Keep the partial integer at the end of `view`, starting at `position`."""
+        if self.codec.has_length_prefix:
+            self._expected = self.codec.peek_length(view[position])
+        elif len(view) - position >= self.max_length:
+            self._too_long()
+        self._pending += view[position:]
+
+    def _complete(self, view: memoryview) -> int:
+        """Append the bytes of `view` that belong to the partial integer and return the offset after them."""
+        pending = self._pending
+        end = len(view)
+        if self._expected:
+            stop = min(end, self._expected - len(pending))
+            pending += view[:stop]
+            return stop
+
+        position = 0
+        while position < end:
+            byte = view[position]
+            position += 1
+            pending.append(byte)
+            if self.codec._is_last_byte(byte, len(pending)):
+                self._expected = len(pending)
+                break
+            if len(pending) >= self.max_length:
+                self._too_long()
+        return position
+
+    def _too_long(self) -> None:
+        self.reset()
+        raise ValueError(f"{self.codec.__name__} integer longer than max_length={self.max_length} bytes")
@@ -0,0 +1,343 @@
+"""Opt-in counters for the codecs.
+
+`enable()` replaces the public methods of the codec classes with wrappers that
+record, per codec and per API ("scalar", "batch", "stream"), the number of
+calls and values, the bytes read and written, the cumulative time and a
+histogram of encoded lengths. `disable()` puts the original methods back, so
+instrumentation costs nothing while it is off.
+
+Calls made by an instrumented method (e.g. `decode_many` calling `decode_from`,
+or a ZigZag codec calling its unsigned codec) are only counted once, under the
+outer call. Scalar calls record the bytes they actually read or wrote. Per-value
+lengths of batch and stream calls are computed with `encoded_length`, which makes
+instrumented batch calls noticeably slower; these figures are estimates that
+count a padded, non-canonical encoding at its canonical size.
+"""
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from time import perf_counter_ns
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+from PyVarInt import algorithms
+from PyVarInt.algorithms import Base, BlockCodec, ZigZag
+
+Codec = Union[type[Base], type[BlockCodec]]
+
+SCALAR = "scalar"
+BATCH = "batch"
+STREAM = "stream"
+
+# Method name -> API
+_METHODS = {
+    "encode": SCALAR,
+    "encode_into": SCALAR,
+    "decode": SCALAR,
+    "decode_from": SCALAR,
+    "encode_many": BATCH,
+    "decode_many": BATCH,
+    "iter_decode": STREAM,
+    "decode_async": STREAM,
+    "write_many_async": STREAM,
+}
+
+# True while an instrumented call is running, so that nested codec calls are not counted twice
+_busy: ContextVar[bool] = ContextVar("_busy", default=False)
+_lock = threading.Lock()
+
+
+class _Stats:
+    __slots__ = ("calls", "values", "bytes_in", "bytes_out", "time_ns", "lengths")
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.values = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.time_ns = 0
+        self.lengths: Dict[int, int] = {}
+
+    def add_lengths(self, lengths: Iterable[int]) -> int:
+        histogram = self.lengths
+        total = 0
+        for length in lengths:
+            histogram[length] = histogram.get(length, 0) + 1
+            total += length
+        return total
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {"calls": self.calls,
+                "values": self.values,
+                "bytes_in": self.bytes_in,
+                "bytes_out": self.bytes_out,
+                "time_ns": self.time_ns,
+                "lengths": dict(sorted(self.lengths.items()))}
+
+
+_stats: Dict[Tuple[str, str], _Stats] = {}
+# Codec -> {method name: the entry of the class __dict__ it replaced, None if inherited}
+_patched: Dict[Codec, Dict[str, Any]] = {}
+
+
+def _stats_for(codec: Codec, api: str) -> _Stats:
+    key = (codec.__name__, api)
+    stats = _stats.get(key)
+    if stats is None:
+        stats = _stats.setdefault(key, _Stats())
+    return stats
+
+
+def _buffer_size(buffer: Any) -> int:
+    try:
+        return memoryview(buffer).nbytes
+    except TypeError:
+        return 0
+
+
+def _tell(buffer: Any) -> Optional[int]:
+    try:
+        return buffer.tell()
+    except (AttributeError, OSError):
+        return None
+
+
+def _scalar_wrapper(codec: Codec, name: str, original: Callable) -> Callable:
+    stats = _stats_for(codec, SCALAR)
+    encoded_length = codec.encoded_length  # type: ignore[union-attr]
+    skip = codec.skip  # type: ignore[union-attr]
+
+    def _offset(args: Tuple[Any, ...], kwargs: Dict[str, Any], position: int) -> int:
+        return args[position] if len(args) > position else kwargs.get("offset", 0)
+
+    @wraps(original)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        if _busy.get():
+            return original(*args, **kwargs)
+        token = _busy.set(True)
+        try:
+            buffer: Any = (args[0] if args else kwargs["buffer"]) if name == "decode" else None
+            position = _tell(buffer)
+            start = perf_counter_ns()
+            result = original(*args, **kwargs)
+            elapsed = perf_counter_ns() - start
+            # The bytes actually read or written, which differ from encoded_length for padded encodings
+            if name == "encode":
+                size = len(result)
+            elif name == "encode_into":
+                size = result - _offset(args, kwargs, 2)
+            elif name == "decode_from":
+                size = result[1] - _offset(args, kwargs, 1)
+            elif position is not None:
+                size = buffer.tell() - position
+            elif isinstance(buffer, (bytes, bytearray, memoryview)):
+                size = skip(buffer, 1)
+            else:
+                # A stream that cannot tell its position
+                size = encoded_length(result)
+        finally:
+            _busy.reset(token)
+        with _lock:
+            stats.calls += 1
+            stats.values += 1
+            stats.time_ns += elapsed
+            if name.startswith("encode"):
+                stats.bytes_out += stats.add_lengths((size,))
+            else:
+                stats.bytes_in += stats.add_lengths((size,))
+        return result
+
+    return wrapper
+
+
+def _batch_wrapper(codec: Codec, name: str, original: Callable) -> Callable:
+    stats = _stats_for(codec, BATCH)
+    encoded_length = getattr(codec, "encoded_length", None)
+
+    @wraps(original)
+    def wrapper(values_or_buffer: Any, *args: Any, **kwargs: Any) -> Any:
+        if _busy.get():
+            return original(values_or_buffer, *args, **kwargs)
+        if name == "encode_many" and not hasattr(values_or_buffer, "__len__"):
+            values_or_buffer = list(values_or_buffer)
+        token = _busy.set(True)
+        start = perf_counter_ns()
+        try:
+            result = original(values_or_buffer, *args, **kwargs)
+        finally:
+            elapsed = perf_counter_ns() - start
+            _busy.reset(token)
+        values = values_or_buffer if name == "encode_many" else result
+        with _lock:
+            stats.calls += 1
+            stats.values += len(values)
+            stats.time_ns += elapsed
+            if encoded_length is not None:
+                size = stats.add_lengths(map(encoded_length, values))
+            elif name == "encode_many":
+                size = len(result)
+            else:
+                size = _buffer_size(values_or_buffer)
+            if name == "encode_many":
+                stats.bytes_out += size
+            else:
+                stats.bytes_in += size
+        return result
+
+    return wrapper
+
+
+def _iter_decode_wrapper(codec: type[Base], original: Callable) -> Callable:
+    stats = _stats_for(codec, STREAM)
+    encoded_length = codec.encoded_length
+
+    @wraps(original)
+    def wrapper(*args: Any, **kwargs: Any) -> Iterator[int]:
+        if _busy.get():
+            return original(*args, **kwargs)
+        return _instrumented_iter(original(*args, **kwargs))
+
+    def _instrumented_iter(values: Iterator[int]) -> Iterator[int]:
+        with _lock:
+            stats.calls += 1
+        while True:
+            token = _busy.set(True)
+            start = perf_counter_ns()
+            try:
+                value = next(values)
+            except StopIteration:
+                return
+            finally:
+                elapsed = perf_counter_ns() - start
+                _busy.reset(token)
+            with _lock:
+                stats.time_ns += elapsed
+                stats.values += 1
+                stats.bytes_in += stats.add_lengths((encoded_length(value),))
+            yield value
+
+    return wrapper
+
+
+def _async_wrapper(codec: type[Base], name: str, original: Callable) -> Callable:
+    stats = _stats_for(codec, STREAM)
+    encoded_length = codec.encoded_length
+
+    @wraps(original)
+    async def wrapper(stream: Any, *args: Any, **kwargs: Any) -> Any:
+        if _busy.get():
+            return await original(stream, *args, **kwargs)
+        values: List[int] = []
+        if name == "write_many_async":
+            values = list(args[0]) if args else list(kwargs.pop("values"))
+            args = (values,) + args[1:]
+        token = _busy.set(True)
+        start = perf_counter_ns()
+        try:
+            result = await original(stream, *args, **kwargs)
+        finally:
+            elapsed = perf_counter_ns() - start
+            _busy.reset(token)
+        with _lock:
+            stats.calls += 1
+            stats.time_ns += elapsed
+            if name == "write_many_async":
+                stats.values += len(values)
+                stats.bytes_out += stats.add_lengths(map(encoded_length, values))
+            else:
+                stats.values += 1
+                stats.bytes_in += stats.add_lengths((encoded_length(result),))
+        return result
+
+    return wrapper
+
+
+def _wrap(codec: Codec, name: str, original: Callable) -> Callable:
+    api = _METHODS[name]
+    if api == SCALAR:
+        return _scalar_wrapper(codec, name, original)
+    if api == BATCH:
+        return _batch_wrapper(codec, name, original)
+    if name == "iter_decode":
+        return _iter_decode_wrapper(codec, original)  # type: ignore[arg-type]
+    return _async_wrapper(codec, name, original)  # type: ignore[arg-type]
+
+
+def default_codecs() -> List[Codec]:
+    """Return every concrete codec class of `PyVarInt.algorithms`."""
+    return [value for value in vars(algorithms).values()
+            if isinstance(value, type) and issubclass(value, (Base, BlockCodec))
+            and value not in (Base, ZigZag, BlockCodec)]
+
+
+def enable(codecs: Optional[Iterable[Codec]] = None) -> None:
+    """
+    Start recording the calls made to `codecs` (default: every codec).
+
+    Counters keep accumulating across enable/disable cycles until `reset` is called.
+    """
+    for codec in default_codecs() if codecs is None else codecs:
+        if codec in _patched:
+            continue
+        replaced: Dict[str, Any] = {}
+        for name in _METHODS:
+            original = getattr(codec, name, None)
+            if original is None:
+                continue
+            replaced[name] = codec.__dict__.get(name)
+            setattr(codec, name, staticmethod(_wrap(codec, name, original)))
+        _patched[codec] = replaced
+
+
+def disable() -> None:
+    """Restore the original methods of every instrumented codec."""
+    for codec in list(_patched):
+        _restore(codec)
+
+
+def _restore(codec: Codec) -> None:
+    for name, entry in _patched.pop(codec).items():
+        if entry is None:
+            delattr(codec, name)
+        else:
+            setattr(codec, name, entry)
+
+
+def is_enabled(codec: Optional[Codec] = None) -> bool:
+    """Return True if `codec`, or any codec when None, is instrumented."""
+    return codec in _patched if codec is not None else bool(_patched)
+
+
+def snapshot() -> Dict[str, Dict[str, Dict[str, Any]]]:
+    """
+    Return the counters recorded so far as plain dicts:
+
+    {codec name: {api: {"calls", "values", "bytes_in", "bytes_out", "time_ns",
+                        "lengths": {encoded length: count}}}}
+    """
+    result: Dict[str, Dict[str, Dict[str, Any]]] = {}
+    with _lock:
+        for (codec_name, api), stats in sorted(_stats.items()):
+            if stats.calls:
+                result.setdefault(codec_name, {})[api] = stats.as_dict()
+    return result
+
+
+def reset() -> None:
+    """Zero every counter."""
+    with _lock:
+        for stats in _stats.values():
+            stats.__init__()  # type: ignore[misc]
+
+
+@contextmanager
+def instrumented(codecs: Optional[Iterable[Codec]] = None) -> Iterator[None]:
+    """Enable instrumentation for the duration of a with block."""
+    was_enabled = set(_patched)
+    enable(codecs)
+    try:
+        yield
+    finally:
+        for codec in list(_patched):
+            if codec not in was_enabled:
+                _restore(codec)
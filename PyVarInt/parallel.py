@@ -0,0 +1,313 @@
+"""Encode and decode very large sequences on several cores.
+
+The input is copied once into `multiprocessing.shared_memory` and every worker
+process encodes or decodes its own slice of it; the parent only concatenates
+the results. Decoding needs chunk boundaries that fall between two integers:
+
+- codecs of the LEB128/VLQ family (and their ZigZag variants) end every integer
+  with a byte whose high bit is clear, so any position can be moved forward to
+  the next boundary;
+- for the other codecs the boundaries must come from an index of byte offsets,
+  e.g. the one returned by `parallel_encode_with_index`; without it the buffer
+  is decoded serially.
+
+`threaded_decode` splits the buffer the same way but decodes it on threads of
+the current process, which run in parallel on free-threaded CPython builds.
+"""
+import os
+import sys
+from array import array
+from bisect import bisect_left
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Callable, Iterable, List, MutableSequence, Optional, Sequence, Tuple, Type
+
+from PyVarInt.algorithms import (Base,
+                                 ReadableBuffer,
+                                 UnsignedLEB128,
+                                 SignedLEB128,
+                                 VariableLengthQuantity,
+                                 ZigZag)
+
+# Smallest chunk handed to a worker, smaller inputs are not worth the process round trip
+_MIN_CHUNK_VALUES = 1 << 16
+_MIN_CHUNK_BYTES = 1 << 18
+# Chunks per worker, so that a slow chunk does not leave the other workers idle
+_CHUNKS_PER_WORKER = 4
+
+
+def _attach(name: str) -> SharedMemory:
+    if sys.version_info >= (3, 13):
+        return SharedMemory(name=name, track=False)
+    return SharedMemory(name=name)
+
+
+def _buffer(shared: SharedMemory) -> memoryview:
+    buf = shared.buf
+    if buf is None:  # pragma: no cover - only after close()
+        raise ValueError(f"shared memory {shared.name} is closed")
+    return buf
+
+
+def _as_int64(view: memoryview, typecode: str) -> memoryview:
+    """Cast a byte view to 8-byte integers of the signedness of `typecode`."""
+    return view.cast("Q") if typecode.isupper() else view.cast("q")
+
+
+def _encode_chunk(codec: Type[Base], name: str, typecode: str, start: int, end: int) -> bytes:
+    shared = _attach(name)
+    try:
+        values = _as_int64(_buffer(shared)[start * 8:end * 8], typecode)
+        try:
+            return codec.encode_many(values)
+        finally:
+            values.release()
+    finally:
+        shared.close()
+
+
+def _decode_chunk(codec: Type[Base], name: str, start: int, end: int, as_array: bool) -> MutableSequence[int]:
+    shared = _attach(name)
+    try:
+        chunk = _buffer(shared)[start:end]
+        try:
+            return codec.decode_many(chunk, as_array=as_array)
+        finally:
+            chunk.release()
+    finally:
+        shared.close()
+
+
+def _worker_count(workers: Optional[int]) -> int:
+    workers = workers or os.cpu_count() or 1
+    if workers < 1:
+        raise ValueError("workers must be positive")
+    return workers
+
+
+def _to_shared(data: memoryview) -> SharedMemory:
+    # Zero-size shared memory segments are not allowed
+    shared = SharedMemory(create=True, size=max(data.nbytes, 1))
+    _buffer(shared)[:data.nbytes] = data
+    return shared
+
+
+def _as_typed_view(values: Iterable[int], typecode: str) -> memoryview:
+    """Return `values` as a flat byte view of 8-byte integers of the signedness of `typecode`."""
+    try:
+        view = memoryview(values)  # type: ignore[arg-type]
+    except TypeError:
+        pass
+    else:
+        if (view.itemsize == 8 and view.format in ("q", "l", "Q", "L")
+                and view.format.isupper() == typecode.isupper() and view.c_contiguous):
+            return view.cast("B")
+    return memoryview(array(typecode, values)).cast("B")
+
+
+def _run(executor: Optional[Executor], workers: int, function: Callable[..., Any], *arguments: Sequence) -> list:
+    if executor is not None:
+        return list(executor.map(function, *arguments))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(function, *arguments))
+
+
+def _encode_chunks(values: Iterable[int],
+                   codec: Type[Base],
+                   workers: Optional[int],
+                   chunk_size: Optional[int],
+                   executor: Optional[Executor]) -> List[bytes]:
+    workers = _worker_count(workers)
+    typecode = codec.array_typecode
+    if not hasattr(values, "__len__"):
+        values = list(values)
+    try:
+        data = _as_typed_view(values, typecode)
+    except OverflowError:
+        # Values wider than 64 bits (SignedLEB128) cannot be shared as a flat array
+        return [codec.encode_many(values)]
+    count = data.nbytes // 8
+    if chunk_size is None:
+        chunk_size = max(_MIN_CHUNK_VALUES, -(-count // (workers * _CHUNKS_PER_WORKER)))
+    if count <= chunk_size or workers == 1 and executor is None:
+        return [codec.encode_many(_as_int64(data, typecode))]
+
+    starts = list(range(0, count, chunk_size))
+    ends = starts[1:] + [count]
+    shared = _to_shared(data)
+    try:
+        return _run(executor, workers, _encode_chunk, [codec] * len(starts), [shared.name] * len(starts),
+                    [typecode] * len(starts), starts, ends)
+    finally:
+        shared.close()
+        shared.unlink()
+
+
+def parallel_encode(values: Iterable[int],
+                    codec: Type[Base],
+                    workers: Optional[int] = None,
+                    chunk_size: Optional[int] = None,
+                    executor: Optional[Executor] = None) -> bytes:
+    """
+    Encode `values` with `codec` on `workers` processes (default: one per CPU).
+
+    `values` may be any iterable of integers; a list, `array.array` or NumPy
+    array of 8-byte integers is copied into shared memory without a Python-level
+    loop. The output is identical to `codec.encode_many(values)`. `chunk_size` is
+    the number of values per task and `executor` an existing process pool to reuse.
+    """
+    return b"".join(_encode_chunks(values, codec, workers, chunk_size, executor))
+
+
+def parallel_encode_with_index(values: Iterable[int],
+                               codec: Type[Base],
+                               workers: Optional[int] = None,
+                               chunk_size: Optional[int] = None,
+                               executor: Optional[Executor] = None) -> Tuple[bytes, array]:
+    """
+    Like `parallel_encode`, but also return the byte offset at which every chunk
+    starts, to be passed as `index` to `parallel_decode`.
+    """
+    chunks = _encode_chunks(values, codec, workers, chunk_size, executor)
+    index = array("Q")
+    offset = 0
+    for chunk in chunks:
+        index.append(offset)
+        offset += len(chunk)
+    return b"".join(chunks), index
+
+
+def _terminated_by_high_bit(codec: Type[Base]) -> bool:
+    if issubclass(codec, ZigZag):
+        codec = codec.codec
+    return issubclass(codec, (UnsignedLEB128, SignedLEB128, VariableLengthQuantity))
+
+
+def _high_bit_boundaries(view: memoryview, chunk_bytes: int) -> List[int]:
+    """Move every `chunk_bytes`-th position forward past the next byte with a clear high bit."""
+    size = len(view)
+    boundaries = [0]
+    target = chunk_bytes
+    while target < size:
+        position = target - 1
+        while position < size and view[position] & 0x80:
+            position += 1
+        if position + 1 >= size:
+            break
+        boundaries.append(position + 1)
+        target = position + 1 + chunk_bytes
+    boundaries.append(size)
+    return boundaries
+
+
+def _index_boundaries(index: Sequence[int], size: int, chunk_bytes: int) -> List[int]:
+    """Pick offsets from a sorted `index` roughly `chunk_bytes` apart."""
+    boundaries = [0]
+    target = chunk_bytes
+    while target < size:
+        position = bisect_left(index, target)
+        if position == len(index) or index[position] >= size:
+            break
+        boundaries.append(index[position])
+        target = index[position] + chunk_bytes
+    boundaries.append(size)
+    return boundaries
+
+
+def _chunk_boundaries(view: memoryview, codec: Type[Base], workers: int,
+                      index: Optional[Sequence[int]], chunk_size: Optional[int]) -> List[int]:
+    """Return the byte offsets splitting `view` into independently decodable chunks, [0, size] if it cannot be split."""
+    size = len(view)
+    if chunk_size is None:
+        chunk_size = max(_MIN_CHUNK_BYTES, -(-size // (workers * _CHUNKS_PER_WORKER)))
+    if _terminated_by_high_bit(codec):
+        return _high_bit_boundaries(view, chunk_size)
+    if index is not None:
+        return _index_boundaries(index, size, chunk_size)
+    return [0, size]
+
+
+def parallel_decode(buffer: ReadableBuffer,
+                    codec: Type[Base],
+                    workers: Optional[int] = None,
+                    index: Optional[Sequence[int]] = None,
+                    chunk_size: Optional[int] = None,
+                    as_array: bool = False,
+                    executor: Optional[Executor] = None) -> MutableSequence[int]:
+    """
+    Decode every integer in `buffer` with `codec` on `workers` processes.
+
+    `index` holds sorted byte offsets at which an integer starts; it is required
+    to split the buffer for codecs outside the LEB128/VLQ family, which are
+    otherwise decoded serially. `chunk_size` is the target number of bytes per
+    task. The result matches `codec.decode_many(buffer, as_array=as_array)`.
+    """
+    workers = _worker_count(workers)
+    view = memoryview(buffer).cast("B")
+    if workers == 1 and executor is None:
+        return codec.decode_many(view, as_array=as_array)
+    boundaries = _chunk_boundaries(view, codec, workers, index, chunk_size)
+    if len(boundaries) <= 2:
+        return codec.decode_many(view, as_array=as_array)
+
+    starts = boundaries[:-1]
+    shared = _to_shared(view)
+    try:
+        chunks = _run(executor, workers, _decode_chunk, [codec] * len(starts), [shared.name] * len(starts),
+                      starts, boundaries[1:], [as_array] * len(starts))
+    finally:
+        shared.close()
+        shared.unlink()
+
+    return _concatenate(chunks, codec, as_array)
+
+
+def _concatenate(chunks: Iterable[MutableSequence[int]], codec: Type[Base], as_array: bool) -> MutableSequence[int]:
+    result: MutableSequence[int] = array(codec.array_typecode) if as_array else []
+    for chunk in chunks:
+        result.extend(chunk)
+    return result
+
+
+def free_threaded() -> bool:
+    """Return True on a free-threaded CPython build (3.13t+) running with the GIL disabled."""
+    is_gil_enabled = getattr(sys, "_is_gil_enabled", None)
+    return is_gil_enabled is not None and not is_gil_enabled()
+
+
+def _decode_slice(codec: Type[Base], view: memoryview, start: int, end: int, as_array: bool) -> MutableSequence[int]:
+    return codec.decode_many(view[start:end], as_array=as_array)
+
+
+def threaded_decode(buffer: ReadableBuffer,
+                    codec: Type[Base],
+                    workers: Optional[int] = None,
+                    index: Optional[Sequence[int]] = None,
+                    chunk_size: Optional[int] = None,
+                    as_array: bool = False,
+                    executor: Optional[Executor] = None) -> MutableSequence[int]:
+    """
+    Decode every integer in `buffer` with `codec` on `workers` threads.
+
+    The buffer is split like in `parallel_decode`, without copying it into shared
+    memory: every thread decodes its chunk, and the chunks are concatenated like
+    in `parallel_decode`. Threads only help on free-threaded builds, so with the
+    GIL enabled the buffer is decoded serially unless an `executor` is given.
+    """
+    workers = _worker_count(workers)
+    view = memoryview(buffer).cast("B")
+    if executor is None and (workers == 1 or not free_threaded()):
+        return codec.decode_many(view, as_array=as_array)
+    boundaries = _chunk_boundaries(view, codec, workers, index, chunk_size)
+    if len(boundaries) <= 2:
+        return codec.decode_many(view, as_array=as_array)
+
+    starts = boundaries[:-1]
+    pool = executor if executor is not None else ThreadPoolExecutor(max_workers=workers)
+    try:
+        chunks = pool.map(_decode_slice, [codec] * len(starts), [view] * len(starts),
+                          starts, boundaries[1:], [as_array] * len(starts))
+        return _concatenate(chunks, codec, as_array)
+    finally:
+        if executor is None:
+            pool.shutdown()
@@ -0,0 +1,280 @@
+"""Field projection over protobuf wire format without a full parse.
+
+Protobuf varints are unsigned LEB128. `FieldScanner` walks the tags of a
+serialized message, decodes only the requested fields and jumps over the others
+using their wire type and length prefix. Length-delimited values (bytes,
+strings, nested messages, packed repeated fields) are returned as memoryviews
+on the input, so projecting them copies nothing.
+"""
+import struct
+from typing import (Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple, Type, Union)
+
+from PyVarInt.algorithms import Base, ReadableBuffer, UnsignedLEB128, zigzag_decode
+from PyVarInt.framing import Framer
+
+WIRE_VARINT = 0
+WIRE_FIXED64 = 1
+WIRE_LENGTH_DELIMITED = 2
+WIRE_START_GROUP = 3
+WIRE_END_GROUP = 4
+WIRE_FIXED32 = 5
+
+FieldValue = Union[int, float, bool, str, memoryview]
+
+_decode_varint = UnsignedLEB128.decode_from
+
+
+def _int64(value: int) -> int:
+    # int32 and int64 store negative values as 64-bit two's complement
+    return value - (1 << 64) if value >= 1 << 63 else value
+
+
+def _signed_fixed(size: int) -> Callable[[int], int]:
+    bound = 1 << (8 * size - 1)
+    return lambda value: value - (bound << 1) if value >= bound else value
+
+
+# Field type -> (wire type, conversion of the raw value)
+# The raw value is an int for varint and fixed fields, and a memoryview otherwise.
+FIELD_TYPES: Dict[str, Tuple[int, Optional[Callable]]] = {
+    "uint64": (WIRE_VARINT, None),
+    "uint32": (WIRE_VARINT, None),
+    "enum": (WIRE_VARINT, _int64),
+    "int64": (WIRE_VARINT, _int64),
+    "int32": (WIRE_VARINT, _int64),
+    "sint64": (WIRE_VARINT, zigzag_decode),
+    "sint32": (WIRE_VARINT, zigzag_decode),
+    "bool": (WIRE_VARINT, bool),
+    "fixed64": (WIRE_FIXED64, None),
+    "sfixed64": (WIRE_FIXED64, _signed_fixed(8)),
+    "double": (WIRE_FIXED64, None),
+    "fixed32": (WIRE_FIXED32, None),
+    "sfixed32": (WIRE_FIXED32, _signed_fixed(4)),
+    "float": (WIRE_FIXED32, None),
+    "bytes": (WIRE_LENGTH_DELIMITED, None),
+    "message": (WIRE_LENGTH_DELIMITED, None),
+    "string": (WIRE_LENGTH_DELIMITED, lambda view: str(view, "utf-8")),
+}
+_FIXED_SIZES = {WIRE_FIXED64: 8, WIRE_FIXED32: 4}
+_FLOAT_FORMATS = {"double": "<d", "float": "<f"}
+
+
+def _skip_group(buf: ReadableBuffer, offset: int, end: int, field_number: int) -> int:
+    """Return the offset after the END_GROUP tag matching a START_GROUP of `field_number`."""
+    while offset < end:
+        key, offset = _decode_varint(buf, offset)
+        wire_type = key & 7
+        if wire_type == WIRE_END_GROUP:
+            if key >> 3 != field_number:
+                raise ValueError(f"END_GROUP of field {key >> 3} inside group {field_number}")
+            return offset
+        offset = _skip_value(buf, offset, end, wire_type, key >> 3)
+    raise IndexError("truncated protobuf group")
+
+
+def _skip_value(buf: ReadableBuffer, offset: int, end: int, wire_type: int, field_number: int) -> int:
+    """Return the offset after the value of a field whose tag ends at `offset`."""
+    if wire_type == WIRE_VARINT:
+        return _decode_varint(buf, offset)[1]
+    if wire_type == WIRE_LENGTH_DELIMITED:
+        length, offset = _decode_varint(buf, offset)
+        offset += length
+    elif wire_type == WIRE_FIXED64:
+        offset += 8
+    elif wire_type == WIRE_FIXED32:
+        offset += 4
+    elif wire_type == WIRE_START_GROUP:
+        return _skip_group(buf, offset, end, field_number)
+    else:
+        raise ValueError(f"invalid wire type {wire_type} for field {field_number}")
+    if offset > end:
+        raise IndexError("truncated protobuf field")
+    return offset
+
+
+def iter_fields(message: ReadableBuffer) -> Iterator[Tuple[int, int, Union[int, memoryview]]]:
+    """
+    Yield `(field_number, wire_type, value)` for every field of a serialized message.
+
+    Varint and fixed-width values are unsigned ints, length-delimited values are
+    memoryviews on `message`. Groups are skipped.
+    """
+    view = memoryview(message)
+    offset = 0
+    end = len(view)
+    while offset < end:
+        key, offset = _decode_varint(message, offset)
+        field_number = key >> 3
+        wire_type = key & 7
+        if wire_type == WIRE_VARINT:
+            value, offset = _decode_varint(message, offset)
+            yield field_number, wire_type, value
+        elif wire_type == WIRE_LENGTH_DELIMITED:
+            length, start = _decode_varint(message, offset)
+            offset = start + length
+            if offset > end:
+                raise IndexError("truncated protobuf field")
+            yield field_number, wire_type, view[start:offset]
+        elif wire_type == WIRE_START_GROUP:
+            offset = _skip_group(message, offset, end, field_number)
+        else:
+            start = offset
+            offset = _skip_value(message, offset, end, wire_type, field_number)
+            yield field_number, wire_type, int.from_bytes(view[start:offset], "little")
+
+
+class FieldScanner:
+    """
+    Extract selected fields from serialized protobuf messages.
+
+    `fields` lists the field numbers to extract, or maps them to their protobuf
+    type ("uint64", "int32", "sint64", "bool", "fixed32", "sfixed64", "double",
+    "string", "bytes", "message", ...) to get converted values; sint fields are
+    ZigZag decoded. Untyped fields are returned raw: varint and fixed-width
+    values as unsigned ints, length-delimited values as memoryviews.
+
+    `scan` returns a tuple with one value per requested field, in the order of
+    `fields`, and None for absent fields. As in protobuf, the last occurrence of
+    a field wins; fields listed in `repeated` collect every occurrence in a list
+    instead, and numeric repeated fields also accept the packed encoding.
+    With `stop_early=True` and no repeated fields, a message is only read until
+    every requested field has been seen once, which ignores later duplicates.
+    """
+
+    def __init__(self,
+                 fields: Union[Iterable[int], Mapping[int, str]],
+                 repeated: Iterable[int] = (),
+                 stop_early: bool = False) -> None:
+        types: Mapping[int, Optional[str]] = fields if isinstance(fields, Mapping) else dict.fromkeys(fields)
+        self.fields: Tuple[int, ...] = tuple(types)
+        self.repeated = frozenset(repeated)
+        self.stop_early = stop_early
+        unknown = self.repeated.difference(self.fields)
+        if unknown:
+            raise ValueError(f"repeated fields {sorted(unknown)} are not in fields")
+
+        # Field number -> (slot, field type, expected wire type, conversion)
+        self._slots: Dict[int, Tuple[int, Optional[str], Optional[int], Optional[Callable]]] = {}
+        for slot, field_number in enumerate(self.fields):
+            if field_number < 1:
+                raise ValueError(f"invalid field number {field_number}")
+            field_type = types[field_number]
+            if field_type is None:
+                self._slots[field_number] = (slot, None, None, None)
+                continue
+            if field_type not in FIELD_TYPES:
+                raise ValueError(f"unknown field type {field_type!r}")
+            wire_type, convert = FIELD_TYPES[field_type]
+            self._slots[field_number] = (slot, field_type, wire_type, convert)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.fields}, repeated={sorted(self.repeated)})"
+
+    def scan(self, message: ReadableBuffer) -> Tuple[Optional[Union[FieldValue, List[FieldValue]]], ...]:
+        """Return the requested fields of one serialized message."""
+        values: List = [[] if field_number in self.repeated else None for field_number in self.fields]
+        view = memoryview(message)
+        slots = self._slots
+        repeated = self.repeated
+        remaining = len(self.fields) if self.stop_early and not repeated else -1
+        offset = 0
+        end = len(view)
+        value: FieldValue
+
+        while offset < end and remaining:
+            key, offset = _decode_varint(message, offset)
+            field_number = key >> 3
+            wire_type = key & 7
+            entry = slots.get(field_number)
+            if entry is None:
+                offset = _skip_value(message, offset, end, wire_type, field_number)
+                continue
+
+            slot, field_type, expected, convert = entry
+            if wire_type == WIRE_VARINT:
+                value, offset = _decode_varint(message, offset)
+            elif wire_type == WIRE_LENGTH_DELIMITED:
+                length, start = _decode_varint(message, offset)
+                offset = start + length
+                if offset > end:
+                    raise IndexError("truncated protobuf field")
+                payload = view[start:offset]
+                if expected is not None and expected != WIRE_LENGTH_DELIMITED and field_number in repeated:
+                    values[slot].extend(self._unpack(payload, field_type, expected, convert))
+                    continue
+                value = payload
+            elif wire_type in _FIXED_SIZES:
+                start = offset
+                offset += _FIXED_SIZES[wire_type]
+                if offset > end:
+                    raise IndexError("truncated protobuf field")
+                if field_type in _FLOAT_FORMATS and wire_type == expected:
+                    value = struct.unpack(_FLOAT_FORMATS[field_type], view[start:offset])[0]
+                else:
+                    value = int.from_bytes(view[start:offset], "little")
+            else:
+                offset = _skip_value(message, offset, end, wire_type, field_number)
+                continue
+
+            if expected is not None and wire_type != expected:
+                raise ValueError(f"field {field_number} of type {field_type} has wire type {wire_type}")
+            if convert is not None:
+                value = convert(value)
+            if field_number in repeated:
+                values[slot].append(value)
+            else:
+                if values[slot] is None:
+                    remaining -= 1
+                values[slot] = value
+        return tuple(values)
+
+    @staticmethod
+    def _unpack(view: memoryview, field_type: Optional[str], wire_type: int,
+                convert: Optional[Callable]) -> List[FieldValue]:
+        """Decode a packed repeated field."""
+        if wire_type == WIRE_VARINT:
+            values: List = list(UnsignedLEB128.decode_many(view))
+        elif field_type in _FLOAT_FORMATS:
+            values = [value for value, in struct.iter_unpack(_FLOAT_FORMATS[field_type], view)]
+        else:
+            size = _FIXED_SIZES[wire_type]
+            if len(view) % size:
+                raise IndexError("truncated packed field")
+            values = [int.from_bytes(view[start:start + size], "little") for start in range(0, len(view), size)]
+        if convert is not None and field_type not in _FLOAT_FORMATS:
+            values = [convert(value) for value in values]
+        return values
+
+    def scan_many(self, messages: Iterable[ReadableBuffer]) -> List[Tuple]:
+        """Return the requested fields of every message."""
+        scan = self.scan
+        return [scan(message) for message in messages]
+
+    def scan_delimited(self, buffer: ReadableBuffer, codec: Type[Base] = UnsignedLEB128,
+                       max_message_size: int = 64 * 1024 * 1024) -> Iterator[Tuple]:
+        """
+        Yield the requested fields of every message in a length-delimited stream,
+        as written by protobuf's `writeDelimitedTo`, see `PyVarInt.framing`.
+        """
+        scan = self.scan
+        for message in Framer(codec, max_message_size).iter_frames(buffer):
+            yield scan(message)
+
+    def column(self, messages: Iterable[ReadableBuffer], field_number: int) -> List:
+        """Return one requested field of every message."""
+        slot = self.fields.index(field_number)
+        scan = self.scan
+        return [scan(message)[slot] for message in messages]
+
+
+def fields_of(message: ReadableBuffer) -> Dict[int, List[Union[int, memoryview]]]:
+    """Group the raw values of every field of a message by field number, see `iter_fields`."""
+    result: Dict[int, List[Union[int, memoryview]]] = {}
+    for field_number, _, value in iter_fields(message):
+        result.setdefault(field_number, []).append(value)
+    return result
+
+
+__all__: Sequence[str] = ["FieldScanner", "iter_fields", "fields_of", "FIELD_TYPES",
+                          "WIRE_VARINT", "WIRE_FIXED64", "WIRE_LENGTH_DELIMITED",
+                          "WIRE_START_GROUP", "WIRE_END_GROUP", "WIRE_FIXED32"]
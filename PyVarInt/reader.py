@@ -0,0 +1,194 @@
+"""Random access to files holding long sequences of variable-length integers."""
+import mmap
+import os
+import struct
+import sys
+from array import array
+from typing import BinaryIO, List, Type, Union, overload
+
+from PyVarInt.algorithms import Base
+from PyVarInt.registry import UnknownCodecError, codec_id
+
+# Sidecar index layout: magic, codec id, stride, indexed value count, scanned byte offset,
+# followed by the byte offset of every `stride`-th value as little-endian uint64.
+# The previous layout, without codec id, used the magic b"PVIX".
+_INDEX_MAGIC = b"PVI2"
+_INDEX_HEADER = struct.Struct("<4sIIQQ")
+
+
+def _index_codec_id(codec: Type[Base]) -> int:
+    """Return the registry id of `codec` or of the registered codec it derives from, 0 if there is none."""
+    for cls in codec.__mro__:
+        if issubclass(cls, Base):
+            try:
+                return codec_id(cls)
+            except UnknownCodecError:
+                continue
+    return 0
+
+
+class VarIntReader:
+    """
+    Memory-mapped reader over a file of consecutive integers encoded with `codec`.
+
+    The reader keeps a sparse index holding the byte offset of every `stride`-th
+    value, so `reader[i]` decodes at most `stride` values. The index is built
+    incrementally: `refresh()` only scans bytes appended since the last scan.
+    When `index_path` is given the index is loaded from and saved to that sidecar
+    file, so reopening a large file does not require a full rescan. The sidecar
+    records the id in `PyVarInt.registry` of the codec, or of the registered
+    codec it derives from; an index written for another codec is rebuilt, and
+    so is the index of a codec outside the registry.
+
+    The file is expected to only grow by appending; rewriting existing bytes
+    invalidates the sidecar index.
+    """
+
+    def __init__(self,
+                 path: Union[str, os.PathLike],
+                 codec: Type[Base],
+                 stride: int = 1024,
+                 index_path: Union[str, os.PathLike, None] = None) -> None:
+        if stride < 1:
+            raise ValueError("stride must be positive")
+        self.path = path
+        self.codec = codec
+        self.stride = stride
+        self.index_path = os.fspath(index_path) if index_path is not None else None
+
+        self._offsets = array("Q")
+        self._count = 0
+        self._scanned = 0
+        self._file: BinaryIO = open(path, "rb")
+        self._map: Union[mmap.mmap, bytes] = b""
+        self._size = 0
+
+        if self.index_path is not None:
+            self._load_index(self.index_path)
+        self.refresh()
+
+    def _load_index(self, index_path: str) -> None:
+        try:
+            with open(index_path, "rb") as file:
+                header = file.read(_INDEX_HEADER.size)
+                offsets = file.read()
+        except FileNotFoundError:
+            return
+        if len(header) != _INDEX_HEADER.size:
+            return
+        magic, identifier, stride, count, scanned = _INDEX_HEADER.unpack(header)
+        blocks = (count + stride - 1) // stride
+        if (magic != _INDEX_MAGIC or not identifier or identifier != _index_codec_id(self.codec)
+                or stride != self.stride
+                or scanned > os.path.getsize(self.path) or len(offsets) != blocks * 8):
+            return
+
+        loaded = array("Q")
+        loaded.frombytes(offsets)
+        if sys.byteorder == "big":
+            loaded.byteswap()
+        self._offsets = loaded
+        self._count = count
+        self._scanned = scanned
+
+    def _save_index(self, index_path: str) -> None:
+        offsets = array("Q", self._offsets)
+        if sys.byteorder == "big":
+            offsets.byteswap()
+        tmp_path = index_path + ".tmp"
+        with open(tmp_path, "wb") as file:
+            file.write(_INDEX_HEADER.pack(_INDEX_MAGIC, _index_codec_id(self.codec), self.stride,
+                                          self._count, self._scanned))
+            file.write(offsets.tobytes())
+        os.replace(tmp_path, index_path)
+
+    def refresh(self) -> int:
+        """
+        Map bytes appended to the file since the last call and index the values in them.
+
+        A value that is only partially written is left for the next refresh.
+        Returns the number of values available.
+        """
+        size = os.fstat(self._file.fileno()).st_size
+        if size != self._size:
+            if isinstance(self._map, mmap.mmap):
+                self._map.close()
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+            self._size = size
+
+        if self._scanned >= size:
+            return self._count
+
+        buf = self._map
+        decode_from = self.codec.decode_from
+        stride = self.stride
+        offsets = self._offsets
+        count = self._count
+        offset = self._scanned
+        while offset < size:
+            if count % stride == 0:
+                offsets.append(offset)
+            try:
+                _, offset = decode_from(buf, offset)
+            except IndexError:
+                if count % stride == 0:
+                    offsets.pop()
+                break
+            count += 1
+
+        self._count = count
+        self._scanned = offset
+        if self.index_path is not None:
+            self._save_index(self.index_path)
+        return count
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _seek(self, index: int) -> int:
+        """Return the byte offset of the value at a non-negative `index`."""
+        block, position = divmod(index, self.stride)
+        return self.codec.skip(self._map, position, self._offsets[block])
+
+    def _decode_range(self, start: int, stop: int) -> List[int]:
+        result = []
+        offset = self._seek(start)
+        decode_from = self.codec.decode_from
+        for _ in range(stop - start):
+            value, offset = decode_from(self._map, offset)
+            result.append(value)
+        return result
+
+    @overload
+    def __getitem__(self, key: int) -> int: ...
+
+    @overload
+    def __getitem__(self, key: slice) -> List[int]: ...
+
+    def __getitem__(self, key: Union[int, slice]) -> Union[int, List[int]]:
+        if isinstance(key, slice):
+            indices = range(*key.indices(self._count))
+            if not indices:
+                return []
+            low = min(indices[0], indices[-1])
+            high = max(indices[0], indices[-1])
+            return self._decode_range(low, high + 1)[indices[0] - low::indices.step]
+
+        if key < 0:
+            key += self._count
+        if not 0 <= key < self._count:
+            raise IndexError("VarIntReader index out of range")
+        return self.codec.decode_from(self._map, self._seek(key))[0]
+
+    def close(self) -> None:
+        """Unmap and close the underlying file."""
+        if isinstance(self._map, mmap.mmap):
+            self._map.close()
+        self._map = b""
+        self._file.close()
+
+    def __enter__(self) -> "VarIntReader":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
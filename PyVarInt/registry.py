@@ -0,0 +1,96 @@
+"""Stable numeric ids for the codecs, so that encoded data can name its own codec."""
+from typing import Dict, Union
+
+from PyVarInt.algorithms import (Base,
+                                 BlockCodec,
+                                 PrefixVarint,
+                                 UnsignedLEB128,
+                                 SignedLEB128,
+                                 VariableLengthQuantity,
+                                 SQLite4VLI,
+                                 LeSQLite,
+                                 LeSQLite2,
+                                 UnrealEngineSingedVLQ,
+                                 ZigZagPrefixVarint,
+                                 ZigZagUnsignedLEB128,
+                                 ZigZagVariableLengthQuantity,
+                                 ZigZagSQLite4VLI,
+                                 ZigZagLeSQLite,
+                                 ZigZagLeSQLite2,
+                                 GroupVarint,
+                                 StreamVByte,
+                                 FrameOfReference,
+                                 PatchedFrameOfReference,
+                                 Simple8b)
+
+Codec = Union[type[Base], type[BlockCodec]]
+
+# Ids below this value are reserved for the codecs shipped with PyVarInt
+FIRST_USER_ID = 128
+
+# Never renumber an entry: the ids are written into encoded data
+_CODECS: Dict[int, Codec] = {
+    1: PrefixVarint,
+    2: UnsignedLEB128,
+    3: SignedLEB128,
+    4: VariableLengthQuantity,
+    5: SQLite4VLI,
+    6: LeSQLite,
+    7: LeSQLite2,
+    8: UnrealEngineSingedVLQ,
+    9: ZigZagPrefixVarint,
+    10: ZigZagUnsignedLEB128,
+    11: ZigZagVariableLengthQuantity,
+    12: ZigZagSQLite4VLI,
+    13: ZigZagLeSQLite,
+    14: ZigZagLeSQLite2,
+    15: GroupVarint,
+    16: StreamVByte,
+    17: FrameOfReference,
+    18: PatchedFrameOfReference,
+    19: Simple8b,
+}
+_IDS: Dict[Codec, int] = {codec: codec_id for codec_id, codec in _CODECS.items()}
+
+
+class UnknownCodecError(LookupError):
+    """A codec or codec id is not registered."""
+
+
+def codec_id(codec: Codec) -> int:
+    """Return the id of a registered codec."""
+    try:
+        return _IDS[codec]
+    except KeyError:
+        raise UnknownCodecError(f"{codec.__name__} is not registered, see register_codec") from None
+
+
+def codec_for(codec_id: int) -> Codec:
+    """Return the codec registered under `codec_id`."""
+    try:
+        return _CODECS[codec_id]
+    except KeyError:
+        raise UnknownCodecError(f"no codec is registered under id {codec_id}") from None
+
+
+def register_codec(codec: Codec, codec_id: int) -> None:
+    """
+    Register an application-defined codec under `codec_id`, which must be at least FIRST_USER_ID.
+
+    Registering the same codec under the same id again is a no-op.
+    """
+    if _CODECS.get(codec_id) is codec:
+        return
+    if codec_id < FIRST_USER_ID:
+        raise ValueError(f"ids below {FIRST_USER_ID} are reserved for the built-in codecs")
+    if codec_id in _CODECS:
+        raise ValueError(f"id {codec_id} is already registered for {_CODECS[codec_id].__name__}")
+    if codec in _IDS:
+        raise ValueError(f"{codec.__name__} is already registered under id {_IDS[codec]}")
+    _CODECS[codec_id] = codec
+    _IDS[codec] = codec_id
+
+
+def registered_codecs() -> Dict[int, Codec]:
+    """Return every registered codec by id."""
+    return dict(_CODECS)
@@ -0,0 +1,852 @@
+"""NumPy-vectorized bulk codecs.
+
+The functions in this module encode and decode whole integer columns at once
+instead of looping over values in Python. Their output is byte-identical to the
+scalar `encode`/`decode_from` methods of the matching classes in
+`PyVarInt.algorithms`.
+
+NumPy is an optional dependency: install it with `pip install PyVarInt[numpy]`.
+"""
+from typing import Callable, Dict, List, Tuple
+
+try:
+    import numpy as np
+    from numpy.typing import ArrayLike, NDArray
+except ImportError as error:  # pragma: no cover - depends on the environment
+    raise ImportError("PyVarInt.vectorized requires numpy, install it with "
+                      "`pip install PyVarInt[numpy]`") from error
+
+from PyVarInt.algorithms import (_PREFIX_VARINT_LENGTHS,
+                                 _SIMPLE8B_SELECTORS,
+                                 _length_prefixed_starts,
+                                 _unreal_vlq_starts,
+                                 Base,
+                                 BlockCodec,
+                                 FrameOfReference,
+                                 GroupVarint,
+                                 LeSQLite,
+                                 LeSQLite2,
+                                 PatchedFrameOfReference,
+                                 PrefixVarint,
+                                 Simple8b,
+                                 SQLite4VLI,
+                                 StreamVByte,
+                                 UnrealEngineSingedVLQ,
+                                 UnsignedLEB128,
+                                 SignedLEB128,
+                                 VariableLengthQuantity,
+                                 ZigZag,
+                                 ZigZagPrefixVarint,
+                                 ZigZagUnsignedLEB128,
+                                 ZigZagVariableLengthQuantity,
+                                 ZigZagSQLite4VLI,
+                                 ZigZagLeSQLite,
+                                 ZigZagLeSQLite2)
+
+# Largest number of 7-bit groups needed for a 64-bit integer
+_MAX_GROUPS = 10
+
+# Byte length of each of the 4 values of a Group Varint / Stream VByte group, by control byte
+_GROUP_LENGTHS = np.array([[((control >> (2 * index)) & 3) + 1 for index in range(4)]
+                           for control in range(256)], dtype=np.intp)
+
+
+def _as_uint8(data: ArrayLike) -> NDArray[np.uint8]:
+    """View `data` (bytes-like object or uint8 array) as a flat uint8 array without copying."""
+    if isinstance(data, np.ndarray):
+        return data.reshape(-1).view(np.uint8)
+    return np.frombuffer(data, dtype=np.uint8)
+
+
+def _as_unsigned(values: ArrayLike) -> NDArray[np.uint64]:
+    array = np.asarray(values)
+    if array.dtype.kind == "i" and array.size and array.min() < 0:
+        raise ValueError("negative values cannot be encoded with an unsigned codec")
+    return array.reshape(-1).astype(np.uint64, copy=False)
+
+
+def _as_signed(values: ArrayLike) -> NDArray[np.int64]:
+    return np.asarray(values).reshape(-1).astype(np.int64, copy=False)
+
+
+def _group_lengths(magnitude: NDArray[np.uint64]) -> NDArray[np.intp]:
+    """Number of 7-bit groups needed for every unsigned value."""
+    lengths = np.ones(magnitude.shape, dtype=np.intp)
+    for groups in range(1, _MAX_GROUPS):
+        lengths += magnitude >= np.uint64(1 << (7 * groups))
+    return lengths
+
+
+def _split_terminated(data: NDArray[np.uint8]) -> tuple[NDArray[np.intp], NDArray[np.intp]]:
+    """
+    Find the start offset and length of every value in a stream where
+    a clear high bit terminates a value (LEB128 and VLQ).
+    """
+    ends = np.flatnonzero((data & 0x80) == 0)
+    if ends.size == 0 or ends[-1] != data.size - 1:
+        raise IndexError("truncated varint")
+    starts = np.empty_like(ends)
+    starts[0] = 0
+    starts[1:] = ends[:-1] + 1
+    lengths = ends - starts + 1
+    if lengths.max() > _MAX_GROUPS:
+        raise OverflowError("varint does not fit in 64 bits")
+    return starts, lengths
+
+
+def _scatter_groups(values: NDArray, lengths: NDArray[np.intp], big_endian: bool) -> NDArray[np.uint8]:
+    """Write the 7-bit groups of every value with continuation bits set on all but the last byte."""
+    ends = np.cumsum(lengths)
+    out = np.empty(int(ends[-1]) if ends.size else 0, dtype=np.uint8)
+    starts = ends - lengths
+    for group in range(int(lengths.max()) if lengths.size else 0):
+        selected = lengths > group
+        chunk = ((values[selected] >> group * 7) & 0x7F).astype(np.uint8)
+        if big_endian:
+            # The least significant group is the last byte of a VLQ
+            if group:
+                chunk |= 0x80
+            out[ends[selected] - 1 - group] = chunk
+        else:
+            chunk[lengths[selected] > group + 1] |= 0x80
+            out[starts[selected] + group] = chunk
+    return out
+
+
+def _gather_groups(data: NDArray[np.uint8],
+                   starts: NDArray[np.intp],
+                   lengths: NDArray[np.intp],
+                   big_endian: bool) -> NDArray[np.uint64]:
+    """OR together the 7-bit groups of every value."""
+    position = np.arange(data.size) - np.repeat(starts, lengths)
+    if big_endian:
+        position = np.repeat(lengths, lengths) - 1 - position
+    payload = (data & 0x7F).astype(np.uint64) << (position * 7).astype(np.uint64)
+    return np.bitwise_or.reduceat(payload, starts)
+
+
+def _encode_uleb128(values: ArrayLike) -> NDArray[np.uint8]:
+    array = _as_unsigned(values)
+    return _scatter_groups(array, _group_lengths(array), big_endian=False)
+
+
+def _decode_uleb128(data: ArrayLike) -> NDArray[np.uint64]:
+    data = _as_uint8(data)
+    if data.size == 0:
+        return np.empty(0, dtype=np.uint64)
+    starts, lengths = _split_terminated(data)
+    last = data[starts + lengths - 1]
+    if np.any((lengths == _MAX_GROUPS) & (last > 1)):
+        raise OverflowError("varint does not fit in 64 bits")
+    return _gather_groups(data, starts, lengths, big_endian=False)
+
+
+def _encode_sleb128(values: ArrayLike) -> NDArray[np.uint8]:
+    array = _as_signed(values)
+    # A signed value needs one extra bit for the sign: -64..63 fit into one byte
+    magnitude = np.where(array < 0, ~array, array).astype(np.uint64)
+    lengths = np.ones(array.shape, dtype=np.intp)
+    for groups in range(1, _MAX_GROUPS):
+        lengths += magnitude >= np.uint64(1 << (7 * groups - 1))
+    return _scatter_groups(array, lengths, big_endian=False)
+
+
+def _decode_sleb128(data: ArrayLike) -> NDArray[np.int64]:
+    data = _as_uint8(data)
+    if data.size == 0:
+        return np.empty(0, dtype=np.int64)
+    starts, lengths = _split_terminated(data)
+    last = data[starts + lengths - 1]
+    if np.any((lengths == _MAX_GROUPS) & (last != 0) & (last != 0x7F)):
+        raise OverflowError("varint does not fit in 64 bits")
+    values = _gather_groups(data, starts, lengths, big_endian=False)
+    # Sign extend values whose last group has the sign bit set
+    negative = ((last & 0x40) != 0) & (lengths < _MAX_GROUPS)
+    shift = (lengths[negative] * 7).astype(np.uint64)
+    values[negative] |= ~((np.uint64(1) << shift) - np.uint64(1))
+    return values.view(np.int64)
+
+
+def _encode_vlq(values: ArrayLike) -> NDArray[np.uint8]:
+    array = _as_unsigned(values)
+    return _scatter_groups(array, _group_lengths(array), big_endian=True)
+
+
+def _decode_vlq(data: ArrayLike) -> NDArray[np.uint64]:
+    data = _as_uint8(data)
+    if data.size == 0:
+        return np.empty(0, dtype=np.uint64)
+    starts, lengths = _split_terminated(data)
+    if np.any((lengths == _MAX_GROUPS) & ((data[starts] & 0x7F) > 1)):
+        raise OverflowError("varint does not fit in 64 bits")
+    return _gather_groups(data, starts, lengths, big_endian=True)
+
+
+# Rows of the SQLite-inspired layouts, one per encoded length: (largest value, bias,
+# first byte, payload bytes, big-endian payload). A value is stored as the first
+# byte `first + ((value - bias) >> 8 * payload bytes)` followed by the low payload
+# bytes of `value - bias`, so the short rows keep their high bits in the first
+# byte and the long rows only announce a length there.
+_SQLITE4_VLI_LAYOUT = [(240, 0, 0, 0, True), (2287, 240, 241, 1, True), (67823, 2288, 249, 2, True)] + \
+    [(2 ** (8 * size) - 1, 0, 247 + size, size, True) for size in range(3, 9)]
+_LE_SQLITE_LAYOUT = [(184, 0, 0, 0, False), (16559, 185, 185, 1, False)] + \
+    [(2 ** (8 * size) - 1, 0, 247 + size, size, False) for size in range(2, 9)]
+_LE_SQLITE2_LAYOUT = [(177, 0, 0, 0, False), (16561, 178, 178, 1, False), (524287, 16562, 242, 2, True)] + \
+    [(2 ** (8 * size) - 1, 0, 247 + size, size, False) for size in range(3, 9)]
+
+# Mask of the low `size` bytes of a uint64, by size
+_BYTE_MASKS = np.array([(1 << (8 * size)) - 1 for size in range(9)], dtype=np.uint64)
+
+_Layout = List[Tuple[int, int, int, int, bool]]
+# Decoding tables indexed by the first byte: encoded length, value contributed by
+# the first byte, shift of the payload and payload byte order
+_FirstByteTables = Tuple[bytes, NDArray[np.uint64], NDArray[np.uint64], NDArray[np.bool_]]
+
+
+def _first_byte_tables(layout: _Layout) -> _FirstByteTables:
+    lengths = bytearray(256)
+    bases = np.zeros(256, dtype=np.uint64)
+    big_endian = np.zeros(256, dtype=bool)
+    ends = [first for _, _, first, _, _ in layout[1:]] + [256]
+    for (_, bias, first, payload, row_big_endian), end in zip(layout, ends):
+        for byte in range(first, end):
+            lengths[byte] = payload + 1
+            bases[byte] = bias + ((byte - first) << (8 * payload))
+            big_endian[byte] = row_big_endian
+    return bytes(lengths), bases, np.zeros(256, dtype=np.uint64), big_endian
+
+
+def _prefix_varint_tables() -> _FirstByteTables:
+    # The tag is the lowest set bit of the first byte, its higher bits are the low bits of the value
+    lengths = _PREFIX_VARINT_LENGTHS
+    first = np.arange(256, dtype=np.uint64)
+    length = np.frombuffer(lengths, dtype=np.uint8).astype(np.uint64)
+    shifts = np.where(length < 8, np.uint64(8) - length, np.uint64(0))
+    return lengths, np.where(length < 9, first >> np.minimum(length, 8), 0).astype(np.uint64), \
+        shifts, np.zeros(256, dtype=bool)
+
+
+_SQLITE4_VLI_TABLES = _first_byte_tables(_SQLITE4_VLI_LAYOUT)
+_LE_SQLITE_TABLES = _first_byte_tables(_LE_SQLITE_LAYOUT)
+_LE_SQLITE2_TABLES = _first_byte_tables(_LE_SQLITE2_LAYOUT)
+_PREFIX_VARINT_TABLES = _prefix_varint_tables()
+
+
+def _scatter_bytes(out: NDArray[np.uint8], positions: NDArray[np.intp], values: NDArray[np.uint64],
+                   sizes: NDArray[np.intp], big_endian: NDArray[np.bool_]) -> None:
+    """Write the low `sizes` bytes of every value at `positions`, in the byte order of `big_endian`."""
+    stores = values.astype("<u8").view(np.uint8).reshape(-1, 8)
+    if big_endian.any():
+        # Move the low bytes to the top so that they come first in big-endian order
+        half = (4 * (8 - sizes)).astype(np.uint64)
+        swapped = ((values << half) << half).astype(">u8").view(np.uint8).reshape(-1, 8)
+        stores = np.where(big_endian[:, None], swapped, stores)
+    kept = np.arange(8) < sizes[:, None]
+    out[(positions[:, None] + np.arange(8))[kept]] = stores[kept]
+
+
+def _gather_bytes(data: NDArray[np.uint8], positions: NDArray[np.intp],
+                  sizes: NDArray[np.intp], big_endian: NDArray[np.bool_]) -> NDArray[np.uint64]:
+    """Read the `sizes` bytes at every position as an integer, in the byte order of `big_endian`."""
+    # One unaligned 8-byte load per value, then the bytes past its size are dropped
+    padded = np.concatenate([data, np.zeros(8, dtype=np.uint8)])
+    loads = np.lib.stride_tricks.sliding_window_view(padded, 8)[positions]
+    values = loads.view("<u8").reshape(-1) & _BYTE_MASKS[sizes]
+    if big_endian.any():
+        half = (4 * (8 - sizes)).astype(np.uint64)
+        values = np.where(big_endian, (loads.view(">u8").reshape(-1) >> half) >> half, values)
+    return values
+
+
+def _encode_layout(values: ArrayLike, layout: _Layout) -> NDArray[np.uint8]:
+    array = _as_unsigned(values)
+    rows = np.searchsorted(np.array([upper for upper, _, _, _, _ in layout], dtype=np.uint64), array)
+    adjusted = array - np.array([bias for _, bias, _, _, _ in layout], dtype=np.uint64)[rows]
+    payloads = np.array([payload for _, _, _, payload, _ in layout], dtype=np.intp)[rows]
+    big_endian = np.array([row_big_endian for _, _, _, _, row_big_endian in layout], dtype=bool)[rows]
+    ends = np.cumsum(payloads + 1)
+    starts = ends - payloads - 1
+    out = np.empty(int(ends[-1]) if ends.size else 0, dtype=np.uint8)
+    # Two shifts, as shifting a uint64 by 64 bits is undefined
+    half = (4 * payloads).astype(np.uint64)
+    out[starts] = np.array([first for _, _, first, _, _ in layout], dtype=np.uint64)[rows] + \
+        ((adjusted >> half) >> half)
+    _scatter_bytes(out, starts + 1, adjusted, payloads, big_endian)
+    return out
+
+
+def _decode_first_byte(data: ArrayLike, tables: _FirstByteTables) -> NDArray[np.uint64]:
+    """Decode a codec whose length is given by the first byte, described by its first byte tables."""
+    data = _as_uint8(data)
+    lengths, bases, shifts, big_endian = tables
+    # Finding the starts is serial, but only looks at one byte per value
+    starts = np.flatnonzero(np.frombuffer(_length_prefixed_starts(lengths, data.tobytes()), dtype=np.uint8))
+    first = data[starts]
+    sizes = np.frombuffer(lengths, dtype=np.uint8).astype(np.intp)[first] - 1
+    payload = _gather_bytes(data, starts + 1, sizes, big_endian[first])
+    return bases[first] + (payload << shifts[first])
+
+
+def _encode_sqlite4_vli(values: ArrayLike) -> NDArray[np.uint8]:
+    return _encode_layout(values, _SQLITE4_VLI_LAYOUT)
+
+
+def _decode_sqlite4_vli(data: ArrayLike) -> NDArray[np.uint64]:
+    return _decode_first_byte(data, _SQLITE4_VLI_TABLES)
+
+
+def _encode_le_sqlite(values: ArrayLike) -> NDArray[np.uint8]:
+    return _encode_layout(values, _LE_SQLITE_LAYOUT)
+
+
+def _decode_le_sqlite(data: ArrayLike) -> NDArray[np.uint64]:
+    return _decode_first_byte(data, _LE_SQLITE_TABLES)
+
+
+def _encode_le_sqlite2(values: ArrayLike) -> NDArray[np.uint8]:
+    return _encode_layout(values, _LE_SQLITE2_LAYOUT)
+
+
+def _decode_le_sqlite2(data: ArrayLike) -> NDArray[np.uint64]:
+    return _decode_first_byte(data, _LE_SQLITE2_TABLES)
+
+
+_PREFIX_VARINT_LIMITS = np.array([(1 << (7 * size)) - 1 for size in range(1, 9)], dtype=np.uint64)
+
+
+def _encode_prefix_varint(values: ArrayLike) -> NDArray[np.uint8]:
+    array = _as_unsigned(values)
+    # 7 bits per byte up to 56 bits, then a zero first byte followed by all 8 bytes
+    lengths = np.searchsorted(_PREFIX_VARINT_LIMITS, array) + 1
+    ends = np.cumsum(lengths)
+    starts = ends - lengths
+    out = np.empty(int(ends[-1]) if ends.size else 0, dtype=np.uint8)
+    # The tag is a set bit above `length - 1` zero bits, the value fills the rest of the first byte
+    tags = np.minimum(lengths, 8).astype(np.uint64)
+    first = ((array << tags) | (np.uint64(1) << (tags - np.uint64(1)))) & np.uint64(0xFF)
+    out[starts] = np.where(lengths < 9, first, 0)
+    payload = array >> (np.uint64(8) - tags)
+    _scatter_bytes(out, starts + 1, payload, lengths - 1, np.zeros(lengths.size, dtype=bool))
+    return out
+
+
+def _decode_prefix_varint(data: ArrayLike) -> NDArray[np.uint64]:
+    return _decode_first_byte(data, _PREFIX_VARINT_TABLES)
+
+
+# Payload bits of the bytes of an Unreal Engine VLQ after the first one, which holds 6 bits
+_UNREAL_SHIFTS = (6, 13, 20, 27)
+_UNREAL_MAX = 2 ** 35 - 1
+
+
+def _encode_unreal_vlq(values: ArrayLike) -> NDArray[np.uint8]:
+    array = _as_signed(values)
+    if array.size and (int(array.min()) < -_UNREAL_MAX or int(array.max()) > _UNREAL_MAX):
+        raise OverflowError(f"Unreal Engine VLQs hold values between {-_UNREAL_MAX} and {_UNREAL_MAX}")
+    magnitude = np.abs(array).astype(np.uint64)
+    lengths = np.ones(array.shape, dtype=np.intp)
+    for shift in _UNREAL_SHIFTS:
+        lengths += magnitude >= np.uint64(1 << shift)
+    ends = np.cumsum(lengths)
+    starts = ends - lengths
+    out = np.empty(int(ends[-1]) if ends.size else 0, dtype=np.uint8)
+    out[starts] = (magnitude & np.uint64(0x3F)) | np.where(lengths > 1, np.uint64(0x40), np.uint64(0)) | \
+        np.where(array < 0, np.uint64(0x80), np.uint64(0))
+    for byte, shift in enumerate(_UNREAL_SHIFTS, 1):
+        selected = lengths > byte
+        chunk = magnitude[selected] >> np.uint64(shift)
+        if byte < len(_UNREAL_SHIFTS):
+            # The last byte holds 8 bits and no continuation bit
+            chunk = (chunk & np.uint64(0x7F)) | np.where(lengths[selected] > byte + 1, np.uint64(0x80), np.uint64(0))
+        out[starts[selected] + byte] = chunk
+    return out
+
+
+def _decode_unreal_vlq(data: ArrayLike) -> NDArray[np.int64]:
+    data = _as_uint8(data)
+    starts = np.flatnonzero(np.frombuffer(_unreal_vlq_starts(data.tobytes()), dtype=np.uint8))
+    lengths = np.diff(starts, append=data.size)
+    first = data[starts]
+    magnitude = (first & 0x3F).astype(np.uint64)
+    for byte, shift in enumerate(_UNREAL_SHIFTS, 1):
+        selected = lengths > byte
+        chunk = data[starts[selected] + byte].astype(np.uint64)
+        if byte < len(_UNREAL_SHIFTS):
+            chunk &= np.uint64(0x7F)
+        magnitude[selected] |= chunk << np.uint64(shift)
+    values = magnitude.astype(np.int64)
+    return np.where(first & 0x80, -values, values)
+
+
+def _uint32_lengths(values: ArrayLike) -> tuple[NDArray[np.uint64], NDArray[np.intp]]:
+    """Validate 32-bit input and return it with the byte length (1-4) of every value."""
+    array = _as_unsigned(values)
+    if array.size and array.max() > 0xFFFFFFFF:
+        raise OverflowError("values must be unsigned 32-bit integers")
+    lengths = 1 + (array >= 1 << 8).astype(np.intp) + (array >= 1 << 16) + (array >= 1 << 24)
+    return array, lengths
+
+
+def _group_controls(lengths: NDArray[np.intp]) -> NDArray[np.uint8]:
+    """Pack the 2-bit length codes of every group of 4 values into control bytes."""
+    codes = np.zeros((lengths.size + 3) // 4 * 4, dtype=np.uint8)
+    codes[:lengths.size] = lengths - 1
+    codes = codes.reshape(-1, 4)
+    return codes[:, 0] | (codes[:, 1] << 2) | (codes[:, 2] << 4) | (codes[:, 3] << 6)
+
+
+def _scatter_le(out: NDArray[np.uint8], positions: NDArray[np.intp],
+                values: NDArray[np.uint64], lengths: NDArray[np.intp]) -> None:
+    for byte in range(4):
+        selected = lengths > byte
+        out[positions[selected] + byte] = (values[selected] >> (8 * byte)) & 0xFF
+
+
+def _gather_le(data: NDArray[np.uint8], positions: NDArray[np.intp], lengths: NDArray[np.intp]) -> NDArray[np.uint32]:
+    if positions.size and int((positions + lengths).max()) > data.size:
+        raise IndexError("truncated group")
+    values = np.zeros(positions.size, dtype=np.uint32)
+    for byte in range(4):
+        selected = lengths > byte
+        values[selected] |= data[positions[selected] + byte].astype(np.uint32) << (8 * byte)
+    return values
+
+
+def _with_header(count: int, size: int) -> tuple[NDArray[np.uint8], int]:
+    """Allocate the output of a block codec and write the value count in front of it."""
+    header = UnsignedLEB128.encode(count)
+    out = np.empty(len(header) + size, dtype=np.uint8)
+    out[:len(header)] = np.frombuffer(header, dtype=np.uint8)
+    return out, len(header)
+
+
+def _encode_stream_vbyte(values: ArrayLike) -> NDArray[np.uint8]:
+    array, lengths = _uint32_lengths(values)
+    controls = _group_controls(lengths)
+    out, base = _with_header(array.size, controls.size + int(lengths.sum()))
+    out[base:base + controls.size] = controls
+    positions = base + controls.size + np.cumsum(lengths) - lengths
+    _scatter_le(out, positions, array, lengths)
+    return out
+
+
+def _decode_stream_vbyte(data: ArrayLike) -> NDArray[np.uint32]:
+    data = _as_uint8(data)
+    count, offset = UnsignedLEB128.decode_from(memoryview(data))
+    control_count = (count + 3) // 4
+    if offset + control_count > data.size:
+        raise IndexError("truncated Stream VByte")
+    # Every value boundary comes from the control stream alone
+    lengths = _GROUP_LENGTHS[data[offset:offset + control_count]].reshape(-1)[:count]
+    positions = offset + control_count + np.cumsum(lengths) - lengths
+    return _gather_le(data, positions, lengths)
+
+
+def _encode_group_varint(values: ArrayLike) -> NDArray[np.uint8]:
+    array, lengths = _uint32_lengths(values)
+    controls = _group_controls(lengths)
+    padded = np.zeros(controls.size * 4, dtype=np.intp)
+    padded[:lengths.size] = lengths
+    padded = padded.reshape(-1, 4)
+    group_sizes = 1 + padded.sum(axis=1)
+    out, base = _with_header(array.size, int(group_sizes.sum()))
+    group_starts = base + np.cumsum(group_sizes) - group_sizes
+    out[group_starts] = controls
+    within = (np.cumsum(padded, axis=1) - padded).reshape(-1)[:lengths.size]
+    positions = np.repeat(group_starts + 1, 4)[:lengths.size] + within
+    _scatter_le(out, positions, array, lengths)
+    return out
+
+
+def _decode_group_varint(data: ArrayLike) -> NDArray[np.uint32]:
+    data = _as_uint8(data)
+    buf = memoryview(data)
+    count, offset = UnsignedLEB128.decode_from(buf)
+    # Control bytes sit between the groups, so finding them is a serial pass over groups only
+    group_count = (count + 3) // 4
+    group_sizes = _GROUP_LENGTHS.sum(axis=1).tolist()
+    group_starts = np.empty(group_count, dtype=np.intp)
+    for group in range(group_count):
+        group_starts[group] = offset
+        offset += 1 + group_sizes[buf[offset]]
+    controls = data[group_starts]
+    group_lengths = _GROUP_LENGTHS[controls]
+    within = (np.cumsum(group_lengths, axis=1) - group_lengths).reshape(-1)[:count]
+    lengths = group_lengths.reshape(-1)[:count]
+    positions = np.repeat(group_starts + 1, 4)[:count] + within
+    return _gather_le(data, positions, lengths)
+
+
+# Values per word and bits per value of every Simple-8b selector
+_SIMPLE8B_CAPACITY = np.array([capacity for capacity, _ in _SIMPLE8B_SELECTORS], dtype=np.intp)
+_SIMPLE8B_BITS = np.array([bits for _, bits in _SIMPLE8B_SELECTORS], dtype=np.intp)
+# Groups of 8 values bit-packed at once, bounds the temporary array of unpacked bits
+_PACK_CHUNK_GROUPS = 1 << 13
+
+
+def _bit_lengths(values: NDArray[np.uint64]) -> NDArray[np.intp]:
+    """`int.bit_length` of every value."""
+    remaining = values.copy()
+    lengths = np.zeros(values.shape, dtype=np.intp)
+    for shift in (32, 16, 8, 4, 2, 1):
+        wide = remaining >= np.uint64(1 << shift)
+        lengths[wide] += shift
+        remaining[wide] >>= np.uint64(shift)
+    return lengths + (remaining > 0)
+
+
+def _within(lengths: NDArray[np.intp]) -> NDArray[np.intp]:
+    """Position of every item inside its run, for runs of the given lengths laid end to end."""
+    ends = np.cumsum(lengths)
+    return np.arange(int(ends[-1]) if ends.size else 0) - np.repeat(ends - lengths, lengths)
+
+
+def _scatter_uleb128(out: NDArray[np.uint8], positions: NDArray[np.intp],
+                     values: NDArray[np.uint64], lengths: NDArray[np.intp]) -> None:
+    """Write every value as an unsigned LEB128 at its position of `out`."""
+    out[np.repeat(positions, lengths) + _within(lengths)] = _scatter_groups(values, lengths, big_endian=False)
+
+
+def _pack_bits(groups: NDArray[np.uint64], width: int) -> NDArray[np.uint8]:
+    """Pack groups of 8 values on `width` bits each, lowest bits first: (k, 8) values -> (k, width) bytes."""
+    packed = np.empty((groups.shape[0], width), dtype=np.uint8)
+    for start in range(0, groups.shape[0], _PACK_CHUNK_GROUPS):
+        chunk = groups[start:start + _PACK_CHUNK_GROUPS].astype("<u8").view(np.uint8).reshape(-1, 8)
+        bits = np.unpackbits(chunk, axis=1, bitorder="little")[:, :width]
+        packed[start:start + _PACK_CHUNK_GROUPS] = np.packbits(bits.reshape(-1, 8 * width), axis=1,
+                                                               bitorder="little")
+    return packed
+
+
+def _unpack_bits(packed: NDArray[np.uint8], width: int) -> NDArray[np.uint64]:
+    """Inverse of `_pack_bits`: (k, width) bytes -> (k, 8) values."""
+    groups = np.empty((packed.shape[0], 8), dtype=np.uint64)
+    for start in range(0, packed.shape[0], _PACK_CHUNK_GROUPS):
+        bits = np.unpackbits(packed[start:start + _PACK_CHUNK_GROUPS], axis=1, bitorder="little")
+        padded = np.zeros((bits.shape[0] * 8, 64), dtype=np.uint8)
+        padded[:, :width] = bits.reshape(-1, width)
+        groups[start:start + _PACK_CHUNK_GROUPS] = np.packbits(padded, axis=1, bitorder="little").view("<u8") \
+            .reshape(-1, 8)
+    return groups
+
+
+def _group_positions(data_starts: NDArray[np.intp], groups: NDArray[np.intp],
+                     widths: NDArray[np.intp]) -> tuple[NDArray[np.intp], NDArray[np.intp]]:
+    """Byte offset and bit width of every group of 8 packed values of every block."""
+    block = np.repeat(np.arange(groups.size), groups)
+    group_widths = widths[block]
+    return data_starts[block] + _within(groups) * group_widths, group_widths
+
+
+def _write_groups(out: NDArray[np.uint8], data_starts: NDArray[np.intp], groups: NDArray[np.intp],
+                  widths: NDArray[np.intp], deltas: NDArray[np.uint64]) -> None:
+    positions, group_widths = _group_positions(data_starts, groups, widths)
+    grouped = deltas.reshape(-1, 8)
+    for width in np.unique(group_widths).tolist():
+        if width:
+            selected = group_widths == width
+            out[positions[selected, None] + np.arange(width)] = _pack_bits(grouped[selected], width)
+
+
+def _read_groups(data: NDArray[np.uint8], data_starts: NDArray[np.intp], groups: NDArray[np.intp],
+                 widths: NDArray[np.intp]) -> NDArray[np.uint64]:
+    positions, group_widths = _group_positions(data_starts, groups, widths)
+    grouped = np.zeros((positions.size, 8), dtype=np.uint64)
+    for width in np.unique(group_widths).tolist():
+        if width:
+            selected = group_widths == width
+            grouped[selected] = _unpack_bits(data[positions[selected, None] + np.arange(width)], width)
+    return grouped.reshape(-1)
+
+
+def _frames(values: ArrayLike) -> tuple[NDArray[np.uint64], NDArray[np.intp], NDArray[np.uint64], NDArray[np.uint64]]:
+    """Split a column into frame-of-reference blocks: values, block sizes, block minimums and padded differences."""
+    array = _as_unsigned(values)
+    starts = np.arange(0, array.size, FrameOfReference.block_size)
+    counts = np.minimum(FrameOfReference.block_size, array.size - starts)
+    minimums = np.minimum.reduceat(array, starts)
+    deltas = np.zeros((array.size + 7) // 8 * 8, dtype=np.uint64)
+    deltas[:array.size] = array - np.repeat(minimums, counts)
+    return array, counts, minimums, deltas
+
+
+def _block_counts(count: int) -> NDArray[np.intp]:
+    starts = np.arange(0, count, FrameOfReference.block_size)
+    return np.minimum(FrameOfReference.block_size, count - starts)
+
+
+def _encode_frame_of_reference(values: ArrayLike) -> NDArray[np.uint8]:
+    if not np.size(values):
+        return _with_header(0, 0)[0]
+    array, counts, minimums, deltas = _frames(values)
+    groups = (counts + 7) // 8
+    widths = _bit_lengths(np.maximum.reduceat(array, np.cumsum(counts) - counts) - minimums)
+    minimum_lengths = _group_lengths(minimums)
+    sizes = minimum_lengths + 1 + groups * widths
+    out, base = _with_header(array.size, int(sizes.sum()))
+    block_starts = base + np.cumsum(sizes) - sizes
+    _scatter_uleb128(out, block_starts, minimums, minimum_lengths)
+    out[block_starts + minimum_lengths] = widths
+    _write_groups(out, block_starts + minimum_lengths + 1, groups, widths, deltas)
+    return out
+
+
+def _decode_frame_of_reference(data: ArrayLike) -> NDArray[np.uint64]:
+    data = _as_uint8(data)
+    buf = memoryview(data)
+    count, offset = UnsignedLEB128.decode_from(buf)
+    counts = _block_counts(count)
+    groups = (counts + 7) // 8
+    minimums = np.empty(counts.size, dtype=np.uint64)
+    widths = np.empty(counts.size, dtype=np.intp)
+    data_starts = np.empty(counts.size, dtype=np.intp)
+    # Block headers are spread over the data, finding them is a serial pass over blocks only
+    for block, group_count in enumerate(groups.tolist()):
+        minimums[block], offset = UnsignedLEB128.decode_from(buf, offset)
+        widths[block] = width = buf[offset]
+        data_starts[block] = offset + 1
+        offset += 1 + group_count * width
+    if offset > data.size:
+        raise IndexError("truncated frame-of-reference block")
+    return _read_groups(data, data_starts, groups, widths)[:count] + np.repeat(minimums, counts)
+
+
+def _patched_widths(counts: NDArray[np.intp], value_widths: NDArray[np.intp]) -> NDArray[np.intp]:
+    """Vectorized `_patched_width` of every block, see PatchedFrameOfReference."""
+    blocks = np.repeat(np.arange(counts.size), counts)
+    histogram = np.bincount(blocks * 65 + value_widths, minlength=counts.size * 65).reshape(-1, 65)
+    candidate = np.arange(65)[:, None]
+    width = np.arange(65)[None, :]
+    # Size of one exception: a position byte and the LEB128 of its high bits
+    exception_sizes = np.where(width > candidate, 1 + (width - candidate + 6) // 7, 0)
+    sizes = ((counts + 7) // 8)[:, None] * np.arange(65) + histogram @ exception_sizes.T
+    # Like the scalar encoder, only consider widths present in the block and keep the smallest on ties
+    sizes[histogram == 0] = np.iinfo(sizes.dtype).max
+    return np.argmin(sizes, axis=1)
+
+
+def _encode_patched_frame_of_reference(values: ArrayLike) -> NDArray[np.uint8]:
+    if not np.size(values):
+        return _with_header(0, 0)[0]
+    array, counts, minimums, deltas = _frames(values)
+    groups = (counts + 7) // 8
+    blocks = np.repeat(np.arange(counts.size), counts)
+    value_widths = _bit_lengths(deltas[:array.size])
+    widths = _patched_widths(counts, value_widths)
+
+    exceptions = np.flatnonzero(value_widths > widths[blocks])
+    exception_blocks = blocks[exceptions]
+    exception_widths = widths[exception_blocks].astype(np.uint64)
+    high = deltas[exceptions] >> exception_widths
+    deltas[exceptions] &= (np.uint64(1) << exception_widths) - np.uint64(1)
+    exception_counts = np.bincount(exception_blocks, minlength=counts.size)
+    high_lengths = _group_lengths(high)
+    high_sizes = np.bincount(exception_blocks, weights=high_lengths, minlength=counts.size).astype(np.intp)
+
+    minimum_lengths = _group_lengths(minimums)
+    sizes = minimum_lengths + 2 + groups * widths + exception_counts + high_sizes
+    out, base = _with_header(array.size, int(sizes.sum()))
+    block_starts = base + np.cumsum(sizes) - sizes
+    _scatter_uleb128(out, block_starts, minimums, minimum_lengths)
+    out[block_starts + minimum_lengths] = widths
+    out[block_starts + minimum_lengths + 1] = exception_counts
+    data_starts = block_starts + minimum_lengths + 2
+    _write_groups(out, data_starts, groups, widths, deltas)
+
+    position_starts = data_starts + groups * widths
+    out[np.repeat(position_starts, exception_counts) + _within(exception_counts)] = \
+        exceptions - (np.cumsum(counts) - counts)[exception_blocks]
+    high_offsets = np.cumsum(high_lengths) - high_lengths
+    high_offsets -= (np.cumsum(high_sizes) - high_sizes)[exception_blocks]
+    _scatter_uleb128(out, (position_starts + exception_counts)[exception_blocks] + high_offsets, high, high_lengths)
+    return out
+
+
+def _decode_patched_frame_of_reference(data: ArrayLike) -> NDArray[np.uint64]:
+    data = _as_uint8(data)
+    buf = memoryview(data)
+    count, offset = UnsignedLEB128.decode_from(buf)
+    counts = _block_counts(count)
+    groups = (counts + 7) // 8
+    minimums = np.empty(counts.size, dtype=np.uint64)
+    widths = np.empty(counts.size, dtype=np.intp)
+    exception_counts = np.empty(counts.size, dtype=np.intp)
+    data_starts = np.empty(counts.size, dtype=np.intp)
+    high_bounds = np.empty((counts.size, 2), dtype=np.intp)
+    for block, group_count in enumerate(groups.tolist()):
+        minimums[block], offset = UnsignedLEB128.decode_from(buf, offset)
+        widths[block] = width = buf[offset]
+        exception_counts[block] = exception_count = buf[offset + 1]
+        data_starts[block] = offset + 2
+        offset += 2 + group_count * width + exception_count
+        high_bounds[block, 0] = offset
+        offset = UnsignedLEB128.skip(buf, exception_count, offset)
+        high_bounds[block, 1] = offset
+
+    values = _read_groups(data, data_starts, groups, widths)[:count] + np.repeat(minimums, counts)
+    positions = data[np.repeat(data_starts + groups * widths, exception_counts) + _within(exception_counts)]
+    high_lengths = high_bounds[:, 1] - high_bounds[:, 0]
+    high = _decode_uleb128(data[np.repeat(high_bounds[:, 0], high_lengths) + _within(high_lengths)])
+    exception_blocks = np.repeat(np.arange(counts.size), exception_counts)
+    values[(np.cumsum(counts) - counts)[exception_blocks] + positions] += \
+        high << widths[exception_blocks].astype(np.uint64)
+    return values
+
+
+def _encode_simple8b(values: ArrayLike) -> NDArray[np.uint8]:
+    array = _as_unsigned(values)
+    if array.size and array.max() >> np.uint64(60):
+        raise OverflowError("values must be below 2**60 for Simple-8b")
+    widths = _bit_lengths(array)
+    index = np.arange(array.size)
+    # fits[selector, i]: the values from i on fill a word of that selector
+    fits = np.empty((16, array.size), dtype=bool)
+    for selector, (capacity, bits) in enumerate(_SIMPLE8B_SELECTORS):
+        too_wide = np.where(widths > bits, index, array.size)
+        next_too_wide = np.minimum.accumulate(too_wide[::-1])[::-1]
+        fits[selector] = next_too_wide >= np.minimum(index + capacity, array.size)
+    choice = fits.argmax(axis=0) if array.size else np.empty(0, dtype=np.intp)
+
+    # Words are chosen greedily from the start, a serial walk over words only
+    steps = _SIMPLE8B_CAPACITY[choice].tolist()
+    word_starts = []
+    position = 0
+    while position < array.size:
+        word_starts.append(position)
+        position += steps[position]
+    starts = np.array(word_starts, dtype=np.intp)
+    selectors = choice[starts]
+
+    words = selectors.astype(np.uint64)
+    padded = np.zeros(array.size + 240, dtype=np.uint64)
+    padded[:array.size] = array
+    for selector in np.unique(selectors).tolist():
+        bits = int(_SIMPLE8B_BITS[selector])
+        if bits:
+            selected = selectors == selector
+            shifts = (4 + np.arange(_SIMPLE8B_CAPACITY[selector]) * bits).astype(np.uint64)
+            chunk = padded[starts[selected, None] + np.arange(_SIMPLE8B_CAPACITY[selector])]
+            words[selected] |= np.bitwise_or.reduce(chunk << shifts, axis=1)
+
+    out, base = _with_header(array.size, words.size * 8)
+    out[base:] = words.astype("<u8").view(np.uint8)
+    return out
+
+
+def _decode_simple8b(data: ArrayLike) -> NDArray[np.uint64]:
+    data = _as_uint8(data)
+    count, offset = UnsignedLEB128.decode_from(memoryview(data))
+    words = np.frombuffer(data, dtype="<u8", count=(data.size - offset) // 8, offset=offset)
+    capacities = _SIMPLE8B_CAPACITY[(words & 15).astype(np.intp)]
+    ends = np.cumsum(capacities)
+    word_count = int(np.searchsorted(ends, count)) + 1 if count else 0
+    if word_count > words.size:
+        raise IndexError("truncated Simple-8b")
+    words = words[:word_count].astype(np.uint64)
+    starts = ends[:word_count] - capacities[:word_count]
+    selectors = (words & np.uint64(15)).astype(np.intp)
+
+    out = np.zeros(count + 240, dtype=np.uint64)
+    for selector in np.unique(selectors).tolist():
+        bits = int(_SIMPLE8B_BITS[selector])
+        if bits:
+            selected = selectors == selector
+            capacity = _SIMPLE8B_CAPACITY[selector]
+            shifts = (4 + np.arange(capacity) * bits).astype(np.uint64)
+            out[starts[selected, None] + np.arange(capacity)] = \
+                (words[selected, None] >> shifts) & np.uint64((1 << bits) - 1)
+    return out[:count]
+
+
+_ENCODERS: Dict[type, Callable[[ArrayLike], NDArray[np.uint8]]] = {
+    PrefixVarint: _encode_prefix_varint,
+    UnsignedLEB128: _encode_uleb128,
+    SignedLEB128: _encode_sleb128,
+    VariableLengthQuantity: _encode_vlq,
+    SQLite4VLI: _encode_sqlite4_vli,
+    LeSQLite: _encode_le_sqlite,
+    LeSQLite2: _encode_le_sqlite2,
+    UnrealEngineSingedVLQ: _encode_unreal_vlq,
+    GroupVarint: _encode_group_varint,
+    StreamVByte: _encode_stream_vbyte,
+    FrameOfReference: _encode_frame_of_reference,
+    PatchedFrameOfReference: _encode_patched_frame_of_reference,
+    Simple8b: _encode_simple8b,
+}
+
+_DECODERS: Dict[type, Callable[[ArrayLike], NDArray]] = {
+    PrefixVarint: _decode_prefix_varint,
+    UnsignedLEB128: _decode_uleb128,
+    SignedLEB128: _decode_sleb128,
+    VariableLengthQuantity: _decode_vlq,
+    SQLite4VLI: _decode_sqlite4_vli,
+    LeSQLite: _decode_le_sqlite,
+    LeSQLite2: _decode_le_sqlite2,
+    UnrealEngineSingedVLQ: _decode_unreal_vlq,
+    GroupVarint: _decode_group_varint,
+    StreamVByte: _decode_stream_vbyte,
+    FrameOfReference: _decode_frame_of_reference,
+    PatchedFrameOfReference: _decode_patched_frame_of_reference,
+    Simple8b: _decode_simple8b,
+}
+
+
+def _zigzag_encode(values: ArrayLike) -> NDArray[np.uint64]:
+    array = _as_signed(values)
+    return ((array << 1) ^ (array >> 63)).view(np.uint64)
+
+
+def _zigzag_decode(values: NDArray[np.uint64]) -> NDArray[np.int64]:
+    return ((values >> np.uint64(1)) ^ (np.uint64(0) - (values & np.uint64(1)))).view(np.int64)
+
+
+def _register_zigzag(codec: type[ZigZag]) -> None:
+    """Vectorize a ZigZag adapter on top of the vectorized wrapped codec."""
+    encode = _ENCODERS.get(codec.codec)
+    decode = _DECODERS.get(codec.codec)
+    if encode is None or decode is None:
+        return
+    _ENCODERS[codec] = lambda values: encode(_zigzag_encode(values))
+    _DECODERS[codec] = lambda data: _zigzag_decode(decode(data))
+
+
+for _zigzag_codec in (ZigZagPrefixVarint,
+                      ZigZagUnsignedLEB128,
+                      ZigZagVariableLengthQuantity,
+                      ZigZagSQLite4VLI,
+                      ZigZagLeSQLite,
+                      ZigZagLeSQLite2):
+    _register_zigzag(_zigzag_codec)
+
+
+def supports(codec: type[Base] | type[BlockCodec]) -> bool:
+    """Return True if `codec` has a vectorized implementation."""
+    return codec in _ENCODERS
+
+
+def encode_array(codec: type[Base] | type[BlockCodec], values: ArrayLike) -> NDArray[np.uint8]:
+    """
+    Encode a column of integers with `codec`.
+
+    Returns a uint8 array holding the same bytes as `codec.encode_many(values)`.
+    """
+    try:
+        encoder = _ENCODERS[codec]
+    except KeyError:
+        raise TypeError(f"{codec.__name__} has no vectorized encoder") from None
+    return encoder(values)
+
+
+def decode_array(codec: type[Base] | type[BlockCodec], data: ArrayLike) -> NDArray:
+    """
+    Decode every integer encoded with `codec` in `data`.
+
+    `data` may be any bytes-like object or a uint8 array. Returns a uint64 array
+    for unsigned codecs, an int64 array for signed ones and a uint32 array for
+    GroupVarint and StreamVByte.
+    """
+    try:
+        decoder = _DECODERS[codec]
+    except KeyError:
+        raise TypeError(f"{codec.__name__} has no vectorized decoder") from None
+    return decoder(data)
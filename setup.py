@@ -1,11 +1,11 @@
 import os
 
 import setuptools
-from mypyc.build import mypycify
 
 __version__ = "1.0.1"
 
 BUILD_DIR = "./PyVarInt"
+PURE_PYTHON_ENV = "PYVARINT_PURE_PYTHON"
 
 
 def read(fname):
@@ -13,6 +13,21 @@ def read(fname):
         return file.read()
 
 
+def ext_modules():
+    """Compile the codecs with mypyc when it is available, otherwise install the pure-Python package."""
+    if os.environ.get(PURE_PYTHON_ENV, "") not in ("", "0"):
+        return []
+    try:
+        from mypyc.build import mypycify
+    except ImportError:
+        print("mypyc is not available, installing the pure-Python implementation")
+        return []
+    return mypycify(["--disallow-untyped-defs",
+        os.path.join(BUILD_DIR, "algorithms.py"),
+    ],
+        opt_level="3", debug_level="1")
+
+
 setuptools.setup(
     name="PyVarInt",
     packages=["PyVarInt"],
@@ -24,9 +39,7 @@ setuptools.setup(
     long_description=read("README.md"),
     long_description_content_type="text/markdown",
     license="License :: OSI Approved :: Apache Software License 2.0",
-    ext_modules=mypycify(["--disallow-untyped-defs",
-        os.path.join(BUILD_DIR, "__init__.py"),
-        os.path.join(BUILD_DIR, "algorithms.py"),
-    ],
-        opt_level="3", debug_level="1")
+    classifiers=["Programming Language :: Python :: Free Threading :: 2 - Beta"],
+    extras_require={"numpy": ["numpy"]},
+    ext_modules=ext_modules()
 )
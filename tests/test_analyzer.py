@@ -0,0 +1,68 @@
+import pytest
+
+from PyVarInt.algorithms import (PrefixVarint,
+                                 UnsignedLEB128,
+                                 SignedLEB128,
+                                 SQLite4VLI,
+                                 LeSQLite,
+                                 UnrealEngineSingedVLQ)
+from PyVarInt.analyzer import CODECS, analyze, best_codec, decode_costs, encoded_sizes
+
+VALUES = [0, 5, 127, 128, 184, 185, 240, 241, 2287, 16559, 16560, 70000, 2 ** 32, 2 ** 60, 2 ** 64 - 1]
+SIGNED_VALUES = [0, -1, 63, -64, 64, -65, -8192, 8191, 1048576, -(2 ** 35 - 1), 2 ** 35 - 1]
+
+
+def test_encoded_sizes():
+    sizes = encoded_sizes(VALUES)
+    for codec in CODECS:
+        if codec.max_value is not None and codec.max_value < max(VALUES):
+            assert sizes[codec] is None
+        else:
+            assert sizes[codec] == len(codec.encode_many(VALUES))
+    assert sizes[UnrealEngineSingedVLQ] is None
+
+
+def test_encoded_sizes_negative():
+    sizes = encoded_sizes(SIGNED_VALUES)
+    assert sizes[UnsignedLEB128] is None
+    assert sizes[PrefixVarint] is None
+    assert sizes[SignedLEB128] == len(SignedLEB128.encode_many(SIGNED_VALUES))
+    assert sizes[UnrealEngineSingedVLQ] == len(UnrealEngineSingedVLQ.encode_many(SIGNED_VALUES))
+
+
+def test_encoded_sizes_vectorized():
+    np = pytest.importorskip("numpy")
+    for values, dtype in [(VALUES, np.uint64), (SIGNED_VALUES, np.int64)]:
+        assert encoded_sizes(np.array(values, dtype=dtype)) == encoded_sizes(values)
+    rng = np.random.default_rng(3)
+    column = rng.integers(-2 ** 34, 2 ** 34, size=5000) >> rng.integers(0, 34, size=5000)
+    assert encoded_sizes(column) == encoded_sizes(column.tolist())
+
+
+def test_best_codec():
+    # SQLite4 VLI fits 0-240 into a single byte, LeSQLite only 0-184, LEB128 only 0-127
+    assert best_codec([200] * 10 + [5] * 10) is SQLite4VLI
+    assert best_codec([-5, 7]) in (SignedLEB128, UnrealEngineSingedVLQ)
+    with pytest.raises(ValueError):
+        best_codec([-1], codecs=[UnsignedLEB128, SQLite4VLI])
+
+
+def test_decode_costs_tradeoff():
+    report = {
+        "backends": ["python"],
+        "results": [
+            {"backend": "python", "codec": "SQLite4VLI", "operation": "decode_bytes", "seconds": 3.0, "values": 1e9},
+            {"backend": "python", "codec": "LeSQLite", "operation": "decode_bytes", "seconds": 1.0, "values": 1e9},
+            {"backend": "python", "codec": "LeSQLite", "operation": "encode", "seconds": 9.0, "values": 1e9},
+        ],
+    }
+    costs = decode_costs(report)
+    assert costs == {"SQLite4VLI": pytest.approx(3.0), "LeSQLite": pytest.approx(1.0)}
+
+    values = [200] * 10 + [5] * 10
+    codecs = [SQLite4VLI, LeSQLite]
+    assert [estimate.codec for estimate in analyze(values, codecs, costs)] == [SQLite4VLI, LeSQLite]
+    assert best_codec(values, codecs, costs) is SQLite4VLI
+    # LeSQLite takes 0.5 more bytes per value but saves 2 ns per value
+    assert best_codec(values, codecs, costs, ns_per_byte=8.0) is SQLite4VLI
+    assert best_codec(values, codecs, costs, ns_per_byte=2.0) is LeSQLite
@@ -0,0 +1,61 @@
+import os
+import shutil
+import subprocess
+import sys
+from importlib.machinery import EXTENSION_SUFFIXES
+
+import pytest
+
+import PyVarInt
+from PyVarInt.algorithms import UnsignedLEB128, SignedLEB128, VariableLengthQuantity
+
+PACKAGE_DIR = os.path.dirname(PyVarInt.__file__)
+
+
+def _import_backend(cwd, **env):
+    code = "import PyVarInt; print(PyVarInt.backend, PyVarInt.algorithms.__file__, PyVarInt.UnsignedLEB128.encode(300))"
+    result = subprocess.run([sys.executable, "-c", code], cwd=cwd, capture_output=True, text=True,
+                            env={**os.environ, "PYTHONPATH": str(cwd), **env}, check=True)
+    return result.stdout.split(" ", 2), result.stderr
+
+
+def test_backend():
+    assert PyVarInt.backend in ("mypyc", "python")
+    assert (PyVarInt.backend == "mypyc") == PyVarInt.is_compiled(PyVarInt.algorithms)
+    assert PyVarInt.algorithms.UnsignedLEB128 is UnsignedLEB128
+
+
+@pytest.fixture
+def package_copy(tmp_path):
+    shutil.copytree(PACKAGE_DIR, tmp_path / "PyVarInt", ignore=shutil.ignore_patterns("__pycache__"))
+    return tmp_path
+
+
+def test_force_pure_python(package_copy):
+    (backend, path, encoded), _ = _import_backend(package_copy, PYVARINT_PURE_PYTHON="1")
+    assert backend == "python"
+    assert path.endswith("algorithms.py")
+    assert encoded.strip() == r"b'\xac\x02'"
+
+
+def test_broken_extension_falls_back(package_copy):
+    broken = package_copy / "PyVarInt" / f"algorithms{EXTENSION_SUFFIXES[0]}"
+    broken.write_bytes(b"not a shared object")
+    (backend, path, _), stderr = _import_backend(package_copy)
+    assert backend == "python"
+    assert path.endswith("algorithms.py")
+    assert "RuntimeWarning" in stderr
+
+
+@pytest.mark.parametrize("codec", [UnsignedLEB128, SignedLEB128, VariableLengthQuantity])
+def test_native_width_boundaries(codec):
+    # bytes input takes the fixed-width path up to 63 bits and falls back above
+    values = [bound + delta for bits in (6, 7, 48, 49, 55, 56, 62, 63, 64)
+              for bound in (2 ** bits, -2 ** bits) for delta in (-1, 0, 1)]
+    low = -2 ** 63 if codec.min_value is None else codec.min_value
+    values = [value for value in values if low <= value < 2 ** 64]
+    encoded = codec.encode_many(values)
+    assert codec.decode_many(encoded) == values
+    assert codec.decode_many(bytearray(encoded)) == values
+    with pytest.raises(IndexError):
+        codec.decode_from(codec.encode(2 ** 62)[:-1])
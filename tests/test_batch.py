@@ -0,0 +1,246 @@
+import asyncio
+import mmap
+from array import array
+from io import BytesIO
+
+import pytest
+
+from PyVarInt.algorithms import (PrefixVarint,
+                                 UnsignedLEB128,
+                                 SignedLEB128,
+                                 VariableLengthQuantity,
+                                 SQLite4VLI,
+                                 LeSQLite,
+                                 LeSQLite2,
+                                 UnrealEngineSingedVLQ)
+
+UNSIGNED_VALUES = [0, 1, 127, 128, 184, 185, 240, 241, 2287, 2288, 16561, 16562, 65535,
+                   524287, 524288, 16777215, 4294967295, 281474976710655,
+                   72057594037927935, 72057594037927936, 2 ** 64 - 1]
+SIGNED_VALUES = [0, 1, -1, 63, -63, 64, -64, 8191, -8192, 1048576, -1048576,
+                 2147483647, -2147483648, 34359738367, -34359738367]
+
+CODECS = [
+    [PrefixVarint, UNSIGNED_VALUES],
+    [UnsignedLEB128, UNSIGNED_VALUES],
+    [SignedLEB128, SIGNED_VALUES],
+    [VariableLengthQuantity, UNSIGNED_VALUES],
+    [SQLite4VLI, UNSIGNED_VALUES],
+    [LeSQLite, UNSIGNED_VALUES],
+    [LeSQLite2, UNSIGNED_VALUES],
+    [UnrealEngineSingedVLQ, SIGNED_VALUES],
+]
+
+
+@pytest.mark.parametrize("codec,values", CODECS)
+def test_encode_many(codec, values):
+    assert codec.encode_many(values) == b"".join(codec.encode(value) for value in values)
+    assert codec.encode_many(iter(values)) == codec.encode_many(values)
+    assert codec.encode_many([]) == b""
+
+
+@pytest.mark.parametrize("codec,values", CODECS)
+def test_decode_many(codec, values):
+    encoded = codec.encode_many(values)
+    assert codec.decode_many(encoded) == values
+    assert codec.decode_many(BytesIO(encoded)) == values
+    assert codec.decode_many(encoded, count=3) == values[:3]
+    assert codec.decode_many(b"") == []
+
+
+@pytest.mark.parametrize("codec,values", CODECS)
+def test_decode_many_as_array(codec, values):
+    encoded = codec.encode_many(values)
+    decoded = codec.decode_many(encoded, as_array=True)
+    assert isinstance(decoded, array)
+    assert decoded.typecode == codec.array_typecode
+    assert decoded.tolist() == values
+
+
+@pytest.mark.parametrize("codec,values", CODECS)
+def test_decode_many_buffer_types(codec, values, tmp_path):
+    encoded = codec.encode_many(values)
+    assert codec.decode_many(bytearray(encoded)) == values
+    assert codec.decode_many(memoryview(encoded)) == values
+
+    path = tmp_path / "values.bin"
+    path.write_bytes(encoded)
+    with open(path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        assert codec.decode_many(mapped) == values
+
+
+@pytest.mark.parametrize("codec,values", CODECS)
+def test_decode_from_truncated(codec, values):
+    encoded = codec.encode(values[-1])
+    with pytest.raises(IndexError):
+        codec.decode_from(encoded[:-1])
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 4096])
+@pytest.mark.parametrize("codec,values", CODECS)
+def test_iter_decode(codec, values, chunk_size):
+    stream = BytesIO(codec.encode_many(values))
+    assert list(codec.iter_decode(stream, chunk_size=chunk_size)) == values
+    assert list(codec.iter_decode(BytesIO(b""))) == []
+
+
+@pytest.mark.parametrize("codec,values", CODECS)
+def test_iter_decode_truncated(codec, values):
+    stream = BytesIO(codec.encode_many(values)[:-1])
+    decoded = []
+    with pytest.raises(EOFError):
+        for value in codec.iter_decode(stream, chunk_size=5):
+            decoded.append(value)
+    assert decoded == values[:-1]
+
+
+@pytest.mark.parametrize("codec,values", CODECS)
+def test_encoded_length(codec, values):
+    for value in values:
+        assert codec.encoded_length(value) == len(codec.encode(value))
+
+
+@pytest.mark.parametrize("codec,values", CODECS)
+def test_peek_length(codec, values):
+    if not codec.has_length_prefix:
+        with pytest.raises(NotImplementedError):
+            codec.peek_length(0)
+        return
+    for first_byte in range(256):
+        buffer = bytes([first_byte]) + bytes(8)
+        assert codec.peek_length(first_byte) == codec.decode_from(buffer)[1]
+
+
+@pytest.mark.parametrize("codec,values", CODECS)
+def test_skip(codec, values):
+    long_values = values * 500
+    encoded = codec.encode_many(long_values)
+    for n in [0, 1, len(values), len(long_values) // 2 + 3, len(long_values)]:
+        offset = codec.skip(encoded, n)
+        assert offset == len(codec.encode_many(long_values[:n]))
+        assert codec.skip(memoryview(encoded), n) == offset
+    assert codec.skip(encoded, 2, offset=len(codec.encode(values[0]))) == \
+        len(codec.encode_many(values[:3]))
+    with pytest.raises(IndexError):
+        codec.skip(encoded[:-1], len(long_values))
+
+
+def _stream_reader(data):
+    reader = asyncio.StreamReader()
+    reader.feed_data(data)
+    reader.feed_eof()
+    return reader
+
+
+@pytest.mark.parametrize("codec,values", CODECS)
+def test_decode_async(codec, values):
+    async def _decode():
+        reader = _stream_reader(codec.encode_many(values) + b"tail")
+        decoded = [await codec.decode_async(reader) for _ in values]
+        # Nothing past the last integer is consumed
+        assert await reader.read() == b"tail"
+        return decoded
+
+    assert asyncio.run(_decode()) == values
+
+
+@pytest.mark.parametrize("codec,values", CODECS)
+def test_decode_async_truncated(codec, values):
+    async def _decode():
+        await codec.decode_async(_stream_reader(codec.encode(values[-1])[:-1]))
+
+    with pytest.raises(asyncio.IncompleteReadError):
+        asyncio.run(_decode())
+
+
+@pytest.mark.parametrize("codec", [UnsignedLEB128, SignedLEB128, VariableLengthQuantity])
+def test_decode_async_endless_continuation(codec):
+    async def _decode():
+        reader = _stream_reader(b"\xff" * 1000)
+        with pytest.raises(ValueError):
+            await codec.decode_async(reader)
+        # The integer is rejected once it is longer than a 64-bit one
+        return len(await reader.read())
+
+    assert asyncio.run(_decode()) == 1000 - 10
+
+
+def test_decode_async_max_length():
+    async def _decode(codec, value, max_length):
+        return await codec.decode_async(_stream_reader(codec.encode(value)), max_length=max_length)
+
+    assert asyncio.run(_decode(UnsignedLEB128, 2 ** 200, 29)) == 2 ** 200
+    with pytest.raises(ValueError):
+        asyncio.run(_decode(UnsignedLEB128, 2 ** 200, 28))
+    with pytest.raises(ValueError):
+        asyncio.run(_decode(PrefixVarint, 2 ** 40, 4))
+    assert asyncio.run(_decode(UnrealEngineSingedVLQ, -(2 ** 35 - 1), None)) == -(2 ** 35 - 1)
+
+
+@pytest.mark.parametrize("codec,values", CODECS)
+def test_write_many_async(codec, values):
+    async def _roundtrip():
+        received = asyncio.get_running_loop().create_future()
+
+        async def _handle(reader, writer):
+            received.set_result(await reader.read())
+            writer.close()
+
+        server = await asyncio.start_server(_handle, "127.0.0.1", 0)
+        async with server:
+            _, writer = await asyncio.open_connection(*server.sockets[0].getsockname()[:2])
+            await codec.write_many_async(writer, values)
+            writer.close()
+            return await received
+
+    assert asyncio.run(_roundtrip()) == codec.encode_many(values)
+
+
+@pytest.mark.parametrize("codec,values", CODECS)
+def test_encode_into(codec, values):
+    size = sum(map(codec.encoded_length, values))
+    buf = bytearray(size + 3)
+    offset = 3
+    for value in values:
+        offset = codec.encode_into(value, buf, offset)
+    assert offset == len(buf)
+    assert buf[3:] == codec.encode_many(values)
+
+    view = memoryview(bytearray(size))
+    offset = 0
+    for value in values:
+        offset = codec.encode_into(value, view, offset)
+    assert view.tobytes() == codec.encode_many(values)
+
+
+@pytest.mark.parametrize("codec,values", CODECS)
+def test_encode_into_mmap(codec, values):
+    encoded = codec.encode_many(values)
+    with mmap.mmap(-1, len(encoded)) as mapped:
+        offset = 0
+        for value in values:
+            offset = codec.encode_into(value, mapped, offset)
+        assert mapped[:] == encoded
+
+
+@pytest.mark.parametrize("codec,values", CODECS)
+def test_encode_into_too_small(codec, values):
+    value = values[-1]
+    buf = bytearray(b"\xaa" * (codec.encoded_length(value) + 1))
+    with pytest.raises(IndexError):
+        codec.encode_into(value, buf, 2)
+    assert buf == bytearray(b"\xaa" * len(buf))
+
+
+@pytest.mark.parametrize("codec,values", CODECS)
+def test_encode_into_boundaries(codec, values):
+    candidates = {boundary + delta for bits in range(65) for boundary in (2 ** bits, -2 ** bits)
+                  for delta in (-1, 0, 1)}
+    candidates.update(range(-300, 70000, 7))
+    for value in sorted(candidates):
+        if ((codec.min_value is not None and value < codec.min_value)
+                or (codec.max_value is not None and value > codec.max_value)):
+            continue
+        buf = bytearray(codec.encoded_length(value))
+        assert codec.encode_into(value, buf) == len(buf)
+        assert buf == codec.encode(value), value
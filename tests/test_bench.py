@@ -0,0 +1,62 @@
+import json
+
+import pytest
+
+from PyVarInt.algorithms import encode_cache_info, set_encode_cache
+from PyVarInt.bench import CODEC_NAMES, DISTRIBUTIONS, main, run
+
+
+def test_bench_report(tmp_path):
+    output = tmp_path / "bench.json"
+    main(["--size", "50", "--repeat", "1", "--output", str(output)])
+    report = json.loads(output.read_text())
+
+    results = report["results"]
+    assert {result["codec"] for result in results} == set(CODEC_NAMES)
+    assert {result["distribution"] for result in results} == set(DISTRIBUTIONS)
+    assert {result["operation"] for result in results} == {"encode", "encode_scalar", "decode_bytes",
+                                                              "decode_bytesio", "decode_file"}
+    assert set(report["backends"]) == {result["backend"] for result in results}
+
+    # unsigned codecs are never run on negative values
+    assert not [result for result in results
+                if result["distribution"] == "negative" and result["codec"] == "UnsignedLEB128"]
+    assert all(result["bytes_per_value"] >= 1 for result in results)
+
+
+def test_bench_filters(capsys):
+    main(["--size", "10", "--repeat", "1", "--codec", "LeSQLite", "--distribution", "zipfian"])
+    report = json.loads(capsys.readouterr().out)
+    assert {(result["codec"], result["distribution"]) for result in report["results"]} == {("LeSQLite", "zipfian")}
+
+
+def test_bench_cache_settings(capsys):
+    try:
+        main(["--size", "10", "--repeat", "1", "--codec", "SQLite4VLI", "--distribution", "uniform_small",
+              "--table-size", "0", "--lru-size", "16"])
+    finally:
+        set_encode_cache()
+    report = json.loads(capsys.readouterr().out)
+    assert (report["table_size"], report["lru_size"]) == (0, 16)
+
+
+@pytest.mark.parametrize("argument", ["--size", "--repeat"])
+@pytest.mark.parametrize("value", ["0", "-3"])
+def test_bench_rejects_non_positive_counts(capsys, argument, value):
+    with pytest.raises(SystemExit):
+        main([argument, value])
+    assert "must be a positive integer" in capsys.readouterr().err
+    with pytest.raises(ValueError):
+        run(size=0)
+
+
+def test_bench_restores_cache_settings():
+    set_encode_cache(table_size=64, lru_size=8)
+    try:
+        report = run(size=10, repeat=1, codecs=["PrefixVarint"], distributions=["uniform_small"],
+                     table_size=0, lru_size=16)
+        assert (report["table_size"], report["lru_size"]) == (0, 16)
+        info = encode_cache_info()
+        assert (info["table_size"], info["lru_size"]) == (64, 8)
+    finally:
+        set_encode_cache()
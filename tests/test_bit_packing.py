@@ -0,0 +1,102 @@
+from io import BytesIO
+
+import pytest
+
+from PyVarInt.algorithms import FrameOfReference, PatchedFrameOfReference, Simple8b, UnsignedLEB128
+from PyVarInt.delta import DeltaCodec
+
+VALUES = ([1700000000 + i * 60 + i % 7 for i in range(300)]
+          + [0] * 250 + [1, 2, 3] + [2 ** 59 + 5, 17] + [i % 16 for i in range(200)])
+CODECS = [FrameOfReference, PatchedFrameOfReference, Simple8b]
+
+
+@pytest.mark.parametrize("codec", CODECS)
+@pytest.mark.parametrize("count", [0, 1, 7, 8, 9, 128, 129, 300, len(VALUES)])
+def test_roundtrip(codec, count):
+    encoded = codec.encode_many(VALUES[:count])
+    assert codec.decode_many(encoded) == VALUES[:count]
+    assert codec.decode_many(encoded, as_array=True).tolist() == VALUES[:count]
+
+
+@pytest.mark.parametrize("codec,values,expected", [
+    # minimum 100 and width 3, then the differences 0..7 on 3 bits each
+    [FrameOfReference, range(100, 108), b"\x08" b"\x64\x03" b"\x88\xc6\xfa"],
+    # width 0 and one exception, at position 7, whose high bits are 300
+    [PatchedFrameOfReference, [100] * 7 + [400], b"\x08" b"\x64\x00\x01" b"\x07" b"\xac\x02"],
+    # selector 4: up to 20 values of 3 bits
+    [Simple8b, range(8), b"\x08" b"\x84\x68\xac\x0f\x00\x00\x00\x00"],
+])
+def test_layout(codec, values, expected):
+    assert codec.encode_many(values) == expected
+
+
+def test_patched_exceptions_are_smaller():
+    values = [i % 8 for i in range(1000)]
+    values[::97] = [2 ** 40] * len(values[::97])
+    patched = PatchedFrameOfReference.encode_many(values)
+    assert len(patched) * 3 < len(FrameOfReference.encode_many(values))
+    assert PatchedFrameOfReference.decode_many(patched) == values
+
+
+def test_simple8b_zero_runs():
+    encoded = Simple8b.encode_many([0] * 240 + [0] * 120 + [1])
+    assert len(encoded) == 2 + 3 * 8
+    assert [word[0] & 15 for word in (encoded[2:10], encoded[10:18])] == [0, 1]
+
+
+@pytest.mark.parametrize("codec", CODECS)
+def test_decode_file_object(codec):
+    assert codec.decode_many(BytesIO(codec.encode_many(VALUES))) == VALUES
+
+
+@pytest.mark.parametrize("codec", CODECS)
+def test_truncated(codec):
+    encoded = codec.encode_many(VALUES[:150])
+    for end in range(1, len(encoded)):
+        with pytest.raises(IndexError):
+            codec.decode_many(encoded[:end])
+
+
+@pytest.mark.parametrize("codec,value", [
+    [FrameOfReference, -1],
+    [FrameOfReference, 2 ** 64],
+    [PatchedFrameOfReference, 2 ** 64],
+    [Simple8b, -1],
+    [Simple8b, 2 ** 60],
+])
+def test_out_of_range(codec, value):
+    with pytest.raises(OverflowError):
+        codec.encode_many([1, value])
+
+
+@pytest.mark.parametrize("codec", CODECS)
+@pytest.mark.parametrize("block_size", [None, 100])
+def test_delta(codec, block_size):
+    timestamps = [1700000000000 + i * 1000 + i % 13 for i in range(1000)]
+    delta = DeltaCodec(codec, block_size=block_size)
+    encoded = delta.encode_many(timestamps)
+    if block_size is None:
+        assert len(encoded) < len(DeltaCodec(UnsignedLEB128).encode_many(timestamps))
+    assert delta.decode_many(encoded) == timestamps
+    assert delta.decode_many(encoded, count=10) == timestamps[:10]
+    assert list(delta.iter_decode(BytesIO(encoded))) == timestamps
+
+
+@pytest.mark.parametrize("codec", CODECS)
+@pytest.mark.parametrize("count", [0, 1, 8, 129, 5000])
+def test_vectorized(codec, count):
+    np = pytest.importorskip("numpy")
+    from PyVarInt.vectorized import decode_array, encode_array
+
+    rng = np.random.default_rng(count)
+    limit = 2 ** 60 if codec is Simple8b else 2 ** 64
+    values = rng.integers(0, limit, count, dtype=np.uint64) >> rng.integers(0, 64, count, dtype=np.uint64)
+    values[rng.random(count) < 0.3] = 0
+    encoded = encode_array(codec, values)
+    assert encoded.tobytes() == codec.encode_many(values.tolist())
+    decoded = decode_array(codec, encoded)
+    assert decoded.dtype == np.uint64
+    assert decoded.tolist() == values.tolist()
+    if count:
+        with pytest.raises(IndexError):
+            decode_array(codec, encoded[:-1])
@@ -0,0 +1,107 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import pytest
+
+from PyVarInt.algorithms import FrameOfReference, PrefixVarint, SignedLEB128, UnsignedLEB128, ZigZagLeSQLite
+from PyVarInt.columnar import ColumnFileError, ColumnReader, ColumnWriter
+
+TIMESTAMPS = [1700000000 + i * 10 + i % 3 for i in range(10000)]
+SIGNED_VALUES = [(i * 7919) % 2001 - 1000 for i in range(3000)]
+
+
+def write_column(path, values, codec=UnsignedLEB128, block_size=1000):
+    with ColumnWriter(path, codec, block_size=block_size) as writer:
+        for start in range(0, len(values), 777):
+            writer.write(values[start:start + 777])
+    return path
+
+
+@pytest.mark.parametrize("codec,values", [
+    [UnsignedLEB128, TIMESTAMPS],
+    [PrefixVarint, TIMESTAMPS],
+    [FrameOfReference, TIMESTAMPS],
+    [SignedLEB128, SIGNED_VALUES],
+    [ZigZagLeSQLite, SIGNED_VALUES],
+])
+def test_roundtrip(tmp_path, codec, values):
+    path = write_column(tmp_path / "column.pvc", values, codec)
+    with ColumnReader(path) as reader:
+        assert len(reader) == len(values)
+        assert [block.value_count for block in reader.blocks] == [1000] * (len(values) // 1000)
+        assert reader.minimum == min(values)
+        assert reader.maximum == max(values)
+        assert reader.read() == values
+        assert reader.read(as_array=True).tolist() == values
+        assert reader.read_block(1) == values[1000:2000]
+        assert reader.blocks[2].first_row == 2000
+
+
+def test_range_scan_skips_blocks(tmp_path):
+    path = write_column(tmp_path / "column.pvc", TIMESTAMPS)
+    with ColumnReader(path) as reader:
+        low, high = TIMESTAMPS[2500], TIMESTAMPS[3100]
+        assert reader.matching_blocks(low, high) == [2, 3]
+        assert reader.scan(low, high) == [value for value in TIMESTAMPS if low <= value <= high]
+        assert reader.scan(high=TIMESTAMPS[5]) == TIMESTAMPS[:6]
+        assert reader.scan(low=TIMESTAMPS[-1] + 1) == []
+        blocks = list(reader.iter_blocks(low=TIMESTAMPS[-1]))
+        assert [(block.first_row, values[-1]) for block, values in blocks] == [(9000, TIMESTAMPS[-1])]
+
+
+def test_mixed_codecs(tmp_path):
+    path = tmp_path / "column.pvc"
+    with ColumnWriter(path, UnsignedLEB128, block_size=4) as writer:
+        writer.write([1, 2, 3])
+        writer.write_block([-5, 5], codec=SignedLEB128)
+        writer.write([2 ** 40] * 5)
+    with ColumnReader(path) as reader:
+        assert [(block.codec, block.value_count) for block in reader.blocks] == \
+            [(UnsignedLEB128, 3), (SignedLEB128, 2), (UnsignedLEB128, 4), (UnsignedLEB128, 1)]
+        assert reader.read() == [1, 2, 3, -5, 5] + [2 ** 40] * 5
+        assert reader.read(as_array=True).tolist() == [1, 2, 3, -5, 5] + [2 ** 40] * 5
+        assert reader.scan(-10, 0) == [-5]
+
+
+def test_mixed_signedness_as_array(tmp_path):
+    path = tmp_path / "column.pvc"
+    with ColumnWriter(path, UnsignedLEB128) as writer:
+        writer.write_block([0, 2 ** 64 - 1])
+        writer.write_block([5, 7], codec=SignedLEB128)
+        writer.write_block([-3, 2], codec=SignedLEB128)
+    with ColumnReader(path) as reader:
+        assert reader.read() == [0, 2 ** 64 - 1, 5, 7, -3, 2]
+        with pytest.raises(ValueError, match="as_array=False"):
+            reader.read(as_array=True)
+        values = reader.scan(low=0, as_array=True)
+        assert values.typecode == "Q"
+        assert values.tolist() == [0, 2 ** 64 - 1, 5, 7, 2]
+        values = reader.scan(high=10, as_array=True)
+        assert values.typecode == "q"
+        assert values.tolist() == [0, 5, 7, -3, 2]
+
+
+def test_parallel(tmp_path):
+    path = write_column(tmp_path / "column.pvc", TIMESTAMPS)
+    with ColumnReader(path) as reader, ProcessPoolExecutor(max_workers=2) as pool:
+        assert reader.read(executor=pool) == TIMESTAMPS
+        assert reader.read(workers=2) == TIMESTAMPS
+        low, high = TIMESTAMPS[1500], TIMESTAMPS[8000]
+        assert reader.scan(low, high, as_array=True, executor=pool).tolist() == TIMESTAMPS[1500:8001]
+
+
+def test_empty(tmp_path):
+    path = tmp_path / "column.pvc"
+    ColumnWriter(path).close()
+    with ColumnReader(path) as reader:
+        assert len(reader) == 0
+        assert reader.read() == []
+        assert reader.minimum is None
+
+
+def test_corrupt(tmp_path):
+    path = write_column(tmp_path / "column.pvc", TIMESTAMPS[:3000])
+    data = path.read_bytes()
+    for corrupt in [b"", data[:-1], data[:20], b"XXXX" + data[4:], data[:-20] + b"\x00" + data[-19:]]:
+        path.write_bytes(corrupt)
+        with pytest.raises(ColumnFileError):
+            ColumnReader(path)
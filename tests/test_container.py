@@ -0,0 +1,133 @@
+import pytest
+
+from PyVarInt.algorithms import (Base,
+                                 LeSQLite,
+                                 LeSQLite2,
+                                 PrefixVarint,
+                                 UnsignedLEB128,
+                                 SignedLEB128,
+                                 SQLite4VLI,
+                                 Simple8b,
+                                 StreamVByte,
+                                 ZigZagLeSQLite)
+from PyVarInt.container import (ChecksumError,
+                                ContainerError,
+                                iter_containers,
+                                pack,
+                                payload,
+                                read_header,
+                                unpack,
+                                unpack_array)
+from PyVarInt.registry import (FIRST_USER_ID,
+                               UnknownCodecError,
+                               codec_for,
+                               codec_id,
+                               register_codec,
+                               registered_codecs)
+
+UNSIGNED_VALUES = [(i * 2654435761) % 2 ** 40 >> (i % 40) for i in range(3000)]
+SIGNED_VALUES = [value - 2 ** 39 >> (i % 30) for i, value in enumerate(UNSIGNED_VALUES)]
+
+
+def test_registry_is_stable():
+    assert codec_id(PrefixVarint) == 1
+    assert codec_id(LeSQLite) == 6
+    assert codec_id(LeSQLite2) == 7
+    assert codec_id(Simple8b) == 19
+    codecs = registered_codecs()
+    assert len(set(codecs.values())) == len(codecs)
+    for identifier, codec in codecs.items():
+        assert codec_for(identifier) is codec
+        assert codec_id(codec) == identifier
+
+
+def test_register_codec():
+    class Custom(UnsignedLEB128):
+        pass
+
+    with pytest.raises(UnknownCodecError):
+        codec_id(Custom)
+    with pytest.raises(ValueError):
+        register_codec(Custom, 20)
+    with pytest.raises(ValueError):
+        register_codec(UnsignedLEB128, FIRST_USER_ID)
+    register_codec(Custom, 200)
+    register_codec(Custom, 200)
+    assert codec_for(200) is Custom
+    with pytest.raises(ValueError):
+        register_codec(Base, 200)
+    assert unpack(pack([1, 2, 3], Custom)) == [1, 2, 3]
+
+
+@pytest.mark.parametrize("codec,values", [
+    [UnsignedLEB128, UNSIGNED_VALUES],
+    [SignedLEB128, SIGNED_VALUES],
+    [SQLite4VLI, UNSIGNED_VALUES],
+    [ZigZagLeSQLite, SIGNED_VALUES],
+    [StreamVByte, [value & 0xFFFFFFFF for value in UNSIGNED_VALUES]],
+    [Simple8b, UNSIGNED_VALUES],
+])
+@pytest.mark.parametrize("checksum", [True, False])
+def test_roundtrip(codec, values, checksum):
+    data = pack(values, codec, checksum=checksum)
+    header = read_header(data)
+    assert header.codec is codec
+    assert header.value_count == len(values)
+    assert header.size == len(data)
+    assert header.block_index is None
+    assert unpack(data) == values
+    assert unpack(bytearray(data), as_array=True).tolist() == values
+    assert bytes(payload(data)) == codec.encode_many(values)
+
+
+def test_layout():
+    assert pack([1, 300], LeSQLite2, checksum=False) == b"PVIC\x01\x00\x07\x02\x03" + LeSQLite2.encode_many([1, 300])
+
+
+def test_index():
+    data = pack(UNSIGNED_VALUES, SQLite4VLI, index_stride=1000)
+    header = read_header(data)
+    assert header.index_stride == 1000
+    encoded = payload(data)
+    assert header.block_index.tolist() == [0] + [SQLite4VLI.skip(encoded, n) for n in (1000, 2000)]
+    assert SQLite4VLI.decode_from(encoded, header.block_index[2])[0] == UNSIGNED_VALUES[2000]
+    assert unpack(data) == UNSIGNED_VALUES
+    assert unpack(data, workers=1) == UNSIGNED_VALUES
+    with pytest.raises(ValueError):
+        pack([1], StreamVByte, index_stride=10)
+
+
+def test_mixed_codecs():
+    columns = [(PrefixVarint, UNSIGNED_VALUES), (ZigZagLeSQLite, SIGNED_VALUES), (UnsignedLEB128, [])]
+    data = b"".join(pack(values, codec, index_stride=512) for codec, values in columns)
+    assert [unpack(container) for container in iter_containers(data)] == [values for _, values in columns]
+
+
+def test_unpack_array():
+    np = pytest.importorskip("numpy")
+    decoded = unpack_array(pack(SIGNED_VALUES, SignedLEB128))
+    assert decoded.dtype == np.int64
+    assert decoded.tolist() == SIGNED_VALUES
+
+
+def test_corruption():
+    data = bytearray(pack(UNSIGNED_VALUES, UnsignedLEB128))
+    with pytest.raises(ContainerError):
+        read_header(b"PVIX" + data[4:])
+    with pytest.raises(ContainerError):
+        read_header(data[:-1])
+    with pytest.raises(ContainerError):
+        read_header(data[:7])
+    data[100] ^= 1
+    with pytest.raises(ChecksumError):
+        unpack(data)
+    read_header(data, verify=False)
+
+    with pytest.raises(UnknownCodecError):
+        read_header(b"PVIC\x01\x00\x7f\x00\x00")
+    # A count that does not match the payload is detected without a checksum
+    with pytest.raises(ContainerError):
+        unpack(b"PVIC\x01\x00\x02\x03\x02\x01\x02")
+    # Decoding stops after the announced count, the bytes behind it are never read
+    assert unpack(b"PVIC\x01\x00\x02\x01\x02\x01\x80") == [1]
+    assert unpack(b"PVIC\x01\x00\x02\x01\x02\x01\x80", as_array=True).tolist() == [1]
@@ -0,0 +1,66 @@
+from io import BytesIO
+
+import pytest
+
+from PyVarInt.algorithms import GroupVarint, UnsignedLEB128, SQLite4VLI, ZigZagUnsignedLEB128, ZigZagPrefixVarint
+from PyVarInt.delta import DeltaCodec
+
+SORTED = [1700000000000 + i * 37 + (i % 7) * 3 for i in range(1000)]
+UNSORTED = [5, 3, 10, -4, 2 ** 40, 0, 0, -2 ** 40]
+
+
+@pytest.mark.parametrize("block_size", [None, 1, 10, 128])
+@pytest.mark.parametrize("codec", [UnsignedLEB128, SQLite4VLI])
+def test_sorted_roundtrip(codec, block_size):
+    delta = DeltaCodec(codec, block_size=block_size)
+    encoded = delta.encode_many(SORTED)
+    assert delta.decode_many(encoded) == SORTED
+    assert delta.decode_many(BytesIO(encoded)) == SORTED
+    assert delta.decode_many(encoded, count=15) == SORTED[:15]
+    assert delta.decode_many(encoded, as_array=True).tolist() == SORTED
+    assert list(delta.iter_decode(BytesIO(encoded), chunk_size=64)) == SORTED
+
+
+def test_smaller_than_absolute():
+    encoded = DeltaCodec(UnsignedLEB128).encode_many(SORTED)
+    assert len(encoded) * 3 < len(UnsignedLEB128.encode_many(SORTED))
+    assert encoded == UnsignedLEB128.encode_many([SORTED[0]] + [b - a for a, b in zip(SORTED, SORTED[1:])])
+
+
+def test_block_base():
+    delta = DeltaCodec(UnsignedLEB128, block_size=100)
+    encoded = delta.encode_many(SORTED)
+    # every block starts with an absolute value and decodes on its own
+    offset = UnsignedLEB128.skip(encoded, 300)
+    assert delta.decode_many(memoryview(encoded)[offset:], count=100) == SORTED[300:400]
+
+
+@pytest.mark.parametrize("codec", [ZigZagUnsignedLEB128, ZigZagPrefixVarint])
+def test_signed_deltas(codec):
+    delta = DeltaCodec(codec)
+    assert delta.decode_many(delta.encode_many(UNSORTED)) == UNSORTED
+
+
+def test_as_array_holds_sums_wider_than_deltas():
+    values = [i * 2 ** 30 for i in range(10)]
+    delta = DeltaCodec(GroupVarint)
+    decoded = delta.decode_many(delta.encode_many(values), as_array=True)
+    assert decoded.typecode == "Q"
+    assert decoded.tolist() == values
+
+    delta = DeltaCodec(ZigZagUnsignedLEB128)
+    decoded = delta.decode_many(delta.encode_many(UNSORTED), as_array=True)
+    assert decoded.typecode == "q"
+    assert decoded.tolist() == UNSORTED
+
+
+def test_unsigned_rejects_decreasing():
+    with pytest.raises(ValueError):
+        DeltaCodec(UnsignedLEB128).encode_many([3, 2])
+
+
+def test_stream_count_reads_only_requested_values():
+    delta = DeltaCodec(UnsignedLEB128)
+    stream = BytesIO(delta.encode_many(SORTED))
+    assert delta.decode_many(stream, count=3) == SORTED[:3]
+    assert stream.tell() == len(delta.encode_many(SORTED[:3]))
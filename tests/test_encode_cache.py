@@ -0,0 +1,69 @@
+import pytest
+
+from PyVarInt.algorithms import (PrefixVarint,
+                                 UnsignedLEB128,
+                                 SignedLEB128,
+                                 SQLite4VLI,
+                                 UnrealEngineSingedVLQ,
+                                 ZigZagLeSQLite2,
+                                 encode_cache_info,
+                                 set_encode_cache)
+
+CODECS = [PrefixVarint, UnsignedLEB128, SignedLEB128, SQLite4VLI, UnrealEngineSingedVLQ, ZigZagLeSQLite2]
+
+
+def _reference(codec, value):
+    result = bytearray()
+    codec._append(value, result)
+    return bytes(result)
+
+
+@pytest.fixture(autouse=True)
+def default_cache():
+    set_encode_cache()
+    yield
+    set_encode_cache()
+
+
+@pytest.mark.parametrize("codec", CODECS)
+def test_table(codec):
+    set_encode_cache(table_size=300)
+    for value in [0, 1, 127, 128, 240, 241, 299, 300, 301, 70000, -1, -300]:
+        if codec.min_value is not None and value < codec.min_value:
+            continue
+        assert codec.encode(value) == _reference(codec, value)
+    # Small values are shared objects
+    assert codec.encode(5) is codec.encode(5)
+    assert encode_cache_info()["tables"] >= 1
+
+
+@pytest.mark.parametrize("codec", CODECS)
+def test_lru(codec):
+    set_encode_cache(table_size=0, lru_size=2)
+    first = codec.encode(1000)
+    second = codec.encode(2000)
+    assert codec.encode(1000) is first
+    # 2000 is now the least recently used value and is evicted by 3000
+    codec.encode(3000)
+    assert codec.encode(1000) is first
+    evicted = codec.encode(2000)
+    assert evicted == second and evicted is not second
+    assert encode_cache_info()["lru_entries"] == 2
+
+
+def test_disabled():
+    set_encode_cache(table_size=0)
+    assert UnsignedLEB128.encode(5) == b"\x05"
+    info = encode_cache_info()
+    assert (info["tables"], info["table_bytes"], info["lru_entries"]) == (0, 0, 0)
+
+
+def test_info_and_validation():
+    set_encode_cache(table_size=1000)
+    SQLite4VLI.encode(1)
+    info = encode_cache_info()
+    assert info["table_size"] == 1000
+    assert info["tables"] == 1
+    assert info["table_bytes"] > 0
+    with pytest.raises(ValueError):
+        set_encode_cache(table_size=-1)
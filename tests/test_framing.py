@@ -0,0 +1,127 @@
+import socket
+import threading
+from array import array
+from io import BytesIO
+
+import pytest
+
+from PyVarInt.algorithms import PrefixVarint, SignedLEB128, UnsignedLEB128, VariableLengthQuantity
+from PyVarInt.framing import FrameTooLargeError, Framer
+
+PAYLOADS = [b"", b"a", b"hello", bytes(range(256)) * 3, b"x" * 70000]
+
+
+@pytest.mark.parametrize("codec", [UnsignedLEB128, PrefixVarint, VariableLengthQuantity])
+def test_roundtrip(codec):
+    framer = Framer(codec)
+    stream = BytesIO()
+    written = framer.write_frames(stream, PAYLOADS)
+    encoded = stream.getvalue()
+    assert written == len(encoded)
+    assert encoded == b"".join(codec.encode(len(payload)) + payload for payload in PAYLOADS)
+
+    assert [bytes(payload) for payload in framer.iter_frames(encoded)] == PAYLOADS
+    stream.seek(0)
+    assert [framer.read_frame(stream) for _ in PAYLOADS] == PAYLOADS
+    with pytest.raises(EOFError):
+        framer.read_frame(stream)
+
+
+def test_iter_frames_zero_copy():
+    encoded = bytearray(UnsignedLEB128.encode(3) + b"abc")
+    payload = next(Framer().iter_frames(encoded))
+    assert isinstance(payload, memoryview)
+    encoded[-1:] = b"z"
+    assert payload == b"abz"
+
+
+def test_typed_payloads():
+    values = array("I", [1, 2, 3])
+    stream = BytesIO()
+    Framer().write_frames(stream, [values, memoryview(b"xy")])
+    frames = list(Framer().iter_frames(stream.getvalue()))
+    assert frames == [values.tobytes(), b"xy"]
+
+
+def test_socket_gather_write():
+    framer = Framer(PrefixVarint)
+    payloads = PAYLOADS * 300
+    left, right = socket.socketpair()
+    with left, right:
+        received = bytearray()
+
+        def _receive():
+            while True:
+                chunk = right.recv(65536)
+                if not chunk:
+                    return
+                received.extend(chunk)
+
+        thread = threading.Thread(target=_receive)
+        thread.start()
+        framer.write_frames(left, payloads)
+        left.shutdown(socket.SHUT_WR)
+        thread.join()
+    assert [bytes(payload) for payload in framer.iter_frames(received)] == payloads
+
+
+def test_split_frames():
+    framer = Framer()
+    stream = BytesIO()
+    framer.write_frames(stream, PAYLOADS)
+    encoded = stream.getvalue()
+    for end in [0, 1, 2, 8, 20, len(encoded) - 1, len(encoded)]:
+        frames, offset = framer.split_frames(encoded[:end])
+        assert [bytes(frame) for frame in frames] == PAYLOADS[:len(frames)]
+        assert offset <= end
+        rest = list(framer.iter_frames(encoded[offset:]))
+        assert [bytes(frame) for frame in frames + rest] == PAYLOADS
+
+
+def test_truncated():
+    framer = Framer()
+    encoded = UnsignedLEB128.encode(5) + b"abc"
+    with pytest.raises(IndexError):
+        list(framer.iter_frames(encoded))
+    with pytest.raises(EOFError):
+        framer.read_frame(BytesIO(encoded))
+    with pytest.raises(EOFError):
+        framer.read_frame(BytesIO(b"\x80"))
+    with pytest.raises(EOFError):
+        Framer(PrefixVarint).read_frame(BytesIO(PrefixVarint.encode(70000)[:1]))
+
+
+def test_max_frame_size():
+    framer = Framer(max_frame_size=4)
+    stream = BytesIO()
+    with pytest.raises(FrameTooLargeError):
+        framer.write_frames(stream, [b"ok", b"too long"])
+    assert stream.getvalue() == b""
+
+    # A hostile prefix is rejected before its payload is read
+    encoded = UnsignedLEB128.encode(2 ** 40) + b"abc"
+    with pytest.raises(FrameTooLargeError):
+        list(framer.iter_frames(encoded))
+    with pytest.raises(FrameTooLargeError):
+        framer.split_frames(encoded)
+    stream = BytesIO(encoded)
+    with pytest.raises(FrameTooLargeError):
+        framer.read_frame(stream)
+    # Reading stops once the prefix is as long as the one of max_frame_size
+    assert stream.read() == encoded[1:]
+    assert issubclass(FrameTooLargeError, ValueError)
+
+
+def test_endless_length_prefix():
+    framer = Framer(max_frame_size=1000)
+    stream = BytesIO(b"\x80" * 100000)
+    with pytest.raises(FrameTooLargeError):
+        framer.read_frame(stream)
+    assert stream.tell() == 2
+    # A prefix of maximal length is still accepted
+    assert Framer(max_frame_size=2 ** 64).read_frame(BytesIO(UnsignedLEB128.encode(3) + b"abc")) == b"abc"
+
+
+def test_signed_codec_rejected():
+    with pytest.raises(ValueError):
+        Framer(SignedLEB128)
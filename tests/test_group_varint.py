@@ -0,0 +1,63 @@
+from io import BytesIO
+
+import pytest
+
+from PyVarInt.algorithms import GroupVarint, StreamVByte
+
+VALUES = [0, 1, 255, 256, 65535, 65536, 16777215, 16777216, 2 ** 32 - 1, 300, 7]
+CODECS = [GroupVarint, StreamVByte]
+
+
+@pytest.mark.parametrize("codec", CODECS)
+@pytest.mark.parametrize("count", [0, 1, 3, 4, 5, 8, len(VALUES)])
+def test_roundtrip(codec, count):
+    encoded = codec.encode_many(VALUES[:count])
+    assert codec.decode_many(encoded) == VALUES[:count]
+    assert codec.decode_many(encoded, as_array=True).tolist() == VALUES[:count]
+
+
+@pytest.mark.parametrize("codec,expected", [
+    [GroupVarint, b"\x06" b"\x24\x01\x00\x01\x00\x00\x01\x00" b"\x0c\x04\x00\x00\x00\x01"],
+    [StreamVByte, b"\x06" b"\x24\x0c" b"\x01\x00\x01\x00\x00\x01\x00\x04\x00\x00\x00\x01"],
+])
+def test_layout(codec, expected):
+    values = [1, 256, 65536, 0, 4, 2 ** 24]
+    assert codec.encode_many(values) == expected
+
+
+@pytest.mark.parametrize("codec", CODECS)
+def test_decode_file_object(codec):
+    assert codec.decode_many(BytesIO(codec.encode_many(VALUES))) == VALUES
+
+
+@pytest.mark.parametrize("codec", CODECS)
+def test_truncated(codec):
+    encoded = codec.encode_many(VALUES)
+    for end in range(1, len(encoded)):
+        with pytest.raises(IndexError):
+            codec.decode_many(encoded[:end])
+
+
+@pytest.mark.parametrize("codec", CODECS)
+@pytest.mark.parametrize("value", [-1, 2 ** 32])
+def test_out_of_range(codec, value):
+    with pytest.raises(OverflowError):
+        codec.encode_many([1, value])
+
+
+@pytest.mark.parametrize("codec", CODECS)
+@pytest.mark.parametrize("count", [0, 1, 4, 7, 1000])
+def test_vectorized(codec, count):
+    np = pytest.importorskip("numpy")
+    from PyVarInt.vectorized import decode_array, encode_array
+
+    rng = np.random.default_rng(count)
+    values = (rng.integers(0, 2 ** 32, count, dtype=np.uint64) >> rng.integers(0, 32, count, dtype=np.uint64))
+    encoded = encode_array(codec, values)
+    assert encoded.tobytes() == codec.encode_many(values.tolist())
+    decoded = decode_array(codec, encoded)
+    assert decoded.dtype == np.uint32
+    assert decoded.tolist() == values.tolist()
+
+    with pytest.raises(OverflowError):
+        encode_array(codec, np.array([2 ** 32], dtype=np.uint64))
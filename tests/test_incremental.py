@@ -0,0 +1,142 @@
+import random
+
+import pytest
+
+from PyVarInt.algorithms import (PrefixVarint,
+                                 UnsignedLEB128,
+                                 SignedLEB128,
+                                 VariableLengthQuantity,
+                                 SQLite4VLI,
+                                 LeSQLite,
+                                 LeSQLite2,
+                                 UnrealEngineSingedVLQ,
+                                 ZigZagPrefixVarint,
+                                 ZigZagUnsignedLEB128,
+                                 StreamVByte)
+from PyVarInt.incremental import IncrementalDecoder
+
+UNSIGNED_VALUES = [(i * 2654435761) % 2 ** 64 >> (i % 64) for i in range(2000)]
+SIGNED_VALUES = [value - 2 ** 20 >> (i % 40) for i, value in enumerate(range(0, 2 ** 21, 1049))]
+
+CODECS = [
+    [PrefixVarint, UNSIGNED_VALUES],
+    [UnsignedLEB128, UNSIGNED_VALUES + [2 ** 200]],
+    [SignedLEB128, SIGNED_VALUES + [-2 ** 62]],
+    [VariableLengthQuantity, UNSIGNED_VALUES],
+    [SQLite4VLI, UNSIGNED_VALUES],
+    [LeSQLite, UNSIGNED_VALUES],
+    [LeSQLite2, UNSIGNED_VALUES],
+    [UnrealEngineSingedVLQ, [value >> 6 for value in SIGNED_VALUES] + [2 ** 35 - 1, -(2 ** 35 - 1)]],
+    [ZigZagPrefixVarint, SIGNED_VALUES],
+    [ZigZagUnsignedLEB128, SIGNED_VALUES],
+]
+
+
+def decoder_for(codec, values):
+    return IncrementalDecoder(codec, max_length=max(codec.encoded_length(value) for value in values))
+
+
+def fragments(data, rng):
+    position = 0
+    while position < len(data):
+        size = rng.choice([1, 1, 2, 3, 7, 64, 1000])
+        yield data[position:position + size]
+        position += size
+
+
+@pytest.mark.parametrize("codec,values", CODECS)
+def test_fragmented(codec, values):
+    encoded = codec.encode_many(values)
+    decoder = decoder_for(codec, values)
+    decoded = []
+    for fragment in fragments(encoded, random.Random(7)):
+        decoded += decoder.feed(fragment)
+        assert decoder.pending_bytes < 30
+    assert decoded == values
+    assert decoder.pending_bytes == 0
+
+
+@pytest.mark.parametrize("codec,values", CODECS)
+def test_byte_by_byte(codec, values):
+    encoded = codec.encode_many(values[:300])
+    decoder = decoder_for(codec, values)
+    decoded = []
+    for position in range(len(encoded)):
+        decoded += decoder.feed(memoryview(encoded)[position:position + 1])
+    assert decoded == values[:300]
+
+
+def test_pending_bytes():
+    decoder = IncrementalDecoder(UnsignedLEB128)
+    assert decoder.feed(b"\x01\xac") == [1]
+    assert decoder.pending_bytes == 1
+    assert decoder.feed(b"") == []
+    assert decoder.feed(bytearray(b"\x02\x05")) == [300, 5]
+    assert decoder.pending_bytes == 0
+
+    decoder = IncrementalDecoder(SQLite4VLI)
+    encoded = SQLite4VLI.encode(2 ** 40)
+    assert decoder.feed(encoded[:2]) == []
+    assert decoder.pending_bytes == 2
+    assert decoder.feed(encoded[2:] + b"\x07") == [2 ** 40, 7]
+
+
+def test_final():
+    decoder = IncrementalDecoder(PrefixVarint)
+    assert decoder.feed(PrefixVarint.encode(10), final=True) == [10]
+    with pytest.raises(EOFError):
+        decoder.feed(PrefixVarint.encode(2 ** 30)[:-1], final=True)
+    decoder.reset()
+    assert decoder.pending_bytes == 0
+    assert decoder.feed(b"\x03") == [1]
+
+
+@pytest.mark.parametrize("codec", [UnsignedLEB128, SignedLEB128, VariableLengthQuantity, ZigZagUnsignedLEB128])
+def test_endless_continuation_bytes(codec):
+    decoder = IncrementalDecoder(codec)
+    assert decoder.max_length == 10
+    with pytest.raises(ValueError):
+        decoder.feed(b"\x80" * 100)
+    assert decoder.pending_bytes == 0
+    with pytest.raises(ValueError):
+        for _ in range(100):
+            decoder.feed(b"\x80")
+    assert decoder.pending_bytes == 0
+    assert decoder.feed(codec.encode(1)) == [1]
+
+
+def test_max_length():
+    decoder = IncrementalDecoder(PrefixVarint, max_length=4)
+    assert decoder.feed(PrefixVarint.encode(2 ** 20)) == [2 ** 20]
+    with pytest.raises(ValueError):
+        decoder.feed(PrefixVarint.encode(2 ** 40)[:2])
+    with pytest.raises(ValueError):
+        decoder.feed(PrefixVarint.encode(2 ** 40))
+    with pytest.raises(ValueError):
+        IncrementalDecoder(PrefixVarint, max_length=0)
+    assert IncrementalDecoder(PrefixVarint).max_length == 9
+    assert IncrementalDecoder(UnrealEngineSingedVLQ).max_length == 5
+
+
+@pytest.mark.parametrize("codec,value", [
+    [UnsignedLEB128, 2 ** 200],
+    [SignedLEB128, -2 ** 62],
+    [PrefixVarint, 2 ** 60],
+    [UnrealEngineSingedVLQ, 2 ** 30],
+])
+def test_max_length_at_every_split(codec, value):
+    # The bound applies the same way whether the integer arrives whole or in two pieces
+    encoded = b"\x01" + codec.encode(value)
+    length = codec.encoded_length(value)
+    for split in range(len(encoded) + 1):
+        decoder = IncrementalDecoder(codec, max_length=length)
+        assert decoder.feed(encoded[:split]) + decoder.feed(encoded[split:]) == [codec.decode(b"\x01"), value]
+        decoder = IncrementalDecoder(codec, max_length=length - 1)
+        with pytest.raises(ValueError):
+            decoder.feed(encoded[:split])
+            decoder.feed(encoded[split:])
+
+
+def test_block_codec_rejected():
+    with pytest.raises(ValueError):
+        IncrementalDecoder(StreamVByte)
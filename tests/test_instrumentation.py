@@ -0,0 +1,133 @@
+import asyncio
+from io import BytesIO
+
+import pytest
+
+from PyVarInt import instrumentation
+from PyVarInt.algorithms import (PrefixVarint,
+                                 UnsignedLEB128,
+                                 SignedLEB128,
+                                 GroupVarint,
+                                 ZigZagUnsignedLEB128)
+
+
+@pytest.fixture(autouse=True)
+def clean():
+    instrumentation.reset()
+    yield
+    instrumentation.disable()
+    instrumentation.reset()
+
+
+def test_disabled_is_untouched():
+    encode = UnsignedLEB128.__dict__["encode"]
+    instrumentation.enable()
+    assert UnsignedLEB128.__dict__["encode"] is not encode
+    assert instrumentation.is_enabled(UnsignedLEB128)
+    instrumentation.disable()
+    assert UnsignedLEB128.__dict__["encode"] is encode
+    assert "encode" not in ZigZagUnsignedLEB128.__dict__
+    assert not instrumentation.is_enabled()
+
+    UnsignedLEB128.encode(5)
+    assert instrumentation.snapshot() == {}
+
+
+def test_scalar():
+    instrumentation.enable([PrefixVarint])
+    encoded = [PrefixVarint.encode(value) for value in [1, 300, 2 ** 63]]
+    for data in encoded:
+        PrefixVarint.decode_from(data)
+    buf = bytearray(9)
+    PrefixVarint.encode_into(2 ** 63, buf)
+    PrefixVarint.decode(encoded[1])
+
+    stats = instrumentation.snapshot()["PrefixVarint"]["scalar"]
+    assert stats["calls"] == stats["values"] == 8
+    assert stats["bytes_out"] == 1 + 2 + 9 + 9
+    assert stats["bytes_in"] == 1 + 2 + 9 + 2
+    assert stats["lengths"] == {1: 2, 2: 3, 9: 3}
+    assert stats["time_ns"] > 0
+
+
+def test_scalar_keyword_arguments():
+    instrumentation.enable([UnsignedLEB128])
+    buf = bytearray(10)
+    assert UnsignedLEB128.encode_into(value=300, buf=buf) == 2
+    assert UnsignedLEB128.encode_into(2 ** 63, buf=buf, offset=0) == 10
+
+    stats = instrumentation.snapshot()["UnsignedLEB128"]["scalar"]
+    assert stats["calls"] == 2
+    assert stats["bytes_out"] == 2 + 10
+
+
+def test_scalar_counts_bytes_read():
+    # A padded LEB128 encoding of 1 is counted at its actual size
+    padded = b"\x81\x80\x00"
+    instrumentation.enable([UnsignedLEB128])
+    assert UnsignedLEB128.decode_from(b"\x05" + padded, offset=1) == (1, 4)
+    assert UnsignedLEB128.decode_from(b"\x05" + padded, 1) == (1, 4)
+    assert UnsignedLEB128.decode(padded) == 1
+    assert UnsignedLEB128.decode(BytesIO(padded + b"\x05")) == 1
+    buf = bytearray(4)
+    assert UnsignedLEB128.encode_into(300, buf, offset=2) == 4
+
+    stats = instrumentation.snapshot()["UnsignedLEB128"]["scalar"]
+    assert stats["calls"] == 5
+    assert stats["bytes_in"] == 4 * 3
+    assert stats["bytes_out"] == 2
+    assert stats["lengths"] == {3: 4, 2: 1}
+
+
+def test_batch_counts_nested_calls_once():
+    values = list(range(-1000, 1000, 7))
+    instrumentation.enable()
+    encoded = ZigZagUnsignedLEB128.encode_many(iter(values))
+    assert ZigZagUnsignedLEB128.decode_many(encoded) == values
+
+    snapshot = instrumentation.snapshot()
+    assert list(snapshot) == ["ZigZagUnsignedLEB128"]
+    stats = snapshot["ZigZagUnsignedLEB128"]["batch"]
+    assert stats["calls"] == 2
+    assert stats["values"] == 2 * len(values)
+    assert stats["bytes_out"] == stats["bytes_in"] == len(encoded)
+    assert sum(stats["lengths"].values()) == 2 * len(values)
+
+
+def test_block_codec():
+    instrumentation.enable([GroupVarint])
+    encoded = GroupVarint.encode_many([1, 2 ** 20, 3])
+    GroupVarint.decode_many(encoded)
+    stats = instrumentation.snapshot()["GroupVarint"]["batch"]
+    assert stats["values"] == 6
+    assert stats["bytes_out"] == stats["bytes_in"] == len(encoded)
+    assert stats["lengths"] == {}
+
+
+def test_stream():
+    values = [0, 127, 128, 2 ** 40]
+    encoded = UnsignedLEB128.encode_many(values)
+    instrumentation.enable([UnsignedLEB128])
+    assert list(UnsignedLEB128.iter_decode(BytesIO(encoded), chunk_size=3)) == values
+
+    async def roundtrip():
+        reader = asyncio.StreamReader()
+        reader.feed_data(encoded)
+        return await UnsignedLEB128.decode_async(reader)
+
+    assert asyncio.run(roundtrip()) == 0
+    stats = instrumentation.snapshot()["UnsignedLEB128"]
+    assert set(stats) == {"stream"}
+    assert stats["stream"]["calls"] == 2
+    assert stats["stream"]["values"] == 5
+    assert stats["stream"]["bytes_in"] == len(encoded) + 1
+
+
+def test_reset_and_context_manager():
+    with instrumentation.instrumented([SignedLEB128]):
+        SignedLEB128.encode(-1)
+        assert instrumentation.is_enabled(SignedLEB128)
+    assert not instrumentation.is_enabled()
+    assert instrumentation.snapshot()["SignedLEB128"]["scalar"]["calls"] == 1
+    instrumentation.reset()
+    assert instrumentation.snapshot() == {}
@@ -27,4 +27,12 @@ def test_encode_lesqlite(expected, integer):
 def test_decode_lesqlite(byte, expected):
     buffer = BytesIO(byte)
     assert LeSQLite.decode(buffer) == expected
-    assert LeSQLite.decode(byte) == expected
\ No newline at end of file
+    assert LeSQLite.decode(byte) == expected
+
+
+@pytest.mark.parametrize("byte, expected", PARAMS)
+def test_decode_from_lesqlite(byte, expected):
+    buffer = b"\xaa" + byte + b"\xaa"
+    assert LeSQLite.decode_from(buffer, 1) == (expected, len(byte) + 1)
+    assert LeSQLite.decode_from(memoryview(bytearray(buffer)), 1) == (expected, len(byte) + 1)
+    assert LeSQLite.decode_from(byte) == (expected, len(byte))
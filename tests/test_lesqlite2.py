@@ -30,3 +30,11 @@ def test_decode_lesqlite2(byte, expected):
     buffer = BytesIO(byte)
     assert LeSQLite2.decode(buffer) == expected
     assert LeSQLite2.decode(byte) == expected
+
+
+@pytest.mark.parametrize("byte, expected", PARAMS)
+def test_decode_from_lesqlite2(byte, expected):
+    buffer = b"\xaa" + byte + b"\xaa"
+    assert LeSQLite2.decode_from(buffer, 1) == (expected, len(byte) + 1)
+    assert LeSQLite2.decode_from(memoryview(bytearray(buffer)), 1) == (expected, len(byte) + 1)
+    assert LeSQLite2.decode_from(byte) == (expected, len(byte))
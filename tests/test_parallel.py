@@ -0,0 +1,207 @@
+import sys
+import threading
+from array import array
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from itertools import accumulate
+
+import pytest
+
+from PyVarInt import parallel
+from PyVarInt.algorithms import (PrefixVarint,
+                                 UnsignedLEB128,
+                                 SignedLEB128,
+                                 VariableLengthQuantity,
+                                 SQLite4VLI,
+                                 UnrealEngineSingedVLQ,
+                                 ZigZagUnsignedLEB128,
+                                 ZigZagLeSQLite,
+                                 set_encode_cache)
+from PyVarInt.parallel import (free_threaded,
+                               parallel_decode,
+                               parallel_encode,
+                               parallel_encode_with_index,
+                               threaded_decode)
+
+UNSIGNED_VALUES = [(i * 2654435761) % 2 ** 64 >> (i % 64) for i in range(5000)]
+SIGNED_VALUES = [value - 2 ** 20 >> (i % 40) for i, value in enumerate(range(0, 2 ** 21, 419))]
+
+CODECS = [
+    [UnsignedLEB128, UNSIGNED_VALUES],
+    [SignedLEB128, SIGNED_VALUES],
+    [VariableLengthQuantity, UNSIGNED_VALUES],
+    [PrefixVarint, UNSIGNED_VALUES],
+    [SQLite4VLI, UNSIGNED_VALUES],
+    [UnrealEngineSingedVLQ, SIGNED_VALUES],
+    [ZigZagUnsignedLEB128, SIGNED_VALUES],
+    [ZigZagLeSQLite, SIGNED_VALUES],
+]
+
+
+@pytest.fixture(scope="module")
+def executor():
+    with ProcessPoolExecutor(max_workers=2) as pool:
+        yield pool
+
+
+@pytest.mark.parametrize("codec,values", CODECS)
+def test_parallel_encode(executor, codec, values):
+    expected = codec.encode_many(values)
+    assert parallel_encode(values, codec, chunk_size=700, executor=executor) == expected
+    assert parallel_encode(iter(values), codec, chunk_size=700, executor=executor) == expected
+    assert parallel_encode(array(codec.array_typecode, values), codec, chunk_size=700, executor=executor) == expected
+
+
+@pytest.mark.parametrize("codec,values", CODECS)
+def test_parallel_decode(executor, codec, values):
+    encoded, index = parallel_encode_with_index(values, codec, chunk_size=700, executor=executor)
+    assert len(index) == 8
+    assert parallel_decode(encoded, codec, index=index, chunk_size=1000, executor=executor) == values
+    assert parallel_decode(encoded, codec, chunk_size=1000, executor=executor) == values
+    decoded = parallel_decode(encoded, codec, index=index, chunk_size=1000, as_array=True, executor=executor)
+    assert decoded.typecode == codec.array_typecode
+    assert decoded.tolist() == values
+
+
+def test_own_pool():
+    encoded = parallel_encode(UNSIGNED_VALUES, UnsignedLEB128, workers=2, chunk_size=1000)
+    assert parallel_decode(encoded, UnsignedLEB128, workers=2, chunk_size=4096) == UNSIGNED_VALUES
+
+
+def test_numpy_input(executor):
+    np = pytest.importorskip("numpy")
+    column = np.array(SIGNED_VALUES, dtype=np.int64)
+    assert parallel_encode(column, ZigZagUnsignedLEB128, chunk_size=500, executor=executor) == \
+        ZigZagUnsignedLEB128.encode_many(SIGNED_VALUES)
+
+
+def test_wide_values_fall_back_to_serial(executor):
+    values = [2 ** 100, -2 ** 90, 5]
+    encoded = parallel_encode(values, SignedLEB128, chunk_size=1, executor=executor)
+    assert encoded == SignedLEB128.encode_many(values)
+
+
+def test_empty(executor):
+    assert parallel_encode([], UnsignedLEB128, executor=executor) == b""
+    assert parallel_decode(b"", UnsignedLEB128, executor=executor) == []
+
+
+def test_truncated(executor):
+    encoded = UnsignedLEB128.encode_many(UNSIGNED_VALUES)
+    with pytest.raises(IndexError):
+        parallel_decode(encoded[:-1], UnsignedLEB128, chunk_size=1000, executor=executor)
+
+
+@pytest.fixture(scope="module")
+def threads():
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        yield pool
+
+
+@pytest.mark.parametrize("codec,values", CODECS)
+def test_threaded_decode(threads, codec, values):
+    encoded, index = parallel_encode_with_index(values, codec, chunk_size=700, workers=1)
+    assert threaded_decode(encoded, codec, index=index, chunk_size=1000, executor=threads) == values
+    assert threaded_decode(encoded, codec, chunk_size=1000, executor=threads) == values
+    decoded = threaded_decode(bytearray(encoded), codec, index=index, chunk_size=1000, as_array=True,
+                              executor=threads)
+    assert decoded.typecode == codec.array_typecode
+    assert decoded.tolist() == values
+
+
+def test_threaded_decode_errors(threads):
+    assert threaded_decode(b"", UnsignedLEB128, executor=threads) == []
+    encoded = UnsignedLEB128.encode_many(UNSIGNED_VALUES)
+    with pytest.raises(IndexError):
+        threaded_decode(encoded[:-1], UnsignedLEB128, chunk_size=1000, executor=threads)
+
+
+def test_threaded_decode_serial_with_gil(monkeypatch):
+    def no_pool(*args, **kwargs):
+        raise AssertionError("no thread pool expected with the GIL enabled")
+
+    monkeypatch.setattr(sys, "_is_gil_enabled", lambda: True, raising=False)
+    monkeypatch.setattr(parallel, "ThreadPoolExecutor", no_pool)
+    assert not free_threaded()
+    encoded = UnsignedLEB128.encode_many(UNSIGNED_VALUES)
+    assert threaded_decode(encoded, UnsignedLEB128, workers=4, chunk_size=1000) == UNSIGNED_VALUES
+
+
+def test_threaded_decode_own_pool(monkeypatch):
+    monkeypatch.setattr(sys, "_is_gil_enabled", lambda: False, raising=False)
+    assert free_threaded()
+    encoded = UnsignedLEB128.encode_many(UNSIGNED_VALUES)
+    assert threaded_decode(encoded, UnsignedLEB128, workers=4, chunk_size=1000, as_array=True).tolist() == \
+        UNSIGNED_VALUES
+
+
+@pytest.mark.parametrize("codec,values", CODECS)
+def test_threaded_decode_several_workers(monkeypatch, codec, values):
+    # Runs the threaded path on a regular build too, where the threads take turns holding the GIL
+    monkeypatch.setattr(sys, "_is_gil_enabled", lambda: False, raising=False)
+    decode_slice = parallel._decode_slice
+    threads = set()
+
+    def recording_decode_slice(*args):
+        threads.add(threading.get_ident())
+        return decode_slice(*args)
+
+    monkeypatch.setattr(parallel, "_decode_slice", recording_decode_slice)
+    values = values * 20
+    encoded = codec.encode_many(values)
+    index = list(accumulate((codec.encoded_length(value) for value in values[:-1]), initial=0))
+    expected = codec.decode_many(encoded)
+    assert threaded_decode(encoded, codec, workers=4, index=index, chunk_size=4096) == expected
+    assert threaded_decode(encoded, codec, workers=4, index=index, chunk_size=4096, as_array=True) == \
+        codec.decode_many(encoded, as_array=True)
+    assert threads and threading.get_ident() not in threads
+
+
+@pytest.mark.parametrize("codec,values", CODECS)
+def test_threaded_decode_gil_disabled_executor(monkeypatch, threads, codec, values):
+    # The path taken on a free-threaded build, through an executor passed by the caller
+    monkeypatch.setattr(sys, "_is_gil_enabled", lambda: False, raising=False)
+    monkeypatch.setattr(parallel, "ThreadPoolExecutor", None)
+    encoded = codec.encode_many(values)
+    index = list(accumulate((codec.encoded_length(value) for value in values[:-1]), initial=0))
+    assert threaded_decode(encoded, codec, index=index, chunk_size=512, executor=threads) == \
+        codec.decode_many(encoded)
+    decoded = threaded_decode(encoded, codec, workers=4, index=index, chunk_size=512, as_array=True,
+                              executor=threads)
+    assert decoded.typecode == codec.array_typecode
+    assert decoded == codec.decode_many(encoded, as_array=True)
+
+
+@pytest.mark.skipif(not free_threaded(), reason="requires a free-threaded build with the GIL disabled")
+def test_import_keeps_gil_disabled():
+    # Importing an extension module that does not declare Py_MOD_GIL_NOT_USED re-enables the GIL
+    import PyVarInt.algorithms  # noqa: F401
+    assert not sys._is_gil_enabled()
+
+
+@pytest.mark.parametrize("codec,values", CODECS)
+def test_concurrent_codec_use(codec, values):
+    set_encode_cache(table_size=256, lru_size=64)
+    expected = codec.encode_many(values)
+    prefix = codec.encode_many(values[:500])
+    barrier = threading.Barrier(8)
+    errors = []
+
+    def work():
+        barrier.wait()
+        try:
+            for _ in range(5):
+                assert b"".join(codec.encode(value) for value in values[:500]) == prefix
+                assert codec.encode_many(values) == expected
+                assert codec.decode_many(expected) == values
+        except BaseException as error:
+            errors.append(error)
+
+    threads = [threading.Thread(target=work) for _ in range(8)]
+    try:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        set_encode_cache()
+    assert not errors
@@ -29,3 +29,11 @@ def test_decode_prefix_varint(byte, expected):
     buffer = BytesIO(byte)
     assert PrefixVarint.decode(buffer) == expected
     assert PrefixVarint.decode(byte) == expected
+
+
+@pytest.mark.parametrize("byte, expected", PARAMS)
+def test_decode_from_prefix_varint(byte, expected):
+    buffer = b"\xaa" + byte + b"\xaa"
+    assert PrefixVarint.decode_from(buffer, 1) == (expected, len(byte) + 1)
+    assert PrefixVarint.decode_from(memoryview(bytearray(buffer)), 1) == (expected, len(byte) + 1)
+    assert PrefixVarint.decode_from(byte) == (expected, len(byte))
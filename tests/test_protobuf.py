@@ -0,0 +1,120 @@
+import struct
+
+import pytest
+
+from PyVarInt.algorithms import UnsignedLEB128, zigzag_encode
+from PyVarInt.framing import Framer
+from PyVarInt.protobuf import FieldScanner, fields_of, iter_fields
+
+
+def tag(field_number, wire_type):
+    return UnsignedLEB128.encode(field_number << 3 | wire_type)
+
+
+def varint(field_number, value):
+    return tag(field_number, 0) + UnsignedLEB128.encode(value % 2 ** 64)
+
+
+def delimited(field_number, payload):
+    return tag(field_number, 2) + UnsignedLEB128.encode(len(payload)) + payload
+
+
+def fixed32(field_number, payload):
+    return tag(field_number, 5) + payload
+
+
+def fixed64(field_number, payload):
+    return tag(field_number, 1) + payload
+
+
+MESSAGE = b"".join([
+    varint(1, 150),
+    delimited(2, b"testing"),
+    varint(3, zigzag_encode(-12345)),
+    tag(4, 3) + varint(1, 7) + delimited(2, b"in group") + tag(4, 4),
+    fixed32(5, struct.pack("<f", 1.5)),
+    fixed64(6, struct.pack("<q", -42)),
+    varint(7, -2),
+    delimited(8, UnsignedLEB128.encode_many([1, 300, 70000])),
+    varint(9, 1),
+    delimited(1000, b"x" * 500),
+    varint(8, 5),
+])
+
+
+def test_iter_fields():
+    fields = [(number, wire_type, value if isinstance(value, int) else bytes(value))
+              for number, wire_type, value in iter_fields(MESSAGE)]
+    assert fields[:3] == [(1, 0, 150), (2, 2, b"testing"), (3, 0, 24689)]
+    assert [number for number, _, _ in fields] == [1, 2, 3, 5, 6, 7, 8, 9, 1000, 8]
+    assert set(fields_of(MESSAGE)) == {1, 2, 3, 5, 6, 7, 8, 9, 1000}
+
+
+def test_raw_fields():
+    scanner = FieldScanner([2, 1, 6, 11])
+    text, number, fixed, missing = scanner.scan(MESSAGE)
+    assert isinstance(text, memoryview) and text == b"testing"
+    assert number == 150
+    assert fixed == 2 ** 64 - 42
+    assert missing is None
+
+
+def test_typed_fields():
+    scanner = FieldScanner({1: "uint64", 2: "string", 3: "sint64", 5: "float", 6: "sfixed64", 7: "int32", 9: "bool"})
+    assert scanner.scan(MESSAGE) == (150, "testing", -12345, 1.5, -42, -2, True)
+
+
+def test_repeated_and_packed():
+    scanner = FieldScanner({8: "uint64"}, repeated=[8])
+    assert scanner.scan(MESSAGE) == ([1, 300, 70000, 5],)
+    packed = delimited(1, struct.pack("<3i", -1, 0, 7)) + fixed32(1, struct.pack("<i", 9))
+    assert FieldScanner({1: "sfixed32"}, repeated=[1]).scan(packed) == ([-1, 0, 7, 9],)
+    assert FieldScanner({1: "float"}, repeated=[1]).scan(delimited(1, struct.pack("<2f", 0.5, 2.0))) == ([0.5, 2.0],)
+
+
+def test_last_occurrence_wins():
+    message = varint(1, 1) + varint(1, 2)
+    assert FieldScanner([1]).scan(message) == (2,)
+    assert FieldScanner([1], stop_early=True).scan(message) == (1,)
+
+
+def test_zero_copy():
+    buffer = bytearray(MESSAGE)
+    view = FieldScanner({1000: "bytes"}).scan(buffer)[0]
+    buffer[-3] = ord("y")
+    assert view[-1:] == b"y"
+
+
+def test_batch():
+    messages = [varint(1, i) + delimited(2, str(i).encode()) + varint(3, zigzag_encode(-i)) for i in range(100)]
+    scanner = FieldScanner({3: "sint32", 2: "string"})
+    assert scanner.scan_many(messages) == [(-i, str(i)) for i in range(100)]
+    assert scanner.column(messages, 3) == [-i for i in range(100)]
+
+    stream = bytearray()
+    for message in messages:
+        stream += UnsignedLEB128.encode(len(message)) + message
+    assert list(scanner.scan_delimited(stream)) == [(-i, str(i)) for i in range(100)]
+    assert list(scanner.scan_delimited(stream)) == [scanner.scan(bytes(frame)) for frame in Framer().iter_frames(stream)]
+
+
+@pytest.mark.parametrize("message,error", [
+    (MESSAGE[:-1], IndexError),
+    (delimited(1, b"abc")[:-1], IndexError),
+    (fixed64(1, b"\x00" * 7), IndexError),
+    (tag(1, 3) + varint(2, 1), IndexError),
+    (tag(1, 3) + tag(2, 4), ValueError),
+    (tag(1, 6) + b"\x00", ValueError),
+])
+def test_malformed(message, error):
+    with pytest.raises(error):
+        FieldScanner([1, 2]).scan(message)
+
+
+def test_wire_type_mismatch():
+    with pytest.raises(ValueError):
+        FieldScanner({2: "uint64"}).scan(MESSAGE)
+    with pytest.raises(ValueError):
+        FieldScanner({1: "varint"})
+    with pytest.raises(ValueError):
+        FieldScanner([1], repeated=[2])
@@ -0,0 +1,104 @@
+import pytest
+
+from PyVarInt.algorithms import UnsignedLEB128, SQLite4VLI, UnrealEngineSingedVLQ, VariableLengthQuantity
+from PyVarInt.reader import VarIntReader
+
+VALUES = [(i * 7919) % 100003 * (i % 5 + 1) ** 9 for i in range(1000)]
+
+
+@pytest.fixture
+def values_file(tmp_path):
+    def _write(codec, values):
+        path = tmp_path / f"{codec.__name__}.bin"
+        path.write_bytes(codec.encode_many(values))
+        return path
+
+    return _write
+
+
+@pytest.mark.parametrize("codec", [UnsignedLEB128, SQLite4VLI])
+@pytest.mark.parametrize("stride", [1, 16, 1024])
+def test_random_access(values_file, codec, stride):
+    with VarIntReader(values_file(codec, VALUES), codec, stride=stride) as reader:
+        assert len(reader) == len(VALUES)
+        for index in [0, 1, 15, 16, 17, 500, 999, -1, -1000]:
+            assert reader[index] == VALUES[index]
+        with pytest.raises(IndexError):
+            reader[1000]
+        with pytest.raises(IndexError):
+            reader[-1001]
+
+
+@pytest.mark.parametrize("key", [slice(None), slice(10, 20), slice(5, 900, 37),
+                                 slice(None, None, -3), slice(900, 5, -41), slice(20, 10)])
+def test_slices(values_file, key):
+    with VarIntReader(values_file(UnsignedLEB128, VALUES), UnsignedLEB128, stride=32) as reader:
+        assert reader[key] == VALUES[key]
+
+
+def test_empty_file(values_file):
+    with VarIntReader(values_file(UnsignedLEB128, []), UnsignedLEB128) as reader:
+        assert len(reader) == 0
+        assert reader[:] == []
+
+
+def test_refresh_after_append(values_file):
+    path = values_file(UnrealEngineSingedVLQ, [-5, 7, 100000])
+    with VarIntReader(path, UnrealEngineSingedVLQ, stride=2) as reader:
+        assert len(reader) == 3
+
+        encoded = UnrealEngineSingedVLQ.encode_many([-300, 42])
+        with open(path, "ab") as file:
+            file.write(encoded[:-1])
+        # the partially written value is not visible yet
+        assert reader.refresh() == 4
+        assert reader[3] == -300
+
+        with open(path, "ab") as file:
+            file.write(encoded[-1:])
+        assert reader.refresh() == 5
+        assert reader[:] == [-5, 7, 100000, -300, 42]
+
+
+def test_sidecar_index(values_file, tmp_path):
+    path = values_file(UnsignedLEB128, VALUES)
+    index_path = tmp_path / "values.idx"
+    with VarIntReader(path, UnsignedLEB128, stride=64, index_path=index_path) as reader:
+        assert len(reader) == len(VALUES)
+    assert index_path.exists()
+
+    with open(path, "ab") as file:
+        file.write(UnsignedLEB128.encode_many([1, 2, 3]))
+
+    # Only the appended values may be scanned when the sidecar index is loaded
+    scanned = []
+    decode_from = UnsignedLEB128.decode_from
+
+    class CountingCodec(UnsignedLEB128):
+        @staticmethod
+        def decode_from(buf, offset=0):
+            scanned.append(offset)
+            return decode_from(buf, offset)
+
+    with VarIntReader(path, CountingCodec, stride=64, index_path=index_path) as reader:
+        assert len(scanned) == 3
+        assert len(reader) == len(VALUES) + 3
+        assert reader[:] == VALUES + [1, 2, 3]
+
+    # An index built with another stride is ignored and rebuilt
+    with VarIntReader(path, UnsignedLEB128, stride=10, index_path=index_path) as reader:
+        assert reader[777] == VALUES[777]
+
+
+def test_sidecar_index_of_another_codec(values_file, tmp_path):
+    values = [1, 2 ** 20, 5, 2 ** 40, 3] * 50
+    path = values_file(VariableLengthQuantity, values)
+    index_path = tmp_path / "values.idx"
+    with VarIntReader(path, VariableLengthQuantity, stride=4, index_path=index_path) as reader:
+        assert reader[201] == values[201]
+
+    # The same file rewritten with another codec: the stale offsets must not be reused
+    path.write_bytes(SQLite4VLI.encode_many(values))
+    with VarIntReader(path, SQLite4VLI, stride=4, index_path=index_path) as reader:
+        assert reader[201] == values[201]
+        assert reader[:] == values
@@ -29,6 +29,15 @@ def test_decode_sleb128(byte, expected):
     assert SignedLEB128.decode(buffer) == expected
     assert SignedLEB128.decode(byte) == expected
 
+
+@pytest.mark.parametrize("byte, expected", PARAMS)
+def test_decode_from_sleb128(byte, expected):
+    buffer = b"\xaa" + byte + b"\xaa"
+    assert SignedLEB128.decode_from(buffer, 1) == (expected, len(byte) + 1)
+    assert SignedLEB128.decode_from(memoryview(bytearray(buffer)), 1) == (expected, len(byte) + 1)
+    assert SignedLEB128.decode_from(byte) == (expected, len(byte))
+
+
 @pytest.mark.parametrize("expected,byte", PARAMS)
 def test_encode_sleb128(byte, expected):
     assert SignedLEB128.encode(byte) == expected
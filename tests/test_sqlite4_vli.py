@@ -44,3 +44,11 @@ def test_decode_sqlite4_vli(byte, expected):
     buffer = BytesIO(byte)
     assert SQLite4VLI.decode(buffer) == expected
     assert SQLite4VLI.decode(byte) == expected
+
+
+@pytest.mark.parametrize("byte, expected", PARAMS)
+def test_decode_from_sqlite4_vli(byte, expected):
+    buffer = b"\xaa" + byte + b"\xaa"
+    assert SQLite4VLI.decode_from(buffer, 1) == (expected, len(byte) + 1)
+    assert SQLite4VLI.decode_from(memoryview(bytearray(buffer)), 1) == (expected, len(byte) + 1)
+    assert SQLite4VLI.decode_from(byte) == (expected, len(byte))
@@ -22,6 +22,14 @@ def test_decode_uleb128(byte, expected):
     assert UnsignedLEB128.decode(byte) == expected
 
 
+@pytest.mark.parametrize("byte, expected", PARAMS)
+def test_decode_from_uleb128(byte, expected):
+    buffer = b"\xaa" + byte + b"\xaa"
+    assert UnsignedLEB128.decode_from(buffer, 1) == (expected, len(byte) + 1)
+    assert UnsignedLEB128.decode_from(memoryview(bytearray(buffer)), 1) == (expected, len(byte) + 1)
+    assert UnsignedLEB128.decode_from(byte) == (expected, len(byte))
+
+
 @pytest.mark.parametrize("expected, integer", PARAMS)
 def test_encode_uleb128(integer, expected):
     assert UnsignedLEB128.encode(integer) == expected
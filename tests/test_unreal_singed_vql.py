@@ -63,3 +63,11 @@ def test_decode_unreal_signed_vlq(byte, expected):
     buffer = BytesIO(byte)
     assert UnrealEngineSingedVLQ.decode(buffer) == expected
     assert UnrealEngineSingedVLQ.decode(byte) == expected
+
+
+@pytest.mark.parametrize("byte, expected", PARAMS)
+def test_decode_from_unreal_signed_vlq(byte, expected):
+    buffer = b"\xaa" + byte + b"\xaa"
+    assert UnrealEngineSingedVLQ.decode_from(buffer, 1) == (expected, len(byte) + 1)
+    assert UnrealEngineSingedVLQ.decode_from(memoryview(bytearray(buffer)), 1) == (expected, len(byte) + 1)
+    assert UnrealEngineSingedVLQ.decode_from(byte) == (expected, len(byte))
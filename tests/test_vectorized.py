@@ -0,0 +1,116 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from PyVarInt.algorithms import (PrefixVarint,
+                                 UnsignedLEB128,
+                                 SignedLEB128,
+                                 VariableLengthQuantity,
+                                 SQLite4VLI,
+                                 LeSQLite,
+                                 LeSQLite2,
+                                 UnrealEngineSingedVLQ,
+                                 ZigZagLeSQLite2)
+from PyVarInt.vectorized import decode_array, encode_array, supports
+
+UNSIGNED_VALUES = [0, 1, 127, 128, 16383, 16384, 624485, 268435456,
+                   72057594037927936, 2 ** 63 - 1, 2 ** 63, 2 ** 64 - 1]
+SIGNED_VALUES = [0, 1, -1, 63, -64, 64, -65, -129, 624485, -624485,
+                 72057594037927936, -72057594037927936, 2 ** 63 - 1, -2 ** 63]
+# Both ends of every encoded length of the length-prefixed codecs
+PREFIXED_VALUES = sorted({value + delta
+                          for value in [177, 184, 240, 2287, 16559, 16561, 67823, 524287]
+                          + [2 ** (7 * size) - 1 for size in range(1, 10)] + [2 ** (8 * size) - 1 for size in range(1, 9)]
+                          for delta in (0, 1) if value + delta < 2 ** 64})
+UNREAL_VALUES = [0, 1, -1, 63, -63, 64, -64, 8191, -8192, 1048575, 1048576,
+                 -134217727, 134217728, 2 ** 35 - 1, -(2 ** 35 - 1)]
+
+CODECS = [
+    [UnsignedLEB128, UNSIGNED_VALUES, np.uint64],
+    [SignedLEB128, SIGNED_VALUES, np.int64],
+    [VariableLengthQuantity, UNSIGNED_VALUES, np.uint64],
+    [PrefixVarint, PREFIXED_VALUES, np.uint64],
+    [SQLite4VLI, PREFIXED_VALUES, np.uint64],
+    [LeSQLite, PREFIXED_VALUES, np.uint64],
+    [LeSQLite2, PREFIXED_VALUES, np.uint64],
+    [ZigZagLeSQLite2, SIGNED_VALUES, np.int64],
+]
+
+
+@pytest.mark.parametrize("codec,values,dtype", CODECS)
+def test_encode_array(codec, values, dtype):
+    encoded = encode_array(codec, np.array(values, dtype=dtype))
+    assert encoded.dtype == np.uint8
+    assert encoded.tobytes() == codec.encode_many(values)
+
+
+@pytest.mark.parametrize("codec,values,dtype", CODECS)
+def test_decode_array(codec, values, dtype):
+    decoded = decode_array(codec, codec.encode_many(values))
+    assert decoded.dtype == dtype
+    assert decoded.tolist() == values
+
+
+@pytest.mark.parametrize("codec,values,dtype", CODECS)
+def test_random_roundtrip(codec, values, dtype):
+    rng = np.random.default_rng(1)
+    info = np.iinfo(dtype)
+    column = rng.integers(info.min, info.max, size=2000, dtype=dtype, endpoint=True)
+    column >>= rng.integers(0, 64, size=column.size).astype(dtype)
+    encoded = encode_array(codec, column)
+    assert encoded.tobytes() == codec.encode_many(column.tolist())
+    assert np.array_equal(decode_array(codec, encoded), column)
+
+
+@pytest.mark.parametrize("values", [UNREAL_VALUES, [1, 2, 3], []])
+def test_unreal_engine_vlq(values):
+    encoded = encode_array(UnrealEngineSingedVLQ, np.array(values, dtype=np.int64))
+    assert encoded.tobytes() == UnrealEngineSingedVLQ.encode_many(values)
+    decoded = decode_array(UnrealEngineSingedVLQ, encoded)
+    assert decoded.dtype == np.int64
+    assert decoded.tolist() == values
+
+    rng = np.random.default_rng(1)
+    column = rng.integers(-(2 ** 35 - 1), 2 ** 35 - 1, size=2000, endpoint=True)
+    column >>= rng.integers(0, 36, size=column.size)
+    encoded = encode_array(UnrealEngineSingedVLQ, column)
+    assert encoded.tobytes() == UnrealEngineSingedVLQ.encode_many(column.tolist())
+    assert np.array_equal(decode_array(UnrealEngineSingedVLQ, encoded), column)
+    with pytest.raises(OverflowError):
+        encode_array(UnrealEngineSingedVLQ, np.array([2 ** 35]))
+
+
+@pytest.mark.parametrize("codec,values,dtype", CODECS)
+def test_empty(codec, values, dtype):
+    assert encode_array(codec, np.array([], dtype=dtype)).size == 0
+    assert decode_array(codec, b"").size == 0
+
+
+def test_truncated():
+    with pytest.raises(IndexError):
+        decode_array(UnsignedLEB128, b"\x01\x80")
+    for codec in (PrefixVarint, SQLite4VLI, LeSQLite, LeSQLite2, UnrealEngineSingedVLQ):
+        with pytest.raises(IndexError):
+            decode_array(codec, codec.encode_many([1, 2 ** 30])[:-1])
+
+
+def test_overflow():
+    with pytest.raises(OverflowError):
+        decode_array(UnsignedLEB128, UnsignedLEB128.encode(2 ** 64))
+    with pytest.raises(OverflowError):
+        decode_array(VariableLengthQuantity, VariableLengthQuantity.encode(2 ** 64))
+
+
+def test_negative_unsigned():
+    with pytest.raises(ValueError):
+        encode_array(UnsignedLEB128, np.array([-1]))
+
+
+def test_unsupported_codec():
+    class Custom(SQLite4VLI):
+        pass
+
+    assert supports(SQLite4VLI)
+    assert not supports(Custom)
+    with pytest.raises(TypeError):
+        encode_array(Custom, np.array([1]))
@@ -30,6 +30,14 @@ def test_decode_vlq(byte, expected):
     assert VariableLengthQuantity.decode(byte) == expected
 
 
+@pytest.mark.parametrize("byte, expected", PARAMS)
+def test_decode_from_vlq(byte, expected):
+    buffer = b"\xaa" + byte + b"\xaa"
+    assert VariableLengthQuantity.decode_from(buffer, 1) == (expected, len(byte) + 1)
+    assert VariableLengthQuantity.decode_from(memoryview(bytearray(buffer)), 1) == (expected, len(byte) + 1)
+    assert VariableLengthQuantity.decode_from(byte) == (expected, len(byte))
+
+
 @pytest.mark.parametrize("expected,integer", PARAMS)
 def test_encode_vlq(expected, integer):
     assert VariableLengthQuantity.encode(integer) == expected
@@ -0,0 +1,106 @@
+import asyncio
+from io import BytesIO
+
+import pytest
+
+from PyVarInt.algorithms import (ZigZagPrefixVarint,
+                                 ZigZagUnsignedLEB128,
+                                 ZigZagVariableLengthQuantity,
+                                 ZigZagSQLite4VLI,
+                                 ZigZagLeSQLite,
+                                 ZigZagLeSQLite2,
+                                 zigzag_decode,
+                                 zigzag_encode)
+
+ZIGZAG_PARAMS = [
+    [0, 0],
+    [-1, 1],
+    [1, 2],
+    [-2, 3],
+    [2147483647, 4294967294],
+    [-2147483648, 4294967295],
+    [2 ** 63 - 1, 2 ** 64 - 2],
+    [-2 ** 63, 2 ** 64 - 1],
+]
+
+PARAMS = [
+    [ZigZagUnsignedLEB128, b'\x00', 0],
+    [ZigZagUnsignedLEB128, b'\x01', -1],
+    [ZigZagUnsignedLEB128, b'\x7f', -64],
+    [ZigZagUnsignedLEB128, b'\x80\x01', 64],
+    [ZigZagPrefixVarint, b'\x03', -1],
+    [ZigZagPrefixVarint, b'\x00\xff\xff\xff\xff\xff\xff\xff\xff', -2 ** 63],
+    [ZigZagVariableLengthQuantity, b'\x81\x00', 64],
+    [ZigZagSQLite4VLI, b'\xf0', 120],
+    [ZigZagSQLite4VLI, b'\xf1\x01', -121],
+    [ZigZagLeSQLite, b'\xb8', 92],
+    [ZigZagLeSQLite2, b'\xb1', -89],
+]
+
+CODECS = [ZigZagPrefixVarint,
+          ZigZagUnsignedLEB128,
+          ZigZagVariableLengthQuantity,
+          ZigZagSQLite4VLI,
+          ZigZagLeSQLite,
+          ZigZagLeSQLite2]
+
+VALUES = [0, -1, 1, -63, 64, -8192, 16384, -2 ** 31, 2 ** 40, -2 ** 63, 2 ** 63 - 1]
+
+
+@pytest.mark.parametrize("value,expected", ZIGZAG_PARAMS)
+def test_zigzag_mapping(value, expected):
+    assert zigzag_encode(value) == expected
+    assert zigzag_decode(expected) == value
+
+
+@pytest.mark.parametrize("codec,byte,integer", PARAMS)
+def test_encode_zigzag(codec, byte, integer):
+    assert codec.encode(integer) == byte
+
+
+@pytest.mark.parametrize("codec,byte,expected", PARAMS)
+def test_decode_zigzag(codec, byte, expected):
+    assert codec.decode(BytesIO(byte)) == expected
+    assert codec.decode(byte) == expected
+    assert codec.decode_from(b"\xaa" + byte, 1) == (expected, len(byte) + 1)
+
+
+@pytest.mark.parametrize("codec", CODECS)
+def test_zigzag_batch(codec):
+    encoded = codec.encode_many(VALUES)
+    assert encoded == b"".join(codec.encode(value) for value in VALUES)
+    assert codec.decode_many(encoded) == VALUES
+    assert codec.decode_many(encoded, as_array=True).tolist() == VALUES
+    assert list(codec.iter_decode(BytesIO(encoded), chunk_size=3)) == VALUES
+    assert codec.skip(encoded, 4) == len(codec.encode_many(VALUES[:4]))
+    assert [codec.encoded_length(value) for value in VALUES] == [len(codec.encode(value)) for value in VALUES]
+    buf = bytearray(len(encoded))
+    offset = 0
+    for value in VALUES:
+        offset = codec.encode_into(value, buf, offset)
+    assert buf == encoded
+    assert codec.has_length_prefix == codec.codec.has_length_prefix
+    if codec.has_length_prefix:
+        assert codec.peek_length(encoded[0]) == len(codec.encode(VALUES[0]))
+
+
+@pytest.mark.parametrize("codec", CODECS)
+def test_zigzag_decode_async(codec):
+    async def _decode():
+        reader = asyncio.StreamReader()
+        reader.feed_data(codec.encode_many(VALUES))
+        reader.feed_eof()
+        return [await codec.decode_async(reader) for _ in VALUES]
+
+    assert asyncio.run(_decode()) == VALUES
+
+
+@pytest.mark.parametrize("codec", [ZigZagUnsignedLEB128, ZigZagVariableLengthQuantity])
+def test_zigzag_vectorized(codec):
+    np = pytest.importorskip("numpy")
+    from PyVarInt.vectorized import decode_array, encode_array
+
+    column = np.array(VALUES, dtype=np.int64)
+    encoded = encode_array(codec, column)
+    assert encoded.tobytes() == codec.encode_many(VALUES)
+    assert decode_array(codec, encoded).tolist() == VALUES